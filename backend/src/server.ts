@@ -544,6 +544,9 @@ app.post('/api/v1/incidents', createIncident);
 app.put('/api/v1/incidents/:id', updateIncident);
 app.get('/api/v1/incidents', getIncidents);
 
+// Raw OpenAPI spec for tooling (e.g. the dev launcher's API benchmark)
+app.get('/api/docs.json', (req, res) => res.json(specs));
+
 // Swagger API Documentation
 app.use('/api/docs', swaggerUi.serve, swaggerUi.setup(specs, {
   explorer: true,
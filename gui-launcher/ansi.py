@@ -0,0 +1,172 @@
+"""Streaming ANSI escape decoder for service output.
+
+Vite, tsx and npm colour their output. AnsiDecoder strips every escape
+sequence in one pass over each chunk (no regex), keeps SGR state across
+chunks and lines like a terminal, and labels each run of text with a tag
+name drawn from a small fixed set (16 colours x bold x underline), so the
+log widget configures each tag once instead of once per colour run.
+"""
+
+ESC = '\x1b'
+MAX_PENDING = 4096
+
+# Dark-theme palette matching the System Monitor background (#1e1e1e)
+ANSI_PALETTE = [
+    '#000000', '#cd3131', '#0dbc79', '#e5e510', '#2472c8', '#bc3fbc', '#11a8cd', '#e5e5e5',
+    '#666666', '#f14c4c', '#23d18b', '#f5f543', '#3b8eea', '#d670d6', '#29b8db', '#ffffff',
+]
+ANSI_COLOR_NAMES = ['black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white',
+                    'bright_black', 'bright_red', 'bright_green', 'bright_yellow',
+                    'bright_blue', 'bright_magenta', 'bright_cyan', 'bright_white']
+
+# RGB values of the 16 base colours, used to fold 256-colour and truecolour codes
+_BASE_RGB = [tuple(int(color[i:i + 2], 16) for i in (1, 3, 5)) for color in ANSI_PALETTE]
+
+
+def _nearest_base_color(r, g, b):
+    return min(range(16), key=lambda i: (_BASE_RGB[i][0] - r) ** 2
+                                        + (_BASE_RGB[i][1] - g) ** 2
+                                        + (_BASE_RGB[i][2] - b) ** 2)
+
+
+def _xterm_to_base(n):
+    """Fold an xterm 256-colour index into the 16 base colours"""
+    if n < 16:
+        return n
+    if n >= 232:
+        level = 8 + (n - 232) * 10
+        return _nearest_base_color(level, level, level)
+    n -= 16
+    steps = [0, 95, 135, 175, 215, 255]
+    return _nearest_base_color(steps[n // 36], steps[(n // 6) % 6], steps[n % 6])
+
+
+def tag_style(tag):
+    """Return (foreground, bold, underline) for a tag produced by AnsiDecoder"""
+    parts = tag.split('-')
+    color = parts[1]
+    foreground = ANSI_PALETTE[ANSI_COLOR_NAMES.index(color)] if color != 'default' else None
+    return foreground, 'b' in parts[2:], 'u' in parts[2:]
+
+
+class AnsiDecoder:
+    """Turn text containing ANSI escapes into (text, tag) segments
+
+    The tag is None for default-styled text. Escape sequences split
+    across feed() calls are buffered until complete.
+    """
+
+    def __init__(self):
+        self.foreground = None  # index into ANSI_PALETTE
+        self.bold = False
+        self.underline = False
+        self._pending = ''
+        self._tag = None
+
+    def _update_tag(self):
+        if self.foreground is None and not self.bold and not self.underline:
+            self._tag = None
+            return
+        color = ANSI_COLOR_NAMES[self.foreground] if self.foreground is not None else 'default'
+        self._tag = 'ansi-' + color + ('-b' if self.bold else '') + ('-u' if self.underline else '')
+
+    def feed(self, text):
+        """Decode a chunk; returns a list of (text, tag) with all escapes removed"""
+        if self._pending:
+            text = self._pending + text
+            self._pending = ''
+        if ESC not in text:
+            return [(text, self._tag)] if text else []
+
+        segments = []
+        position = 0
+        length = len(text)
+        while position < length:
+            escape = text.find(ESC, position)
+            if escape < 0:
+                segments.append((text[position:], self._tag))
+                break
+            if escape > position:
+                segments.append((text[position:escape], self._tag))
+            end = self._consume_escape(text, escape)
+            if end is None:
+                self._pending = text[escape:]  # Incomplete sequence, finish it next chunk
+                break
+            position = end
+        return segments
+
+    def _consume_escape(self, text, start):
+        """Handle the sequence at text[start]; returns the index after it or None if incomplete"""
+        length = len(text)
+        if start + 1 >= length:
+            return None
+        kind = text[start + 1]
+        if kind == '[':
+            # CSI: parameter/intermediate bytes then one final byte in @-~
+            i = start + 2
+            while i < length and not ('@' <= text[i] <= '~'):
+                i += 1
+            if i >= length:
+                return None
+            if text[i] == 'm':
+                self._apply_sgr(text[start + 2:i])
+            return i + 1  # Cursor movement, erase line etc. are dropped
+        if kind == ']':
+            # OSC (window titles, hyperlinks): ends with BEL or ESC backslash
+            bell = text.find('\x07', start + 2)
+            st = text.find(ESC + '\\', start + 2)
+            ends = [end for end in (bell + 1 if bell >= 0 else -1, st + 2 if st >= 0 else -1) if end > 0]
+            if not ends:
+                # Unterminated: wait for more, but never buffer a runaway sequence forever
+                return length if length - start > MAX_PENDING else None
+            return min(ends)
+        return start + 2  # Two-character escape
+
+    def _apply_sgr(self, params):
+        codes = [int(code) if code.isdigit() else 0 for code in params.split(';')] if params else [0]
+        i = 0
+        while i < len(codes):
+            code = codes[i]
+            if code == 0:
+                self.foreground = None
+                self.bold = False
+                self.underline = False
+            elif code == 1:
+                self.bold = True
+            elif code == 22:
+                self.bold = False
+            elif code == 4:
+                self.underline = True
+            elif code == 24:
+                self.underline = False
+            elif 30 <= code <= 37:
+                self.foreground = code - 30
+            elif 90 <= code <= 97:
+                self.foreground = code - 90 + 8
+            elif code == 39:
+                self.foreground = None
+            elif code in (38, 48):
+                # Extended colour: 5;n or 2;r;g;b (backgrounds are parsed and ignored)
+                if i + 2 < len(codes) and codes[i + 1] == 5:
+                    if code == 38:
+                        self.foreground = _xterm_to_base(codes[i + 2])
+                    i += 2
+                elif i + 4 < len(codes) and codes[i + 1] == 2:
+                    if code == 38:
+                        self.foreground = _nearest_base_color(*codes[i + 2:i + 5])
+                    i += 4
+            i += 1
+        self._update_tag()
+
+
+def strip_segments(segments):
+    """Strip leading and trailing whitespace across a list of (text, tag) segments"""
+    segments = [(text, tag) for text, tag in segments if text]
+    while segments and not segments[0][0].strip():
+        segments.pop(0)
+    while segments and not segments[-1][0].strip():
+        segments.pop()
+    if segments:
+        segments[0] = (segments[0][0].lstrip(), segments[0][1])
+        segments[-1] = (segments[-1][0].rstrip(), segments[-1][1])
+    return segments
@@ -0,0 +1,231 @@
+"""Recorded /api/v1 responses and a stub backend that serves them.
+
+While the tracing proxy is running it hands every complete backend
+response to ApiArchive.record(). Bodies are stored once per content hash
+under bodies/, and index.jsonl maps "METHOD /path?sorted=query" to the
+status, headers and body hash (appended, last entry wins, compacted on
+load). StubServer answers on the backend port from that archive so the
+frontend can run without Node or Mongo; unrecorded routes get a 501.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+RECORDED_PREFIX = "/api/v1/"
+# Headers that describe the wire format of one particular response, not its content
+SKIPPED_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-length', 'date',
+                   'server', 'x-request-id', 'etag', 'last-modified', 'set-cookie'}
+BODY_CACHE_BYTES = 16 * 1024 * 1024  # Bodies served by the stub that stay in memory
+
+
+def request_key(method, target):
+    """Archive key: method, path and query parameters in sorted order"""
+    parts = urlsplit(target)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path}" + (f"?{query}" if query else "")
+
+
+def dechunk(data):
+    """Decode a chunked transfer-encoded body"""
+    body = bytearray()
+    position = 0
+    while True:
+        line_end = data.index(b'\r\n', position)
+        size = int(data[position:line_end].split(b';', 1)[0], 16)
+        if size == 0:
+            return bytes(body)
+        start = line_end + 2
+        body += data[start:start + size]
+        position = start + size + 2
+
+
+class ApiArchive:
+    """Content-deduplicated store of recorded API responses"""
+
+    def __init__(self, path):
+        self.path = path
+        self.bodies_path = os.path.join(path, "bodies")
+        self.index_path = os.path.join(path, "index.jsonl")
+        self._lock = threading.Lock()
+        self._bodies = OrderedDict()  # sha256 -> bytes, least recently served first
+        self._bodies_size = 0
+        self.index = {}
+        self._by_path = {}  # "METHOD /path" -> latest entry with any query string
+        self.load()
+
+    def load(self):
+        """Read the index, rewriting it when superseded entries dominate"""
+        lines = 0
+        index = {}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Line cut short by a crash
+                    index[entry['key']] = entry
+                    lines += 1
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.index = index
+            self._by_path = {}
+            for entry in index.values():
+                self._index_path(entry)
+            if lines > 2 * len(index) + 100:
+                self._rewrite_index()
+
+    def _index_path(self, entry):
+        path_key = entry['key'].split('?', 1)[0]
+        current = self._by_path.get(path_key)
+        if current is None or entry['recorded_at'] >= current['recorded_at']:
+            self._by_path[path_key] = entry
+
+    def _rewrite_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in self.index.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp_path, self.index_path)
+
+    def record(self, method, target, status, headers, body):
+        """Store one response; returns False for responses that are not worth replaying"""
+        if not urlsplit(target).path.startswith(RECORDED_PREFIX):
+            return False
+        if status is None or status == 304 or status >= 500:
+            return False  # Nothing to replay, or a failure that should not stick
+        digest = hashlib.sha256(body).hexdigest()
+        entry = {
+            'key': request_key(method, target),
+            'status': status,
+            'headers': [[name, value] for name, value in headers if name.lower() not in SKIPPED_HEADERS],
+            'body': digest,
+            'size': len(body),
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            os.makedirs(self.bodies_path, exist_ok=True)
+            body_path = os.path.join(self.bodies_path, digest)
+            if not os.path.exists(body_path):
+                temp_path = body_path + ".tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(temp_path, body_path)
+            self.index[entry['key']] = entry
+            self._index_path(entry)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        return True
+
+    def lookup(self, method, target):
+        """Return (status, headers, body) for a request, or None if it was never recorded
+
+        An exact match wins; otherwise the latest response for the same path
+        with any query string is used.
+        """
+        key = request_key(method, target)
+        with self._lock:
+            entry = self.index.get(key) or self._by_path.get(key.split('?', 1)[0])
+            if entry is None:
+                return None
+            body = self._bodies.get(entry['body'])
+            if body is not None:
+                self._bodies.move_to_end(entry['body'])
+            else:
+                try:
+                    with open(os.path.join(self.bodies_path, entry['body']), 'rb') as f:
+                        body = f.read()
+                except OSError:
+                    return None
+                self._cache_body(entry['body'], body)
+        return entry['status'], entry['headers'], body
+
+    def _cache_body(self, digest, body):
+        if len(body) > BODY_CACHE_BYTES // 4:
+            return  # Read from disk each time rather than push out everything else
+        self._bodies[digest] = body
+        self._bodies_size += len(body)
+        while self._bodies_size > BODY_CACHE_BYTES:
+            _, evicted = self._bodies.popitem(last=False)
+            self._bodies_size -= len(evicted)
+
+    def stats(self):
+        """(recorded routes, distinct bodies, bytes on disk for bodies)"""
+        with self._lock:
+            digests = {entry['body']: entry['size'] for entry in self.index.values()}
+        return len(self.index), len(digests), sum(digests.values())
+
+
+class StubServer:
+    """Serve an ApiArchive on the backend port from a daemon thread"""
+
+    def __init__(self, archive, port=5000, host="127.0.0.1", on_miss=None):
+        self.archive = archive
+        self.host = host
+        self.port = port
+        self.on_miss = on_miss  # Called with "METHOD /path" for unrecorded routes
+        self.hits = 0
+        self.misses = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def start(self):
+        """Bind the port and start serving; raises OSError if the port is taken"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_any(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                found = stub.archive.lookup(self.command, self.path)
+                if found is None:
+                    stub.misses += 1
+                    if stub.on_miss:
+                        stub.on_miss(f"{self.command} {self.path}")
+                    status = 501
+                    headers = [['Content-Type', 'application/json; charset=utf-8']]
+                    body = json.dumps({'success': False,
+                                       'message': f"Not recorded: {self.command} {self.path}"}).encode()
+                else:
+                    stub.hits += 1
+                    status, headers, body = found
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("X-Stub-Backend", "1")
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = handle_any
+
+            def log_message(self, format, *args):
+                pass  # Misses are reported through on_miss
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="stub-backend", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
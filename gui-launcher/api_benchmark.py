@@ -0,0 +1,228 @@
+"""Per-endpoint latency baseline for the backend, generated from its OpenAPI spec.
+
+fetch_spec() loads the spec the backend builds with swagger-jsdoc
+(backend/src/swagger.ts) from /api/docs.json, or from the swagger-ui page
+on branches without that route. Every GET operation becomes a benchmark
+case unless it is marked `x-benchmark: false`. Path parameters come from
+the spec's examples or from the first item a sibling list endpoint
+returns (e.g. /government/volunteers for /government/volunteers/{id}), so
+the seeded sample data drives the run. run_benchmark() times each case
+sequentially after a warm-up. BenchmarkBaseline keeps one median/p95 per
+endpoint, and find_regressions() compares a later run against it.
+"""
+import json
+import os
+import re
+import statistics
+import time
+from datetime import datetime
+from urllib import request as urllib_request
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit, quote
+
+_PARAM = re.compile(r'\{([^}]+)\}')
+_LIST_KEYS = ('data', 'items', 'results', 'docs')
+
+
+class BenchmarkError(Exception):
+    """Raised when the spec cannot be loaded"""
+
+
+def _get(url, headers=None, timeout=10):
+    """GET url; returns (status, body bytes, seconds), HTTP errors included"""
+    request = urllib_request.Request(url, headers=headers or {})
+    started = time.perf_counter()
+    try:
+        with urllib_request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except HTTPError as e:
+        body = e.read()
+        status = e.code
+    return status, body, time.perf_counter() - started
+
+
+def fetch_spec(backend_url, timeout=5):
+    """Load the backend's OpenAPI spec"""
+    try:
+        status, body, _ = _get(backend_url + "/api/docs.json", timeout=timeout)
+        if status == 200:
+            return json.loads(body)
+        # Older branches: swagger-ui-express embeds the spec in its init script
+        status, body, _ = _get(backend_url + "/api/docs/swagger-ui-init.js", timeout=timeout)
+        text = body.decode('utf-8', 'replace')
+        start = text.find('"swaggerDoc":')
+        if status != 200 or start < 0:
+            raise BenchmarkError(f"No OpenAPI spec at {backend_url}/api/docs")
+        spec, _ = json.JSONDecoder().raw_decode(text, text.index('{', start))
+        return spec
+    except (OSError, ValueError) as e:
+        raise BenchmarkError(f"Cannot load the OpenAPI spec from {backend_url}: {e}")
+
+
+def _example(parameter):
+    schema = parameter.get('schema', {})
+    for value in (parameter.get('example'), schema.get('example'), schema.get('default')):
+        if value is not None:
+            return value
+    enum = schema.get('enum')
+    return enum[0] if enum else None
+
+
+def safe_endpoints(spec):
+    """[{'path', 'query', 'params', 'secured'}] for every GET operation, in spec order"""
+    endpoints = []
+    global_security = spec.get('security')
+    for path, item in spec.get('paths', {}).items():
+        operation = item.get('get')
+        if operation is None or operation.get('x-benchmark') is False:
+            continue
+        parameters = item.get('parameters', []) + operation.get('parameters', [])
+        query = {}
+        params = {}
+        for parameter in parameters:
+            if '$ref' in parameter:
+                continue
+            value = _example(parameter)
+            if parameter.get('in') == 'path':
+                params[parameter['name']] = value
+            elif parameter.get('in') == 'query' and parameter.get('required') and value is not None:
+                query[parameter['name']] = value
+        endpoints.append({
+            'path': path,
+            'query': query,
+            'params': params,
+            'secured': bool(operation.get('security', global_security)),
+        })
+    return endpoints
+
+
+def _first_item(payload):
+    """The first object of the list a list endpoint returned"""
+    if isinstance(payload, list):
+        return payload[0] if payload and isinstance(payload[0], dict) else None
+    if isinstance(payload, dict):
+        for key in _LIST_KEYS:
+            if key in payload:
+                found = _first_item(payload[key])
+                if found:
+                    return found
+        for value in payload.values():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                return value[0]
+    return None
+
+
+def resolve_urls(endpoints, api_url, headers=None):
+    """Fill path parameters; returns [(path template, url or None, reason)]"""
+    samples = {}  # list URL -> first item (or None)
+    resolved = []
+    for endpoint in endpoints:
+        path = endpoint['path']
+        reason = None
+        while True:
+            match = _PARAM.search(path)
+            if match is None:
+                break
+            name = match.group(1)
+            value = endpoint['params'].get(name)
+            if value is None:
+                parent = path[:match.start()].rstrip('/')
+                if parent not in samples:
+                    try:
+                        status, body, _ = _get(api_url + parent, headers)
+                        samples[parent] = _first_item(json.loads(body)) if status == 200 else None
+                    except (OSError, ValueError):
+                        samples[parent] = None
+                item = samples[parent] or {}
+                value = item.get(name) or item.get('_id') or item.get('id')
+            if value is None:
+                reason = f"no sample value for {{{name}}}"
+                break
+            path = path[:match.start()] + quote(str(value), safe='') + path[match.end():]
+        if reason:
+            resolved.append((endpoint['path'], None, reason))
+            continue
+        query = f"?{urlencode(endpoint['query'])}" if endpoint['query'] else ""
+        resolved.append((endpoint['path'], api_url + path + query, None))
+    return resolved
+
+
+def api_base_url(spec, backend_url):
+    """backend_url plus the path of the spec's first server (e.g. /api/v1)"""
+    servers = spec.get('servers') or [{}]
+    return backend_url + urlsplit(servers[0].get('url', '')).path.rstrip('/')
+
+
+def run_benchmark(cases, runs=20, warmup=3, headers=None, timeout=10, progress=None):
+    """Time each (template, url) case; returns {template: {'median', 'p95', 'status', 'errors'}} in ms
+
+    progress(done, total) is called after each endpoint.
+    """
+    results = {}
+    for index, (template, url) in enumerate(cases):
+        times = []
+        errors = 0
+        status = None
+        for attempt in range(warmup + runs):
+            try:
+                status, _, elapsed = _get(url, headers, timeout)
+            except OSError:
+                status, elapsed = None, None
+            if attempt < warmup:
+                continue
+            if status is None or status >= 400:
+                errors += 1
+            else:
+                times.append(elapsed * 1000)
+        times.sort()
+        results[template] = {
+            'median': round(statistics.median(times), 2) if times else None,
+            'p95': round(times[min(len(times) - 1, int(0.95 * len(times)))], 2) if times else None,
+            'status': status,
+            'errors': errors,
+        }
+        if progress:
+            progress(index + 1, len(cases))
+    return results
+
+
+class BenchmarkBaseline:
+    """Baseline per endpoint in a JSON file, plus a JSON-lines history of all runs"""
+
+    def __init__(self, path, history_path):
+        self.path = path
+        self.history_path = history_path
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, results):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': datetime.now().isoformat(timespec='seconds'), 'endpoints': results}, f, indent=2)
+
+    def append_history(self, results):
+        os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+        with open(self.history_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': datetime.now().isoformat(timespec='seconds'),
+                                'endpoints': results}) + "\n")
+
+
+def find_regressions(baseline, results, threshold=0.25, min_ms=2.0):
+    """[(template, baseline median, median)] for endpoints whose median grew past threshold and min_ms"""
+    if not baseline:
+        return []
+    regressed = []
+    for template, result in results.items():
+        before = baseline['endpoints'].get(template, {}).get('median')
+        now = result['median']
+        if before is None or now is None:
+            continue
+        if now - before >= min_ms and now > before * (1 + threshold):
+            regressed.append((template, before, now))
+    return sorted(regressed, key=lambda item: item[2] / item[1], reverse=True)
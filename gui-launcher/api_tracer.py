@@ -0,0 +1,269 @@
+"""Request-tracing HTTP proxy for the frontend's /api calls.
+
+Vite proxies /api to CARECONNECT_API_TARGET (default the backend on
+:5000). When tracing is on, the launcher points that at a TracingProxy,
+which forwards every request to the backend over a fresh connection and
+records connect time, time to first byte, total time and response size,
+keyed by the X-Request-ID the backend's requestLogger assigns.
+group_page_loads() then cuts the traces into page loads (same Referer,
+no long pause) and flags endpoints a page hits over and over (N+1).
+"""
+import asyncio
+import itertools
+import re
+import socket
+import threading
+import time
+from collections import Counter, deque
+from urllib.parse import urlsplit
+
+from api_archive import dechunk
+
+HEAD_LIMIT = 64 * 1024
+HOP_BY_HOP = {b'connection', b'keep-alive', b'proxy-connection', b'upgrade'}
+# Dropped while recording so the backend sends full bodies instead of 304s
+CONDITIONAL = {b'if-none-match', b'if-modified-since'}
+MAX_RECORDED_BODY = 8 * 1024 * 1024
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-f]{24}|\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$',
+                         re.IGNORECASE)
+
+
+def normalize_path(path):
+    """Collapse ids in a request path, e.g. /api/v1/events/6650.../apply -> /api/v1/events/:id/apply"""
+    path = path.split('?', 1)[0]
+    return '/'.join(':id' if _ID_SEGMENT.match(part) else part for part in path.split('/'))
+
+
+def _parse_head(head):
+    """Split a request/response head into its first line and [(name, value)] headers"""
+    lines = head.rstrip(b'\r\n').split(b'\r\n')
+    headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+
+def _header(headers, name):
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return None
+
+
+def _build_head(first_line, headers, drop=frozenset()):
+    lines = [first_line] + [name + b': ' + value for name, value in headers
+                            if name.lower() not in HOP_BY_HOP and name.lower() not in drop]
+    lines.append(b'Connection: close')
+    return b'\r\n'.join(lines) + b'\r\n\r\n'
+
+
+async def _read_body(reader, headers):
+    """Read a request body framed by Content-Length or chunked encoding (raw bytes)"""
+    length = _header(headers, b'content-length')
+    if length:
+        return await reader.readexactly(int(length))
+    if (_header(headers, b'transfer-encoding') or '').lower() == 'chunked':
+        parts = []
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            parts.append(size_line)
+            size = int(size_line.split(b';', 1)[0], 16)
+            if size == 0:
+                # Trailers end with an empty line
+                while True:
+                    line = await reader.readuntil(b'\r\n')
+                    parts.append(line)
+                    if line == b'\r\n':
+                        return b''.join(parts)
+            parts.append(await reader.readexactly(size + 2))
+    return b''
+
+
+class TracingProxy:
+    """HTTP/1.1 proxy on an asyncio loop in a daemon thread, recording one trace per request"""
+
+    def __init__(self, target_port, port=5099, target_host='127.0.0.1', host='127.0.0.1',
+                 history=5000, on_trace=None, on_response=None):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.host = host
+        self.port = port
+        self.on_trace = on_trace
+        # on_response(method, target, status, [(name, value)], body) gets every complete
+        # response (e.g. for the API archive); it runs in a worker thread
+        self.on_response = on_response
+        self._traces = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._loop is not None
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.port}"
+
+    def start(self):
+        """Bind the port and start proxying; raises OSError if the port is taken"""
+        sock = socket.create_server((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        loop = asyncio.new_event_loop()
+        self._server = loop.run_until_complete(
+            asyncio.start_server(self._handle, sock=sock, limit=HEAD_LIMIT))
+        self._loop = loop
+        self._thread = threading.Thread(target=loop.run_forever, name="api-tracer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop accepting connections and release the port"""
+        loop = self._loop
+        if loop is None:
+            return
+        self._loop = None
+
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        self._thread.join(timeout=5)
+        loop.close()
+
+    def traces(self):
+        with self._lock:
+            return list(self._traces)
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+    def _record(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+        if self.on_trace:
+            self.on_trace(trace)
+
+    def _deliver_response(self, on_response, method, target, status, headers, raw_body):
+        headers = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in headers]
+        body = raw_body
+        if any(name.lower() == 'transfer-encoding' and 'chunked' in value.lower() for name, value in headers):
+            try:
+                body = dechunk(raw_body)
+            except ValueError:
+                return  # Truncated response, not worth keeping
+        try:
+            on_response(method, target, status, headers, body)
+        except Exception:
+            pass  # Recording must never break proxying
+
+    async def _handle(self, reader, writer):
+        upstream_writer = None
+        try:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            started_at = time.time()
+            started = time.perf_counter()
+            request_line, headers = _parse_head(head)
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            body = await _read_body(reader, headers)
+            referer = _header(headers, b'referer')
+            trace = {
+                'id': None,
+                'method': method,
+                'path': target,
+                'page': urlsplit(referer).path if referer else None,
+                'started': started_at,
+                'status': None,
+                'connect_ms': None,
+                'ttfb_ms': None,
+                'total_ms': None,
+                'bytes': 0,
+                'error': None,
+            }
+
+            connecting = time.perf_counter()
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(
+                    self.target_host, self.target_port, limit=HEAD_LIMIT)
+            except OSError as e:
+                trace.update(status=502, error=f"backend unreachable: {e}",
+                             total_ms=(time.perf_counter() - started) * 1000,
+                             id=f"proxy-{next(self._ids)}")
+                self._record(trace)
+                writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+            trace['connect_ms'] = (time.perf_counter() - connecting) * 1000
+
+            on_response = self.on_response
+            drop = CONDITIONAL if on_response else frozenset()
+            upstream_writer.write(_build_head(request_line, headers, drop) + body)
+            await upstream_writer.drain()
+            response_head = await upstream_reader.readuntil(b'\r\n\r\n')
+            trace['ttfb_ms'] = (time.perf_counter() - started) * 1000
+            status_line, response_headers = _parse_head(response_head)
+            parts = status_line.split(b' ', 2)
+            trace['status'] = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+            trace['id'] = _header(response_headers, b'x-request-id') or f"proxy-{next(self._ids)}"
+
+            # The backend closes after the response (we asked it to), so relay until EOF
+            writer.write(_build_head(status_line, response_headers))
+            captured = [] if on_response else None
+            while True:
+                chunk = await upstream_reader.read(65536)
+                if not chunk:
+                    break
+                trace['bytes'] += len(chunk)
+                if captured is not None:
+                    captured.append(chunk)
+                    if trace['bytes'] > MAX_RECORDED_BODY:
+                        captured = None
+                writer.write(chunk)
+                await writer.drain()
+            trace['total_ms'] = (time.perf_counter() - started) * 1000
+            self._record(trace)
+            if captured is not None:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._deliver_response, on_response, method, target, trace['status'],
+                    response_headers, b''.join(captured))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass  # Client or backend went away mid-request; nothing useful to record
+        finally:
+            if upstream_writer:
+                upstream_writer.close()
+            writer.close()
+
+
+def group_page_loads(traces, gap=2.0, repeat_threshold=4):
+    """Group traces into page loads, newest last
+
+    A page load is a run of requests with the same Referer path where no
+    request starts more than `gap` seconds after the previous one ended.
+    Each load lists endpoints (method + normalized path) requested at
+    least repeat_threshold times as likely N+1 patterns.
+    """
+    loads = []
+    open_loads = {}  # page -> load still accepting requests
+    for trace in sorted(traces, key=lambda t: t['started']):
+        page = trace['page'] or "(no referer)"
+        end = trace['started'] + (trace['total_ms'] or 0) / 1000
+        load = open_loads.get(page)
+        if load is None or trace['started'] - load['end'] > gap:
+            load = {'page': page, 'started': trace['started'], 'end': end, 'requests': []}
+            open_loads[page] = load
+            loads.append(load)
+        load['requests'].append(trace)
+        load['end'] = max(load['end'], end)
+    for load in loads:
+        counts = Counter(f"{trace['method']} {normalize_path(trace['path'])}" for trace in load['requests'])
+        load['repeated'] = [(endpoint, count) for endpoint, count in counts.most_common()
+                            if count >= repeat_threshold]
+    return loads
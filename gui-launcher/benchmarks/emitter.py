@@ -0,0 +1,109 @@
+"""Synthetic service for the pipeline benchmark.
+
+Writes numbered lines to stdout at a given rate; every line starts with
+"<seq> <unix time>" so the benchmark can measure end-to-end latency. The
+last line is "BENCH-DONE <count>".
+
+    python emitter.py --rate 1000 --duration 5 --size 120 --ansi
+    python emitter.py --transcript vite --rate 200 --duration 5
+"""
+import argparse
+import itertools
+import sys
+import time
+
+DONE_MARKER = "BENCH-DONE"
+
+# Output of `npm run dev:frontend` and `npm run dev` (tsx watch) as seen through a pipe
+TRANSCRIPTS = {
+    'vite': [
+        "\x1b[1m\x1b[35m> careconnect@1.0.0 dev:frontend\x1b[39m\x1b[22m",
+        "\x1b[1m\x1b[35m> vite\x1b[39m\x1b[22m",
+        "  \x1b[32m\x1b[1mVITE\x1b[22m v5.4.2\x1b[39m  \x1b[2mready in \x1b[0m\x1b[1m412\x1b[22m\x1b[2m\x1b[0m ms",
+        "  \x1b[32m➜\x1b[39m  \x1b[1mLocal\x1b[22m:   \x1b[36mhttp://localhost:\x1b[1m5173\x1b[22m/\x1b[39m",
+        "  \x1b[32m➜\x1b[39m  \x1b[1mNetwork\x1b[22m\x1b[2m: use \x1b[22m\x1b[1m--host\x1b[22m\x1b[2m to expose\x1b[22m",
+        "\x1b[2m10:42:17 AM\x1b[22m \x1b[36m\x1b[1m[vite]\x1b[22m\x1b[39m \x1b[32mhmr update \x1b[39m"
+        "\x1b[2m/src/pages/volunteer/VolunteerDashboard.tsx, /src/index.css\x1b[22m",
+        "\x1b[2m10:42:19 AM\x1b[22m \x1b[36m\x1b[1m[vite]\x1b[22m\x1b[39m \x1b[32mpage reload \x1b[39m"
+        "\x1b[2msrc/context/AuthContext.tsx\x1b[22m",
+        "\x1b[2m10:42:21 AM\x1b[22m \x1b[33m\x1b[1m[vite]\x1b[22m\x1b[39m \x1b[33mwarning: chunk size limit "
+        "exceeded for assets/index-Bx3kLm9q.js (612.38 kB)\x1b[39m",
+    ],
+    'backend': [
+        "> careconnect-backend@1.0.0 dev",
+        "> tsx watch src/server.ts",
+        "✅ Connected to MongoDB: mongodb://localhost:27017/careconnect",
+        "🚀 Server running on http://localhost:5000",
+        "📚 API Documentation: http://localhost:5000/api-docs",
+        "GET /api/v1/health 200 2.104 ms - 58",
+        "POST /api/v1/auth/login 200 143.877 ms - 612",
+        "GET /api/v1/events?page=1&limit=12&status=upcoming 200 18.331 ms - 9521",
+        "GET /api/v1/volunteers/me/applications 304 7.902 ms - -",
+        "Error: Validation failed: phone: Path `phone` is invalid (98765).",
+        "    at ValidationError.inspect (node_modules/mongoose/lib/error/validation.js:50:26)",
+        "    at async createVolunteer (src/controllers/volunteerController.ts:88:5)",
+    ],
+}
+
+
+def synthetic_lines(size, ansi):
+    """Endless filler payloads of roughly `size` characters"""
+    words = "volunteer event ngo campaign donation approval story pending verified".split()
+    colors = [31, 32, 33, 34, 35, 36]
+    for n in itertools.count():
+        parts = []
+        length = 0
+        for i in itertools.count(n):
+            word = words[i % len(words)]
+            if ansi and i % 3 == 0:
+                word = f"\x1b[{colors[i % len(colors)]}m{word}\x1b[39m"
+            parts.append(word)
+            length += len(word) + 1
+            if length >= size:
+                break
+        yield " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rate', type=float, default=100, help="Lines per second, 0 for as fast as possible")
+    parser.add_argument('--duration', type=float, default=5, help="Seconds to emit for")
+    parser.add_argument('--lines', type=int, help="Stop after this many lines instead")
+    parser.add_argument('--size', type=int, default=120, help="Payload size of synthetic lines")
+    parser.add_argument('--ansi', action='store_true', help="Colour every third word")
+    parser.add_argument('--transcript', choices=sorted(TRANSCRIPTS), help="Loop a realistic transcript")
+    args = parser.parse_args()
+
+    if args.transcript:
+        payloads = itertools.cycle(TRANSCRIPTS[args.transcript])
+    else:
+        payloads = synthetic_lines(args.size, args.ansi)
+    out = sys.stdout.buffer
+    started = time.monotonic()
+    deadline = None if args.lines else started + args.duration
+    seq = 0
+    tick = 0.01  # Write what is due every 10 ms, like a busy Node process flushing its stream
+    while True:
+        now = time.monotonic()
+        if deadline and now >= deadline:
+            break
+        due = int((now - started) * args.rate) if args.rate else seq + 256
+        if args.lines:
+            due = min(due, args.lines)
+        if due > seq:
+            batch = []
+            stamp = time.time()
+            for seq in range(seq + 1, due + 1):
+                batch.append(f"{seq} {stamp:.6f} {next(payloads)}\n")
+            out.write("".join(batch).encode())
+            out.flush()
+        if args.lines and seq >= args.lines:
+            break
+        if args.rate:
+            time.sleep(tick)
+    out.write(f"{DONE_MARKER} {seq}\n".encode())
+    out.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Compare readline()+decode() with LineReader on synthetic child output.
+
+Each workload is written through a real pipe by a feeder thread. For both
+readers the script reports CPU seconds per MB of output (reader thread
+only) and, in a second traced pass, the peak memory Python allocated
+while reading, which is what a single giant line blows up.
+
+    python benchmarks/output_reader_bench.py [--mb 20] [--repeat 3] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from output_reader import LineReader  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def make_workloads(size):
+    """Return {name: bytes} of roughly `size` bytes each"""
+    vite = ("\x1b[32m\x1b[1mVITE\x1b[22m v5.4.2\x1b[39m  \x1b[2mready in \x1b[0m\x1b[1m412\x1b[22m"
+            "\x1b[2m\x1b[0m ms\n").encode()
+    backend = "GET /api/v1/volunteers?page=2 200 3.2 ms - 1523 · Zoë Café ✓\n".encode()
+    json_dump = ('{"users": [' + ", ".join('{"id": %d, "name": "Zoë"}' % i for i in range(40000))
+                 + "]}\n").encode()
+    return {
+        'vite_ansi_lines': vite * (size // len(vite)),
+        'backend_utf8_lines': backend * (size // len(backend)),
+        'giant_lines': json_dump * max(1, size // len(json_dump)),
+    }
+
+
+def feed(write_fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(write_fd, view[:65536]):]
+    os.close(write_fd)
+
+
+def read_with_readline(stream):
+    """The previous monitor_process_output loop"""
+    lines = 0
+    for output in iter(stream.readline, b''):
+        output.decode(errors='replace').strip()
+        lines += 1
+    return lines
+
+
+def read_with_line_reader(stream):
+    lines = 0
+    reader = LineReader(stream)
+    for text in reader:
+        text.strip()
+        lines += 1
+    reader.close()
+    return lines
+
+
+READERS = {
+    'readline': read_with_readline,
+    'line_reader': read_with_line_reader,
+}
+
+
+def run_once(reader, data, trace=False):
+    """Read data through a pipe; returns (lines, reader CPU seconds, peak traced bytes)"""
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(read_fd, 'rb')
+    feeder = threading.Thread(target=feed, args=(write_fd, data), daemon=True)
+    feeder.start()
+    if trace:
+        tracemalloc.start()
+    started = time.thread_time()
+    lines = reader(stream)
+    cpu = time.thread_time() - started
+    peak = None
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    feeder.join()
+    stream.close()
+    return lines, cpu, peak
+
+
+def run(size_mb, repeat):
+    results = []
+    for workload, data in make_workloads(int(size_mb * MB)).items():
+        megabytes = len(data) / MB
+        for name, reader in READERS.items():
+            lines, _, peak = run_once(reader, data, trace=True)
+            cpu = min(run_once(reader, data)[1] for _ in range(repeat))
+            results.append({
+                'workload': workload,
+                'reader': name,
+                'mb': round(megabytes, 2),
+                'lines': lines,
+                'cpu_seconds_per_mb': round(cpu / megabytes, 4),
+                'peak_alloc_mb': round(peak / MB, 2),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=float, default=20, help="Output size per workload in MB")
+    parser.add_argument('--repeat', type=int, default=3, help="Untraced runs, the fastest is reported")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.mb, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'workload':<20} {'reader':<12} {'lines':>9} {'CPU s/MB':>9} {'peak MB':>8}")
+    for result in results:
+        print(f"{result['workload']:<20} {result['reader']:<12} {result['lines']:>9} "
+              f"{result['cpu_seconds_per_mb']:>9.4f} {result['peak_alloc_mb']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
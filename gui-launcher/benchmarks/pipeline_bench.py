@@ -0,0 +1,315 @@
+"""Benchmark the launcher's output pipeline with synthetic services.
+
+Each scenario writes a temporary services.json whose services are
+emitter.py processes, then starts them through the real launcher:
+spawn_service -> monitor_process_output -> handle_output_line ->
+log_message -> flush_log_queue. With a display the log goes into the
+real ScrolledText (window withdrawn); without one (or with --headless)
+the same methods run against an in-memory text sink and a plain tick
+loop instead of the Tk event loop.
+
+Reported per scenario: throughput, end-to-end line latency (emitter write
+to log insert), log tick lag, launcher CPU and RSS. Use --output to
+append results as JSON lines and track them over time.
+
+    python benchmarks/pipeline_bench.py [--scenario flood] [--duration 5] [--headless]
+                                        [--json] [--output data/benchmarks/pipeline.jsonl]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import psutil
+
+BENCH_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_PATH))
+
+from careconnect_launcher import ProfessionalCareConnectLauncher  # noqa: E402
+from emitter import DONE_MARKER  # noqa: E402
+from log_filter import LogFilter  # noqa: E402
+from ui_state import LogQueue  # noqa: E402
+
+EMITTER = os.path.join(BENCH_PATH, "emitter.py")
+TICK_INTERVAL = 0.1  # Same as the launcher's StateRenderer
+
+# scenario -> one emitter config per synthetic service
+SCENARIOS = {
+    'steady_100': [{'rate': 100}],
+    'steady_2k': [{'rate': 2000}],
+    'flood': [{'rate': 0, 'lines': 50000}],
+    'ansi_5k': [{'rate': 5000, 'ansi': True}],
+    'long_lines': [{'rate': 200, 'size': 8192}],
+    'dev_startup': [{'transcript': 'vite', 'rate': 50},
+                    {'transcript': 'backend', 'rate': 300},
+                    {'rate': 100, 'ansi': True}],
+}
+
+
+class RecordingLogQueue(LogQueue):
+    """LogQueue that keeps what the launcher drained so latency can be measured"""
+
+    def __init__(self):
+        super().__init__()
+        self.drained = []
+
+    def drain(self, limit=None):
+        entries = super().drain(limit)
+        self.drained.extend(entries)
+        return entries
+
+    def take_drained(self):
+        entries, self.drained = self.drained, []
+        return entries
+
+
+class HeadlessText:
+    """Keeps inserted text like the ScrolledText would when there is no display"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def insert(self, index, *args):
+        self.chunks.extend(args[0::2])
+
+    def tag_configure(self, tag, **options):
+        pass
+
+    def see(self, index):
+        pass
+
+    def index(self, index):
+        return "1.0"
+
+    def mark_set(self, name, index):
+        pass
+
+    def mark_gravity(self, name, direction):
+        pass
+
+    def tag_remove(self, tag, first, last=None):
+        pass
+
+
+class Collector:
+    """Match inserted lines back to the emitters"""
+
+    def __init__(self, labels):
+        self.labels = labels  # "[Label] " prefix -> service
+        self.received = {service: 0 for service in labels.values()}
+        self.emitted = {}
+        self.latencies = []
+        self.first_emit = None
+        self.last_insert = None
+
+    def collect(self, entries):
+        now = time.time()
+        for _, message, _, segments, _ in entries:
+            service = self.labels.get(message)
+            if service is None or not segments:
+                continue
+            text = "".join(part for part, _ in segments)
+            fields = text.split(" ", 2)
+            if fields[0] == DONE_MARKER:
+                self.emitted[service] = int(fields[1])
+                continue
+            try:
+                stamp = float(fields[1])
+            except (IndexError, ValueError):
+                continue
+            self.received[service] += 1
+            self.latencies.append(now - stamp)
+            if self.first_emit is None or stamp < self.first_emit:
+                self.first_emit = stamp
+            self.last_insert = now
+
+    @property
+    def done(self):
+        return len(self.emitted) == len(self.received)
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def write_manifest(directory, emitters, duration):
+    services = []
+    for index, config in enumerate(emitters, 1):
+        command = [sys.executable, EMITTER, "--rate", str(config.get('rate', 100))]
+        if config.get('lines'):
+            command += ["--lines", str(config['lines'])]
+        else:
+            command += ["--duration", str(duration)]
+        if config.get('size'):
+            command += ["--size", str(config['size'])]
+        if config.get('ansi'):
+            command.append("--ansi")
+        if config.get('transcript'):
+            command += ["--transcript", config['transcript']]
+        services.append({
+            'name': f"emit{index}",
+            'label': f"Emit{index}",
+            'command': command,
+            'cwd': BENCH_PATH,
+            'ready': {'log': "^1 "},
+        })
+    path = os.path.join(directory, "services.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'services': services}, f, indent=2)
+    return path
+
+
+def display_available():
+    import tkinter as tk
+    try:
+        tk.Tk().destroy()
+        return True
+    except tk.TclError:
+        return False
+
+
+def create_launcher(manifest_path, data_path, headless):
+    if headless:
+        launcher = ProfessionalCareConnectLauncher.__new__(ProfessionalCareConnectLauncher)
+        launcher.init_state(manifest_path, data_path)
+        launcher.log_text = HeadlessText()
+        launcher.ansi_tags = set()
+    else:
+        launcher = ProfessionalCareConnectLauncher(manifest_path, data_path)
+        launcher.root.withdraw()
+    launcher.log_queue = RecordingLogQueue()
+    # Every emitted line has to reach the log to be measured, so no dedup or rate limit
+    launcher.log_filter = LogFilter(max_per_second=None, dedupe=False)
+    return launcher
+
+
+def run_scenario(name, emitters, duration, headless):
+    data_path = tempfile.mkdtemp(prefix="careconnect-bench-")
+    launcher = create_launcher(write_manifest(data_path, emitters, duration), data_path, headless)
+    collector = Collector({f"[{spec.label}] ": spec.name for spec in launcher.service_specs.values()})
+    process = psutil.Process()
+    rss = [process.memory_info().rss]
+    tick_lags = []
+    timeout = duration * 4 + 30
+
+    def after_flush():
+        collector.collect(launcher.log_queue.take_drained())
+        rss.append(process.memory_info().rss)
+
+    cpu_before = process.cpu_times()
+    started = time.monotonic()
+    launcher.start_services(list(launcher.service_specs))
+    if headless:
+        next_tick = time.monotonic() + TICK_INTERVAL
+        while not collector.done and time.monotonic() - started < timeout:
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            tick_lags.append(time.monotonic() - next_tick)
+            launcher.flush_log_queue()
+            after_flush()
+            next_tick = max(next_tick + TICK_INTERVAL, time.monotonic())
+    else:
+        root = launcher.root
+        launcher.renderer.on_tick(after_flush)
+
+        def heartbeat(expected):
+            now = time.monotonic()
+            tick_lags.append(now - expected)
+            if collector.done or now - started > timeout:
+                root.quit()
+            else:
+                root.after(int(TICK_INTERVAL * 1000), heartbeat, now + TICK_INTERVAL)
+
+        root.after(int(TICK_INTERVAL * 1000), heartbeat, time.monotonic() + TICK_INTERVAL)
+        root.mainloop()
+    elapsed = time.monotonic() - started
+    cpu_after = process.cpu_times()
+
+    for service, runtime in launcher.services.items():
+        if runtime.running:
+            launcher.stop_service(service)
+    if launcher.session_recorder:
+        launcher.session_recorder.close()
+    if not headless:
+        launcher.renderer.stop()
+        launcher.root.destroy()
+    shutil.rmtree(data_path, ignore_errors=True)
+
+    received = sum(collector.received.values())
+    emitted = sum(collector.emitted.values())
+    span = (collector.last_insert - collector.first_emit) if received else None
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    return {
+        'scenario': name,
+        'mode': 'headless' if headless else 'tk',
+        'emitters': emitters,
+        'completed': collector.done,
+        'lines_emitted': emitted,
+        'lines_received': received,
+        'lines_per_second': round(received / span, 1) if span else None,
+        'latency_ms': {key: round(percentile(collector.latencies, q) * 1000, 1) if received else None
+                       for key, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))},
+        'tick_lag_ms': {'p95': round(percentile(tick_lags, 0.95) * 1000, 1) if tick_lags else None,
+                        'max': round(max(tick_lags) * 1000, 1) if tick_lags else None},
+        'cpu_percent': round(cpu / elapsed * 100, 1),
+        'cpu_ms_per_1k_lines': round(cpu * 1000 / received * 1000, 2) if received else None,
+        'rss_mb_peak': round(max(rss) / 1024 / 1024, 1),
+        'rss_mb_end': round(rss[-1] / 1024 / 1024, 1),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_PATH,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Run only this scenario (repeatable); default is all")
+    parser.add_argument('--duration', type=float, default=5, help="Seconds each emitter runs")
+    parser.add_argument('--headless', action='store_true', help="Skip Tk even if a display is available")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--output', help="Append one JSON line per scenario to this file")
+    args = parser.parse_args()
+
+    headless = args.headless or not display_available()
+    run_info = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        result = dict(run_info, **run_scenario(name, SCENARIOS[name], args.duration, headless))
+        results.append(result)
+        if not args.json:
+            latency = result['latency_ms']
+            print(f"{name:<12} {result['mode']:<8} {result['lines_received']:>7}/{result['lines_emitted']:<7} "
+                  f"{result['lines_per_second'] or 0:>9.0f} lines/s  latency p50 {latency['p50']} ms "
+                  f"p99 {latency['p99']} ms  tick lag max {result['tick_lag_ms']['max']} ms  "
+                  f"CPU {result['cpu_percent']}%  RSS {result['rss_mb_peak']} MB")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
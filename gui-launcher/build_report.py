@@ -0,0 +1,211 @@
+"""Size report for a production build and its history.
+
+analyze_build() measures every file in dist/assets (raw, gzip and, when
+the optional brotli package is installed, brotli; the precompressed
+.gz/.br files are reused when present) and attributes each JavaScript
+chunk's bytes to the source files and npm packages it came from using the
+build's hidden sourcemaps. Chunks are keyed by the source they were built
+from (Vite's .vite/manifest.json) or by their name without the content
+hash, so the same chunk can be compared across builds. BuildHistory keeps
+one JSON line per build and reports chunks that grew past a threshold.
+The sourcemaps hold the full sources, so remove_sourcemaps() deletes them
+once the build is analysed; dist/ is then safe to preview or deploy.
+"""
+import gzip
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # Brotli sizes are optional; gzip sizes are always reported
+    brotli = None
+
+MANIFEST_PATHS = (os.path.join(".vite", "manifest.json"), "manifest.json")  # Vite 5+, Vite 4
+_HASH = re.compile(r'-[A-Za-z0-9_-]{8,}(?=\.[a-z0-9]+$)')
+_BASE64 = {char: value for value, char in
+           enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+_PACKAGE = re.compile(r'node_modules/((?:@[^/]+/)?[^/]+)')
+
+
+def _decode_vlq(segment):
+    values = []
+    value = shift = 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+
+def module_name(source):
+    """Group a sourcemap source: npm packages by package name, project files by path"""
+    source = source.replace('\\', '/')
+    packages = _PACKAGE.findall(source)
+    if packages:
+        return packages[-1]
+    while source.startswith('../'):
+        source = source[3:]
+    return source.lstrip('/')
+
+
+def attribute_bytes(code, source_map):
+    """Return {module: generated characters} for one chunk and its sourcemap"""
+    sources = [module_name(source) for source in source_map.get('sources', [])]
+    totals = {}
+    source = 0
+    for line, mappings in zip(code.split('\n'), source_map.get('mappings', '').split(';')):
+        segments = []
+        column = 0
+        for segment in mappings.split(','):
+            if not segment:
+                continue
+            values = _decode_vlq(segment)
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                segments.append((column, sources[source] if source < len(sources) else None))
+            else:
+                segments.append((column, None))
+        for index, (start, name) in enumerate(segments):
+            end = segments[index + 1][0] if index + 1 < len(segments) else len(line)
+            name = name or "(generated)"
+            totals[name] = totals.get(name, 0) + max(0, end - start)
+    return totals
+
+
+def _compressed_size(path, data, suffix):
+    variant = path + suffix
+    if os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(path):
+        return os.path.getsize(variant)
+    if suffix == '.gz':
+        return len(gzip.compress(data, 9))
+    return len(brotli.compress(data, quality=11)) if brotli else None
+
+
+def _chunk_keys(dist_path):
+    """{assets file: stable chunk key} from the build manifest"""
+    for relative in MANIFEST_PATHS:
+        try:
+            with open(os.path.join(dist_path, relative), encoding='utf-8') as f:
+                manifest = json.load(f)
+            break
+        except (OSError, ValueError):
+            continue
+    else:
+        return {}
+    keys = {}
+    for key, entry in manifest.items():
+        if key.startswith('_'):
+            continue  # Shared chunks are keyed by their hashed file name; the stripped name is stabler
+        keys.setdefault(entry['file'], key)
+        for css in entry.get('css', []):
+            keys.setdefault(css, os.path.splitext(key)[0] + ".css")
+    return keys
+
+
+def analyze_build(dist_path, top=15):
+    """Measure dist/assets; returns {'chunks', 'modules', 'totals'}"""
+    assets_path = os.path.join(dist_path, "assets")
+    keys = _chunk_keys(dist_path)
+    chunks = {}
+    modules = {}
+    for name in sorted(os.listdir(assets_path)):
+        if name.endswith(('.gz', '.br', '.map')):
+            continue
+        path = os.path.join(assets_path, name)
+        relative = f"assets/{name}"
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = keys.get(relative) or _HASH.sub('', relative)
+        while key in chunks:
+            key += "'"  # Two chunks with the same base name
+        chunks[key] = {
+            'file': relative,
+            'raw': len(data),
+            'gzip': _compressed_size(path, data, '.gz'),
+            'brotli': _compressed_size(path, data, '.br'),
+        }
+        if name.endswith('.js') and os.path.exists(path + ".map"):
+            try:
+                with open(path + ".map", encoding='utf-8') as f:
+                    source_map = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for module, size in attribute_bytes(data.decode('utf-8', 'replace'), source_map).items():
+                modules[module] = modules.get(module, 0) + size
+    totals = {field: sum(chunk[field] or 0 for chunk in chunks.values()) for field in ('raw', 'gzip', 'brotli')}
+    return {
+        'chunks': chunks,
+        'modules': sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top],
+        'totals': totals,
+    }
+
+
+def remove_sourcemaps(dist_path):
+    """Delete the .map files (and precompressed copies) from dist/assets; returns how many"""
+    assets_path = os.path.join(dist_path, "assets")
+    removed = 0
+    try:
+        names = os.listdir(assets_path)
+    except OSError:
+        return 0
+    for name in names:
+        if name.endswith(('.map', '.map.gz', '.map.br')):
+            try:
+                os.remove(os.path.join(assets_path, name))
+                removed += 1
+            except OSError:
+                continue
+    return removed
+
+
+class BuildHistory:
+    """Append-only JSON-lines history of build reports"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Return recorded builds, oldest first"""
+        builds = []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        builds.append(json.loads(line))
+                    except ValueError:
+                        continue  # Skip a line cut short by a crash
+        except FileNotFoundError:
+            pass
+        return builds
+
+    def latest(self):
+        builds = self.load()
+        return builds[-1] if builds else None
+
+    def append(self, record):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def compare_builds(previous, current, threshold=0.1, min_bytes=1024):
+    """Chunks whose gzip size grew by more than threshold (and min_bytes) since previous
+
+    Returns [(key, previous gzip, current gzip)], largest growth first; new
+    chunks of at least min_bytes are included with a previous size of 0.
+    """
+    if previous is None:
+        return []
+    grown = []
+    for key, chunk in current['chunks'].items():
+        old = previous['chunks'].get(key, {}).get('gzip', 0)
+        growth = chunk['gzip'] - old
+        if growth >= min_bytes and (old == 0 or growth > old * threshold):
+            grown.append((key, old, chunk['gzip']))
+    return sorted(grown, key=lambda item: item[2] - item[1], reverse=True)
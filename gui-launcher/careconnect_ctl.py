@@ -0,0 +1,91 @@
+"""Command-line client for the launcher's control API.
+
+Reads the address and token from data/control.json, which the launcher
+writes while it is running.
+
+    python careconnect_ctl.py state
+    python careconnect_ctl.py port backend
+    python careconnect_ctl.py start|stop|restart frontend
+    python careconnect_ctl.py logs [--tail 50] [-f]
+    python careconnect_ctl.py events
+"""
+import argparse
+import json
+import os
+import sys
+from urllib import request as urllib_request
+from urllib.error import HTTPError, URLError
+
+CONTROL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "control.json")
+
+
+def load_control(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        sys.exit(f"Launcher is not running (no {path})")
+
+
+def call(control, method, path, timeout=10):
+    req = urllib_request.Request(control['url'] + path, method=method,
+                                 headers={'X-Control-Token': control['token']})
+    try:
+        return urllib_request.urlopen(req, timeout=timeout)
+    except HTTPError as e:
+        return e
+    except URLError as e:
+        sys.exit(f"Cannot reach the launcher at {control['url']}: {e.reason}")
+
+
+def follow(response):
+    """Print a NDJSON stream line by line until the launcher closes it"""
+    try:
+        for line in response:
+            if line.strip():
+                yield json.loads(line)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running CareConnect launcher")
+    parser.add_argument('--control-file', default=CONTROL_FILE)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('state', help="Print the launcher state as JSON")
+    port = commands.add_parser('port', help="Print the port a service listens on")
+    port.add_argument('service')
+    for action in ('start', 'stop', 'restart'):
+        commands.add_parser(action, help=f"{action.capitalize()} a service").add_argument('service')
+    logs = commands.add_parser('logs', help="Print recent System Monitor lines")
+    logs.add_argument('--tail', type=int, default=100)
+    logs.add_argument('-f', '--follow', action='store_true')
+    commands.add_parser('events', help="Stream state changes as JSON lines")
+    args = parser.parse_args()
+
+    control = load_control(args.control_file)
+    if args.command == 'state':
+        print(json.dumps(json.load(call(control, 'GET', "/v1/state")), indent=2))
+    elif args.command == 'port':
+        ports = json.load(call(control, 'GET', "/v1/ports"))
+        if ports.get(args.service) is None:
+            sys.exit(f"No port known for {args.service}")
+        print(ports[args.service])
+    elif args.command in ('start', 'stop', 'restart'):
+        response = call(control, 'POST', f"/v1/services/{args.service}/{args.command}")
+        result = json.load(response)
+        print(result.get('message') or result.get('error'))
+        sys.exit(0 if response.status == 202 else 1)
+    elif args.command == 'logs':
+        path = f"/v1/logs?tail={args.tail}" + ("&follow=1" if args.follow else "")
+        response = call(control, 'GET', path, timeout=None if args.follow else 10)
+        lines = follow(response) if args.follow else json.load(response)
+        for line in lines:
+            print(f"[{line['time']}] {line['text']}", flush=True)
+    else:
+        for event in follow(call(control, 'GET', "/v1/events", timeout=None)):
+            print(json.dumps(event), flush=True)
+
+
+if __name__ == '__main__':
+    main()
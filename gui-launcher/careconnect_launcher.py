@@ -1,18 +1,54 @@
+import sys
+import time
+from launch_profile import LaunchProfile
+
+# With --profile-startup, time every import below and each startup phase
+LAUNCH_PROFILE = LaunchProfile() if '--profile-startup' in sys.argv else None
+if LAUNCH_PROFILE:
+    LAUNCH_PROFILE.trace_imports()
+
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, simpledialog
 import subprocess
 import threading
-import time
 import psutil
-import re
-import sys
 import os
-import webbrowser
+import argparse
+import json
+import shutil
+from tkinter import filedialog
 from pathlib import Path
 from datetime import datetime
+from urllib import request as urllib_request
+from metrics_exporter import MetricsRegistry, MetricsServer, PORT_DETECTION_BUCKETS, UI_STALL_BUCKETS
+from session_recorder import SessionRecorder, SessionReplay, prune_sessions, SESSION_SUFFIX
+from startup_profiler import StartupTimeline, StartupHistory, PHASES, PHASE_LABELS, READY_PHASE
+from disk_usage import DirectoryUsage, format_bytes
+from ui_state import StateStore, StateRenderer, LogQueue
+from ui_watchdog import UIWatchdog
+from ansi import AnsiDecoder, strip_segments, tag_style
+from output_reader import LineReader, FollowedFile, open_child_log
+from log_filter import LogFilter, EMIT, REPEAT
+from control_server import ControlServer, EventHub
+from resource_limits import ResourceGuard
+from process_registry import ServiceRegistry
+from net_telemetry import ConnectionTelemetry, WATCHED_PORTS, CLOSED, ephemeral_port_count, read_pool_size
+from service_manifest import load_manifest, for_checkout, dependency_order, Orchestrator, ServiceRuntime, ManifestError
+from checkouts import CheckoutStore  # Saved checkouts are registered at startup
+# Modules behind a dialog or action (snapshots, bundle report, profiler, preview, API
+# tracing and benchmark, webbrowser) are imported where they are used, to start faster
+
+if LAUNCH_PROFILE:
+    LAUNCH_PROFILE.stop_tracing()
+    LAUNCH_PROFILE.mark("imports")
+
+def mark_launch(phase):
+    """Record a startup phase when profiling the launch"""
+    if LAUNCH_PROFILE:
+        LAUNCH_PROFILE.mark(phase)
 
 class ProfessionalCareConnectLauncher:
-    def __init__(self):
+    def __init__(self, manifest_path=None, data_path=None):
         # Professional color scheme
         self.colors = {
             'primary': '#2563eb',      # Professional blue
@@ -33,23 +69,22 @@ class ProfessionalCareConnectLauncher:
 
         self.root = tk.Tk()
         self.root.title("CareConnect Development Suite")
+        mark_launch("Tk root")
         
         # Start maximized with professional styling
-        self.root.state('zoomed')
+        try:
+            self.root.state('zoomed')
+        except tk.TclError:
+            self.root.attributes('-zoomed', True)  # X11 has no 'zoomed' state
         self.root.resizable(True, True)
         self.root.configure(bg=self.colors['background'])
         
-        # Server process tracking
-        self.frontend_process = None
-        self.backend_process = None
-        self.both_servers_process = None
-        self.servers_running = False
-        self.detected_frontend_port = None  # Store detected port
-        self.detected_backend_port = 5000   # Default backend port
-        
-        # Project paths
-        self.project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.backend_path = os.path.join(self.project_path, "backend")
+        try:
+            self.init_state(manifest_path, data_path)
+        except ManifestError as e:
+            messagebox.showerror("Invalid services.json", str(e))
+            sys.exit(1)
+        mark_launch("state")
         
         # Browser options
         self.browser_options = {
@@ -62,21 +97,199 @@ class ProfessionalCareConnectLauncher:
             'Safari': 'safari'
         }
         
-        # Status variables
-        self.frontend_status = tk.StringVar(value="●")
-        self.backend_status = tk.StringVar(value="●")
+        # Heavyweight dialogs, built on first use and reused after that
+        self.browser_dialog = None
+        self.browser_url = None
+        self.confirm_dialog = None
+        self.message_dialog = None
         
         # Create the professional UI
         self.create_professional_ui()
-        
-        # Start monitoring
-        self.monitor_servers()
+        mark_launch("widgets")
+        
+        # Apply state changes on the Tk loop, coalesced per tick
+        self.renderer = StateRenderer(self.root, self.state, interval=100)
+        self.renderer.register('service.', self.render_service_status)
+        self.renderer.register('port.', self.render_service_details)
+        self.renderer.register('health.', self.render_service_details)
+        self.renderer.register('placement.', self.render_service_details)
+        self.renderer.register('metrics.', self.render_process_summary)
+        self.renderer.register('disk.', self.render_disk_usage)
+        self.renderer.on_tick(self.flush_log_queue)
+        self.renderer.start()
+        
+        # Measure event-loop lag and sample the main thread whenever it stalls
+        self.ui_watchdog = UIWatchdog(self.root, on_stall=self.report_ui_stall)
+        self.ui_watchdog.start()
+        self.watchdog_dialog = None
         
         # Handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Bind F11 key to toggle maximized state
         self.root.bind('<F11>', lambda e: self.toggle_maximized())
+        
+        # Paint the window first; the rest of startup runs once it is on screen
+        self.startup_finished = False
+        self.startup_binding = self.root.bind('<Expose>',
+                                              lambda e: self.root.after_idle(self.finish_startup), '+')
+        self.root.after(1500, self.finish_startup)  # In case no Expose arrives (e.g. started minimized)
+
+    def finish_startup(self):
+        """Startup work that can wait until the window has been drawn"""
+        if self.startup_finished:
+            return
+        self.startup_finished = True
+        self.root.unbind('<Expose>', self.startup_binding)  # Child widgets report their Expose here too
+        self.root.update_idletasks()
+        mark_launch("first paint")
+        
+        # Take over servers a previous launcher left running
+        self.adopt_running_services()
+        
+        # Start monitoring
+        self.monitor_servers()
+        self.monitor_disk_usage()
+        
+        # Local control API for scripts and editor integrations
+        self.start_control_server()
+        
+        # Serve metrics right away when requested through the environment
+        if os.environ.get('CARECONNECT_METRICS_PORT'):
+            self.start_metrics_endpoint()
+        mark_launch("deferred startup")
+
+    def init_state(self, manifest_path=None, data_path=None):
+        """Set up everything but the widgets; raises ManifestError for a bad manifest
+
+        Kept apart from the UI so the pipeline benchmark can run without a display.
+        """
+        # Shared state; background threads publish here and the main thread renders it
+        self.state = StateStore()
+        self.log_queue = LogQueue()
+        
+        # Repeated service lines collapse into a counter; each service is capped at N lines/s
+        self.log_filter = LogFilter(max_per_second=int(os.environ.get('CARECONNECT_LOG_RATE', '200')))
+        self.repeat_counts = {}   # service -> (run, count) not yet shown (written by reader threads)
+        self.repeat_lock = threading.Lock()
+        self.repeat_lines = {}    # service -> run of its last line in the log (main thread)
+        
+        # Local control API: recent log lines and state changes for its followers
+        self.log_hub = EventHub(maxlen=2000)
+        self.state_hub = EventHub(maxlen=1000)
+        self.state.subscribe(lambda key, value: self.state_hub.publish({'type': 'state', 'key': key, 'value': value}))
+        self.control_server = None
+        self.control_port = int(os.environ.get('CARECONNECT_CONTROL_PORT', '9465'))
+        
+        # Metrics (always collected, only served when the endpoint is enabled)
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+        self.metrics_port = int(os.environ.get('CARECONNECT_METRICS_PORT', '9464'))
+        self.service_spawn_times = {}  # service -> monotonic spawn time
+        self.service_starts = {}       # service -> number of starts this session
+        self.process_cache = {}        # pid -> psutil.Process (keeps cpu_percent baselines)
+        
+        # Project paths
+        self.project_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.backend_path = os.path.join(self.project_path, "backend")
+        
+        # Launcher data (session recordings, history files)
+        self.launcher_path = os.path.dirname(os.path.abspath(__file__))
+        self.data_path = data_path or os.path.join(self.launcher_path, "data")
+        self.sessions_path = os.path.join(self.data_path, "sessions")
+        self.session_recorder = None
+        self.active_replay = None
+        
+        # Managed services, described by services.json
+        self.manifest_path = manifest_path or os.path.join(self.launcher_path, "services.json")
+        self.service_specs = load_manifest(self.manifest_path, self.project_path)
+        self.services = {name: ServiceRuntime(spec) for name, spec in self.service_specs.items()}
+        self.orchestrator = Orchestrator(self.service_specs, self.spawn_service,
+                                         self.wait_service_ready, self.is_service_ready,
+                                         self.log_message, self.needs_local_service)
+        for name, runtime in self.services.items():
+            if runtime.port:
+                self.state.set(f'port.{name}', runtime.port)
+        
+        # Other checkouts (e.g. git worktrees of another branch), each on its own port block
+        self.checkout_store = CheckoutStore(os.path.join(self.data_path, "checkouts.json"), self.project_path)
+        self.checkouts = {}
+        self.checkouts_dialog = None
+        for checkout in self.checkout_store.load():
+            self.register_checkout(checkout)
+        
+        # Startup timeline profiling
+        self.startup_history = StartupHistory(os.path.join(self.data_path, "startup_history.jsonl"))
+        self.startup_timeline = None
+        self.startup_regression_threshold = 0.25  # Warn when 25% slower than the rolling median
+        self.timeline_dialog = None
+        
+        # Directories that grow without bound on long-lived boxes
+        self.disk_usage = {
+            'backend/uploads': DirectoryUsage(os.path.join(self.backend_path, "uploads")),
+            'backend/logs': DirectoryUsage(os.path.join(self.backend_path, "logs")),  # PM2 logs
+            # The launcher's own output: service and checkout logs, recorded sessions
+            'data/service_logs': DirectoryUsage(os.path.join(self.data_path, "service_logs")),
+            'data/checkouts': DirectoryUsage(os.path.join(self.data_path, "checkouts")),
+            'data/sessions': DirectoryUsage(os.path.join(self.data_path, "sessions")),
+        }
+        self.disk_usage_interval = 10  # seconds between incremental refreshes
+        
+        # Optional tracing proxy between Vite and the backend
+        self.api_tracer = None
+        self.api_trace_port = int(os.environ.get('CARECONNECT_TRACE_PORT', '5099'))
+        self.trace_dialog = None
+        
+        # Recorded API responses (captured by the tracing proxy) and the stub backend serving them
+        self.api_archive = None
+        self.record_api_responses = True
+        self.stub_server = None
+        
+        # Database snapshots of the seeded dev data
+        self.snapshots_path = os.path.join(self.data_path, "snapshots")
+        from db_snapshot import read_mongo_uri  # Cheap: pymongo and the worker pool load on first use
+        self.mongo_uri = read_mongo_uri(self.backend_path)
+        self.snapshot_dialog = None
+        self.snapshot_busy = threading.Lock()
+        
+        # Production preview: vite build output served with precompression and cache headers
+        self.dist_path = os.path.join(self.project_path, "dist")
+        self.preview_server = None
+        self.preview_port = int(os.environ.get('CARECONNECT_PREVIEW_PORT', '4173'))
+        self.preview_busy = threading.Lock()
+        self.build_history = None  # See get_build_history()
+        self.build_report_dialog = None
+        
+        # Backend profiling: the backend restarted with the Node inspector, captures in data/profiles
+        self.profiles_path = os.path.join(self.data_path, "profiles")
+        self.backend_inspect = False
+        self.inspector_line = None  # devtools_client.INSPECTOR_LINE, set with the inspector
+        self.inspector_urls = []  # Every "Debugger listening on ws://..." the backend printed
+        self.profile_busy = threading.Lock()
+        self.profiler_dialog = None
+        
+        # Socket telemetry per service, from the monitor's one connection scan per tick
+        self.service_pids = {}  # pid -> service for every managed process tree
+        self.connection_telemetry = ConnectionTelemetry({
+            # Mongoose pool plus the driver's monitoring sockets
+            'mongo_pool': ('backend', 27017, psutil.CONN_ESTABLISHED,
+                           read_pool_size(self.backend_path, self.mongo_uri) + 2),
+            'ephemeral_ports': (CLOSED, None, psutil.CONN_TIME_WAIT, ephemeral_port_count()),
+        })
+        self.network_dialog = None
+        
+        # Pids of the spawned services, so a restarted launcher adopts them instead of colliding
+        self.service_registry = ServiceRegistry(os.path.join(self.data_path, "running_services.json"))
+        # Service output goes to a file per service, which (unlike a pipe) survives the launcher
+        self.service_logs_path = os.path.join(self.data_path, "service_logs")
+        self.service_log_max_bytes = int(os.environ.get('CARECONNECT_SERVICE_LOG_MB', '20')) * 1024 * 1024
+        
+        # Latency baseline of the backend's GET endpoints, generated from its OpenAPI spec
+        self.api_baseline = None  # See get_api_baseline()
+        self.api_key = os.environ.get('CARECONNECT_API_KEY')  # Sent as X-API-Key to secured endpoints
+        self.api_bench_busy = threading.Lock()
+        self.api_bench_last = None
+        self.api_bench_dialog = None
 
     def create_professional_ui(self):
         """Create the professional user interface"""
@@ -106,6 +319,7 @@ class ProfessionalCareConnectLauncher:
         # Create professional sections
         self.create_server_control_panel(left_panel)
         self.create_quick_actions_panel(center_panel)
+        self.create_disk_usage_panel(center_panel)
         self.create_system_monitor_panel(right_panel)
 
     def create_professional_header(self, parent):
@@ -141,27 +355,29 @@ class ProfessionalCareConnectLauncher:
         status_left = tk.Frame(status_frame, bg=self.colors['surface'])
         status_left.pack(side=tk.LEFT)
         
-        # Frontend status
-        frontend_frame = tk.Frame(status_left, bg=self.colors['surface'])
-        frontend_frame.pack(side=tk.LEFT, padx=(0, 40))
-        
-        tk.Label(frontend_frame, text="Frontend", font=('Segoe UI', 11, 'bold'),
-                fg=self.colors['text'], bg=self.colors['surface']).pack(side=tk.LEFT)
-        self.frontend_indicator = tk.Label(frontend_frame, textvariable=self.frontend_status,
-                                         fg=self.colors['danger'], font=('Segoe UI', 14, 'bold'),
-                                         bg=self.colors['surface'])
-        self.frontend_indicator.pack(side=tk.LEFT, padx=(10, 0))
-        
-        # Backend status
-        backend_frame = tk.Frame(status_left, bg=self.colors['surface'])
-        backend_frame.pack(side=tk.LEFT)
-        
-        tk.Label(backend_frame, text="Backend", font=('Segoe UI', 11, 'bold'),
-                fg=self.colors['text'], bg=self.colors['surface']).pack(side=tk.LEFT)
-        self.backend_indicator = tk.Label(backend_frame, textvariable=self.backend_status,
-                                        fg=self.colors['danger'], font=('Segoe UI', 14, 'bold'),
-                                        bg=self.colors['surface'])
-        self.backend_indicator.pack(side=tk.LEFT, padx=(10, 0))
+        # One indicator per service in the manifest
+        self.status_indicators = {}
+        for name, spec in self.service_specs.items():
+            if spec.checkout_name:
+                continue  # Shown in the Checkouts dialog
+            service_frame = tk.Frame(status_left, bg=self.colors['surface'])
+            service_frame.pack(side=tk.LEFT, padx=(0, 40))
+            
+            tk.Label(service_frame, text=spec.label, font=('Segoe UI', 11, 'bold'),
+                    fg=self.colors['text'], bg=self.colors['surface']).pack(side=tk.LEFT)
+            indicator = tk.Label(service_frame, text="●",
+                                fg=self.colors['danger'], font=('Segoe UI', 14, 'bold'),
+                                bg=self.colors['surface'])
+            indicator.pack(side=tk.LEFT, padx=(10, 0))
+            details = tk.Label(service_frame, text="", font=('Segoe UI', 9),
+                              fg=self.colors['text_light'], bg=self.colors['surface'])
+            details.pack(side=tk.LEFT, padx=(6, 0))
+            self.status_indicators[name] = (indicator, details)
+        
+        # Right side - resource usage of launcher-managed processes
+        self.process_summary = tk.Label(status_frame, text="", font=('Segoe UI', 9),
+                                       fg=self.colors['text_light'], bg=self.colors['surface'])
+        self.process_summary.pack(side=tk.RIGHT)
 
     def create_server_control_panel(self, parent):
         """Create professional server control panel"""
@@ -182,49 +398,45 @@ class ProfessionalCareConnectLauncher:
         content.pack(fill=tk.X)
         
         # Main action buttons
-        self.start_both_btn = tk.Button(content, text="▶ START BOTH SERVERS",
-                                       command=self.start_both_servers,
-                                       font=('Segoe UI', 11, 'bold'),
-                                       bg=self.colors['success'], fg='white',
-                                       relief='flat', borderwidth=0,
-                                       padx=20, pady=12, cursor='hand2')
-        self.start_both_btn.pack(fill=tk.X, pady=(0, 10))
-        
-        self.stop_all_btn = tk.Button(content, text="⏹ STOP ALL SERVERS",
-                                     command=self.stop_both_servers,
+        self.start_all_btn = tk.Button(content, text="▶ START ALL SERVICES",
+                                      command=self.start_all_services,
+                                      font=('Segoe UI', 11, 'bold'),
+                                      bg=self.colors['success'], fg='white',
+                                      relief='flat', borderwidth=0,
+                                      padx=20, pady=12, cursor='hand2')
+        self.start_all_btn.pack(fill=tk.X, pady=(0, 10))
+        
+        self.stop_all_btn = tk.Button(content, text="⏹ STOP ALL SERVICES",
+                                     command=self.stop_all_services,
                                      font=('Segoe UI', 11, 'bold'),
                                      bg=self.colors['danger'], fg='white',
                                      relief='flat', borderwidth=0,
                                      padx=20, pady=12, cursor='hand2')
         self.stop_all_btn.pack(fill=tk.X, pady=(0, 15))
         
-        # Individual controls
+        # Individual controls, one row per service in the manifest
         controls_frame = tk.Frame(content, bg=self.colors['surface'])
         controls_frame.pack(fill=tk.X)
         
-        # Frontend controls
-        frontend_row = tk.Frame(controls_frame, bg=self.colors['surface'])
-        frontend_row.pack(fill=tk.X, pady=(0, 8))
-        
-        self.start_frontend_btn = tk.Button(frontend_row, text="Start Frontend",
-                                           command=self.start_frontend,
-                                           font=('Segoe UI', 10),
-                                           bg=self.colors['info'], fg='white',
-                                           relief='flat', borderwidth=0,
-                                           padx=15, pady=8, cursor='hand2')
-        self.start_frontend_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        
-        # Backend controls
-        backend_row = tk.Frame(controls_frame, bg=self.colors['surface'])
-        backend_row.pack(fill=tk.X, pady=(0, 8))
-        
-        self.start_backend_btn = tk.Button(backend_row, text="Start Backend",
-                                          command=self.start_backend,
-                                          font=('Segoe UI', 10),
-                                          bg=self.colors['secondary'], fg='white',
-                                          relief='flat', borderwidth=0,
-                                          padx=15, pady=8, cursor='hand2')
-        self.start_backend_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        for name, spec in self.service_specs.items():
+            if spec.checkout_name:
+                continue
+            row = tk.Frame(controls_frame, bg=self.colors['surface'])
+            row.pack(fill=tk.X, pady=(0, 8))
+            
+            color = self.colors.get(spec.color, self.colors['primary'])
+            tk.Button(row, text=f"Start {spec.label}",
+                     command=lambda n=name: self.start_services([n]),
+                     font=('Segoe UI', 10),
+                     bg=color, fg='white',
+                     relief='flat', borderwidth=0,
+                     padx=15, pady=8, cursor='hand2').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+            tk.Button(row, text="Stop",
+                     command=lambda n=name: self.run_in_background(self.stop_service, n),
+                     font=('Segoe UI', 10),
+                     bg=self.colors['text_light'], fg='white',
+                     relief='flat', borderwidth=0,
+                     padx=15, pady=8, cursor='hand2').pack(side=tk.LEFT)
         
         # Restart all
         self.restart_btn = tk.Button(content, text="🔄 RESTART ALL",
@@ -243,6 +455,15 @@ class ProfessionalCareConnectLauncher:
                                         relief='flat', borderwidth=0,
                                         padx=20, pady=8, cursor='hand2')
         self.clean_ports_btn.pack(fill=tk.X, pady=(5, 0))
+        
+        # Serve recorded API responses instead of running backend + Mongo
+        self.stub_btn = tk.Button(content, text="🧪 STUB BACKEND",
+                                 command=self.toggle_stub_backend,
+                                 font=('Segoe UI', 9),
+                                 bg=self.colors['text_light'], fg='white',
+                                 relief='flat', borderwidth=0,
+                                 padx=20, pady=8, cursor='hand2')
+        self.stub_btn.pack(fill=tk.X, pady=(5, 0))
 
     def create_quick_actions_panel(self, parent):
         """Create professional quick actions panel"""
@@ -292,7 +513,138 @@ class ProfessionalCareConnectLauncher:
                                      bg=self.colors['success'], fg='white',
                                      relief='flat', borderwidth=0,
                                      padx=20, pady=12, cursor='hand2')
-        self.terminal_btn.pack(fill=tk.X)
+        self.terminal_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.metrics_btn = tk.Button(content, text="📈 Start Metrics Endpoint",
+                                    command=self.toggle_metrics_endpoint,
+                                    font=('Segoe UI', 11),
+                                    bg=self.colors['text_light'], fg='white',
+                                    relief='flat', borderwidth=0,
+                                    padx=20, pady=12, cursor='hand2')
+        self.metrics_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.replay_btn = tk.Button(content, text="⏯ Replay Session",
+                                   command=self.choose_session_to_replay,
+                                   font=('Segoe UI', 11),
+                                   bg=self.colors['primary'], fg='white',
+                                   relief='flat', borderwidth=0,
+                                   padx=20, pady=12, cursor='hand2')
+        self.replay_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.timeline_btn = tk.Button(content, text="⏱ Startup Timeline",
+                                     command=self.show_startup_timeline,
+                                     font=('Segoe UI', 11),
+                                     bg=self.colors['accent'], fg='white',
+                                     relief='flat', borderwidth=0,
+                                     padx=20, pady=12, cursor='hand2')
+        self.timeline_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.trace_btn = tk.Button(content, text="🔍 API Tracing",
+                                  command=self.show_api_traces,
+                                  font=('Segoe UI', 11),
+                                  bg=self.colors['text_light'], fg='white',
+                                  relief='flat', borderwidth=0,
+                                  padx=20, pady=12, cursor='hand2')
+        self.trace_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.snapshot_btn = tk.Button(content, text="🗄 DB Snapshots",
+                                     command=self.show_db_snapshots,
+                                     font=('Segoe UI', 11),
+                                     bg=self.colors['secondary'], fg='white',
+                                     relief='flat', borderwidth=0,
+                                     padx=20, pady=12, cursor='hand2')
+        self.snapshot_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.preview_btn = tk.Button(content, text="🚀 Preview Production",
+                                    command=self.toggle_preview,
+                                    font=('Segoe UI', 11),
+                                    bg=self.colors['accent'], fg='white',
+                                    relief='flat', borderwidth=0,
+                                    padx=20, pady=12, cursor='hand2')
+        self.preview_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.bundle_btn = tk.Button(content, text="📦 Bundle Sizes",
+                                   command=self.show_build_report,
+                                   font=('Segoe UI', 11),
+                                   bg=self.colors['text_light'], fg='white',
+                                   relief='flat', borderwidth=0,
+                                   padx=20, pady=12, cursor='hand2')
+        self.bundle_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.profiler_btn = tk.Button(content, text="🔬 Backend Profiler",
+                                     command=self.show_backend_profiler,
+                                     font=('Segoe UI', 11),
+                                     bg=self.colors['secondary'], fg='white',
+                                     relief='flat', borderwidth=0,
+                                     padx=20, pady=12, cursor='hand2')
+        self.profiler_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.network_btn = tk.Button(content, text="🔌 Connections",
+                                    command=self.show_network_telemetry,
+                                    font=('Segoe UI', 11),
+                                    bg=self.colors['accent'], fg='white',
+                                    relief='flat', borderwidth=0,
+                                    padx=20, pady=12, cursor='hand2')
+        self.network_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.checkouts_btn = tk.Button(content, text="🌿 Checkouts",
+                                      command=self.show_checkouts,
+                                      font=('Segoe UI', 11),
+                                      bg=self.colors['success'], fg='white',
+                                      relief='flat', borderwidth=0,
+                                      padx=20, pady=12, cursor='hand2')
+        self.checkouts_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.api_bench_btn = tk.Button(content, text="⚡ API Benchmark",
+                                      command=self.show_api_benchmark,
+                                      font=('Segoe UI', 11),
+                                      bg=self.colors['warning'], fg='white',
+                                      relief='flat', borderwidth=0,
+                                      padx=20, pady=12, cursor='hand2')
+        self.api_bench_btn.pack(fill=tk.X, pady=(0, 8))
+        
+        self.watchdog_btn = tk.Button(content, text="🩺 UI Responsiveness",
+                                     command=self.show_ui_watchdog,
+                                     font=('Segoe UI', 11),
+                                     bg=self.colors['text_light'], fg='white',
+                                     relief='flat', borderwidth=0,
+                                     padx=20, pady=12, cursor='hand2')
+        self.watchdog_btn.pack(fill=tk.X)
+
+    def create_disk_usage_panel(self, parent):
+        """Create the disk usage panel for upload and log directories"""
+        panel_frame = tk.Frame(parent, bg=self.colors['surface'], relief='solid', bd=1)
+        panel_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        # Panel header
+        header = tk.Frame(panel_frame, bg=self.colors['warning'], height=40)
+        header.pack(fill=tk.X)
+        header.pack_propagate(False)
+        
+        tk.Label(header, text="Disk Usage", font=('Segoe UI', 12, 'bold'),
+                fg='white', bg=self.colors['warning']).pack(expand=True)
+        
+        # Panel content
+        content = tk.Frame(panel_frame, bg=self.colors['surface'], padx=20, pady=15)
+        content.pack(fill=tk.X)
+        
+        # One summary line per tracked directory
+        self.disk_usage_labels = {}
+        for name in self.disk_usage:
+            tk.Label(content, text=name, font=('Segoe UI', 10, 'bold'),
+                    fg=self.colors['text'], bg=self.colors['surface']).pack(anchor=tk.W)
+            label = tk.Label(content, text="Scanning...", font=('Segoe UI', 9),
+                            fg=self.colors['text_light'], bg=self.colors['surface'])
+            label.pack(anchor=tk.W, pady=(0, 6))
+            self.disk_usage_labels[name] = label
+        
+        # Largest files across all tracked directories
+        tk.Label(content, text="Largest files", font=('Segoe UI', 10, 'bold'),
+                fg=self.colors['text'], bg=self.colors['surface']).pack(anchor=tk.W, pady=(4, 0))
+        self.largest_files_label = tk.Label(content, text="", font=('Consolas', 8),
+                                           fg=self.colors['text_light'], bg=self.colors['surface'],
+                                           justify=tk.LEFT)
+        self.largest_files_label.pack(anchor=tk.W)
 
     def create_system_monitor_panel(self, parent):
         """Create professional system monitor panel"""
@@ -337,131 +689,262 @@ class ProfessionalCareConnectLauncher:
         self.log_text.tag_configure("info", foreground="#60a5fa")
         self.log_text.tag_configure("warning", foreground="#fbbf24")
         self.log_text.tag_configure("timestamp", foreground="#94a3b8")
+        self.log_text.tag_configure("repeat", foreground="#94a3b8")
+        self.ansi_tags = set()  # ANSI style tags configured so far (at most 64)
 
     # Server control methods
-    def start_both_servers(self):
-        """Start both frontend and backend servers"""
-        self.log_message("Starting both servers...", "info")
+    def run_in_background(self, target, *args):
+        """Run a blocking action off the Tk thread"""
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+    def start_all_services(self):
+        """Start every autostart service from the manifest"""
+        names = [name for name, spec in self.service_specs.items() if spec.autostart]
+        self.start_services(names)
+
+    def start_services(self, names):
+        """Start services and their dependencies in parallel, in dependency order"""
         try:
-            # Use the concurrently script from package.json - run in background
-            self.log_message("Using concurrently to start both servers...", "info")
-            self.both_servers_process = subprocess.Popen(
-                ["cmd", "/c", "npm", "run", "dev"],
-                cwd=self.project_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW  # Run in background
-            )
-            self.log_message("Both servers started successfully", "success")
-            
-            # Start a thread to monitor output
-            threading.Thread(target=self.monitor_process_output, 
-                           args=(self.both_servers_process, "Both Servers"), 
-                           daemon=True).start()
-            
-        except Exception as e:
-            self.log_message(f"Failed to start both servers, trying individually: {str(e)}", "warning")
-            # Fallback to starting individually
-            self.start_frontend()
-            time.sleep(1)
-            self.start_backend()
-
-    def start_frontend(self):
-        """Start the frontend development server"""
-        if self.frontend_process and self.frontend_process.poll() is None:
-            self.log_message("Frontend server already running", "warning")
+            order = self.orchestrator.plan(names)
+        except ManifestError as e:
+            self.log_message(str(e), "error")
             return
-
+        labels = ", ".join(self.service_specs[name].label for name in order)
+        self.log_message(f"Starting {labels}...", "info")
+        self.begin_startup_run(*names, replace=len(names) > 1)
+
+        def run():
+            results = self.orchestrator.start(names)
+            failed = [self.service_specs[name].label for name, ok in results.items() if not ok]
+            if failed:
+                self.log_message(f"Not ready: {', '.join(failed)}", "warning")
+            else:
+                self.log_message(f"All requested services are ready ({labels})", "success")
+
+        self.run_in_background(run)
+
+    def spawn_service(self, name):
+        """Spawn one service process (Orchestrator callback)"""
+        runtime = self.services[name]
+        spec = runtime.spec
+        if runtime.running:
+            self.log_message(f"{spec.label} already running", "warning")
+            return True
+
+        env = dict(os.environ)
+        env.update(spec.env)
+        if name == 'frontend' and self.api_tracer and self.api_tracer.running:
+            env['CARECONNECT_API_TARGET'] = self.api_tracer.url  # Read by vite.config.ts
+        if name == 'backend' and self.backend_inspect:
+            # Port 0: npm, the tsx watcher and the server each inherit this and need their own port
+            env['NODE_OPTIONS'] = f"{env.get('NODE_OPTIONS', '')} --inspect=127.0.0.1:0".strip()
+            self.inspector_urls = []
+        command = list(spec.command)
+        platform_options = {}
+        if sys.platform == 'win32':
+            command = ["cmd", "/c"] + command  # npm and friends are .cmd shims
+            platform_options['creationflags'] = subprocess.CREATE_NO_WINDOW  # Run in background
+        log_path = self.service_log_path(name)
         try:
-            self.log_message("Starting frontend server...", "info")
-            # Run in background without separate window
-            self.frontend_process = subprocess.Popen(
-                ["cmd", "/c", "npm", "run", "dev:frontend"],
-                cwd=self.project_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW  # Run in background
-            )
-            self.log_message("Frontend server started successfully", "success")
-            
-            # Start a thread to monitor output
-            threading.Thread(target=self.monitor_process_output, 
-                           args=(self.frontend_process, "Frontend"), 
-                           daemon=True).start()
-            
+            if spec.create_cwd:
+                os.makedirs(spec.cwd, exist_ok=True)
+            os.makedirs(self.service_logs_path, exist_ok=True)
+            self.log_message(f"Starting {spec.label}...", "info")
+            runtime.ready.clear()
+            runtime.detected_port = None
+            # A pipe would break with the launcher (EPIPE on the next write); a file does not
+            with open_child_log(log_path) as log_file:
+                runtime.process = subprocess.Popen(
+                    command,
+                    cwd=spec.cwd,
+                    env=env,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,  # Keep stderr in the same stream so nothing is lost
+                    **platform_options
+                )
         except Exception as e:
-            self.log_message(f"Failed to start frontend: {str(e)}", "error")
-
-    def start_backend(self):
-        """Start the backend server"""
-        if self.backend_process and self.backend_process.poll() is None:
-            self.log_message("Backend server already running", "warning")
+            self.log_message(f"Failed to start {spec.label}: {str(e)}", "error")
+            return False
+        self.record_service_start(name)
+        self.service_registry.record(name, runtime.process.pid)
+        self.log_message(f"{spec.label} started (pid {runtime.process.pid})", "success")
+        self.apply_resource_limits(name)
+        
+        # Start a thread to monitor output
+        self.follow_service_log(name, runtime.process)
+        return True
+
+    def service_log_path(self, name):
+        return os.path.join(self.service_logs_path, f"{name}.log")
+
+    def follow_service_log(self, name, process, from_end=False):
+        """Tail a service's log file into the System Monitor until the process exits"""
+        try:
+            stream = FollowedFile(self.service_log_path(name), lambda: process.poll() is None, from_end,
+                                  max_bytes=self.service_log_max_bytes)
+        except OSError as e:
+            self.log_message(f"Cannot read the output of {name}: {str(e)}", "error")
             return
-
+        threading.Thread(target=self.monitor_process_output,
+                         args=(process, name, stream),
+                         daemon=True).start()
+
+    def needs_local_service(self, name):
+        """True if MONGODB_URI points at one of the service's ports here (Orchestrator callback)
+
+        Decides whether an optional dependency such as mongo is started
+        without being asked for: not when the database is Atlas or another host.
+        """
+        from db_snapshot import local_ports
+        return bool(local_ports(self.mongo_uri) & set(self.service_specs[name].ports))
+
+    def is_service_ready(self, name):
+        """True if the service is up already, including instances started outside the launcher"""
+        runtime = self.services[name]
+        if runtime.running:
+            return runtime.ready.is_set()
+        if name == 'backend' and self.stub_server and self.stub_server.running:
+            return True
+        port = runtime.spec.ready_port
+        return bool(port) and self.port_accepts_connections(port)
+
+    def wait_service_ready(self, name, timeout):
+        """Block until the service meets its readiness condition (Orchestrator callback)"""
+        runtime = self.services[name]
+        spec = runtime.spec
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if runtime.ready.is_set():
+                return True
+            if not runtime.running:
+                self.log_message(f"{spec.label} exited before becoming ready", "error")
+                return False
+            if spec.ready_port and self.port_accepts_connections(spec.ready_port):
+                self.mark_service_ready(name, spec.ready_port)
+            elif spec.ready_health and spec.health_url and self.probe_health(spec.health_url, 1, name)[0]:
+                self.mark_service_ready(name)
+            runtime.ready.wait(0.25)
+        return runtime.ready.is_set()
+
+    def mark_service_ready(self, name, port=None):
+        """Record that a service is usable, optionally on a detected port"""
+        runtime = self.services[name]
+        if port:
+            runtime.detected_port = port
+            self.state.set(f'port.{name}', port)
+            if runtime.running:
+                self.service_registry.set_port(name, port)
+        if runtime.ready.is_set():
+            return
+        runtime.ready.set()
+        self.record_port_detection(name)
+        self.mark_startup_phase(name, 'listening')
+        where = f" on port {port}" if port else ""
+        self.log_message(f"{runtime.spec.label} is ready{where}", "success")
+
+    def stop_service(self, name, timeout=5):
+        """Stop a service together with its child processes"""
+        runtime = self.services[name]
+        process = runtime.process
+        if process is None:
+            return
+        self.service_registry.forget(name)
         try:
-            self.log_message("Starting backend server...", "info")
-            # Run in background without separate window
-            self.backend_process = subprocess.Popen(
-                ["cmd", "/c", "npm", "run", "dev"],
-                cwd=self.backend_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW  # Run in background
-            )
-            self.log_message("Backend server started successfully", "success")
-            
-            # Start a thread to monitor output
-            threading.Thread(target=self.monitor_process_output, 
-                           args=(self.backend_process, "Backend"), 
-                           daemon=True).start()
-            
-        except Exception as e:
-            self.log_message(f"Failed to start backend: {str(e)}", "error")
-
-    def stop_both_servers(self):
-        """Stop both servers"""
-        self.log_message("Stopping all servers...", "info")
-        
-        # Stop the combined process if it exists
-        if self.both_servers_process:
+            # npm/cmd wrappers do not forward signals, so stop the whole tree
             try:
-                # Try graceful termination first
-                self.both_servers_process.terminate()
-                # Wait a bit for graceful shutdown
+                children = psutil.Process(process.pid).children(recursive=True)
+            except psutil.Error:
+                children = []
+            process.terminate()
+            for child in children:
                 try:
-                    self.both_servers_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # Force kill if graceful shutdown fails
-                    self.both_servers_process.kill()
-                self.both_servers_process = None
-                self.log_message("Combined server process stopped", "success")
-            except Exception as e:
-                self.log_message(f"Error stopping combined process: {str(e)}", "error")
-        
-        # Stop individual processes if they exist
-        if self.frontend_process:
+                    child.terminate()
+                except psutil.Error:
+                    pass
             try:
-                self.frontend_process.terminate()
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                # Force kill if graceful shutdown fails
+                process.kill()
+            _, alive = psutil.wait_procs(children, timeout=timeout)
+            for child in alive:
                 try:
-                    self.frontend_process.wait(timeout=3)
-                except subprocess.TimeoutExpired:
-                    self.frontend_process.kill()
-                self.frontend_process = None
-                self.log_message("Frontend server stopped", "success")
-            except Exception as e:
-                self.log_message(f"Error stopping frontend: {str(e)}", "error")
-        
-        if self.backend_process:
+                    child.kill()
+                except psutil.Error:
+                    pass
+            self.log_message(f"{runtime.spec.label} stopped", "success")
+        except Exception as e:
+            self.log_message(f"Error stopping {runtime.spec.label}: {str(e)}", "error")
+        runtime.process = None
+        runtime.detected_port = None
+        runtime.ready.clear()
+        if runtime.guard:
+            runtime.guard.close()
+            runtime.guard = None
+            self.state.set(f'placement.{name}', "")
+
+    def adopt_running_services(self):
+        """Re-attach to services spawned by a launcher that closed or crashed while they kept running"""
+        adopted = self.service_registry.adopt()
+        if not adopted:
+            return
+        listening = self.get_listening_ports()
+        for name, (process, port) in adopted.items():
+            runtime = self.services.get(name)
+            if runtime is None:
+                self.service_registry.forget(name)  # Removed from services.json meanwhile
+                continue
+            runtime.process = process
+            if port:
+                runtime.detected_port = port
+                self.state.set(f'port.{name}', port)
+            if runtime.port in listening or not runtime.spec.ports:
+                runtime.ready.set()
+            self.apply_resource_limits(name)
+            where = f" on port {port}" if port else ""
+            self.log_message(f"Adopted running {runtime.spec.label} (pid {process.pid}){where}", "success")
+            # Earlier output stays in the file; the System Monitor continues from here
+            self.follow_service_log(name, process, from_end=True)
+
+    def apply_resource_limits(self, name):
+        """Place a freshly spawned service on its CPUs, priority and memory cgroup"""
+        runtime = self.services[name]
+        if runtime.guard:
+            runtime.guard.close()
+        guard = ResourceGuard(runtime.spec, name)
+        runtime.guard = guard if guard.active else None
+        if runtime.guard:
             try:
-                self.backend_process.terminate()
-                try:
-                    self.backend_process.wait(timeout=3)
-                except subprocess.TimeoutExpired:
-                    self.backend_process.kill()
-                self.backend_process = None
-                self.log_message("Backend server stopped", "success")
-            except Exception as e:
-                self.log_message(f"Error stopping backend: {str(e)}", "error")
+                guard.place([psutil.Process(runtime.process.pid)])
+            except psutil.NoSuchProcess:
+                pass
+            for error in guard.take_errors():
+                self.log_message(f"{runtime.spec.label} resources: {error}", "warning")
+
+    def enforce_resource_limits(self, name, guard, tree, rss):
+        """Place new children of a service and restart it on a memory breach (monitor thread)"""
+        runtime = self.services[name]
+        guard.place(tree)
+        for error in guard.take_errors():
+            self.log_message(f"{runtime.spec.label} resources: {error}", "warning")
+        self.state.set(f'placement.{name}', guard.placement(tree[0]))
+        reason = guard.check_memory(rss)
+        if reason:
+            self.log_message(f"Restarting {runtime.spec.label}: {reason}", "warning")
+            self.metrics.inc_counter("careconnect_service_memory_restarts_total", labels={'service': name},
+                                     help_text="Restarts caused by a service exceeding its memory limit")
+            self.run_in_background(self.restart_service, name)
+
+    def restart_service(self, name):
+        """Stop one service and start it again (blocking, run in background)"""
+        self.stop_service(name)
+        self.start_services([name])
+
+    def stop_all_services(self):
+        """Stop all services, dependents before their dependencies"""
+        self.log_message("Stopping all services...", "info")
+        for name in reversed(dependency_order(self.service_specs, self.service_specs)):
+            self.stop_service(name)
         
         # Kill any remaining node processes on common ports
         self.cleanup_port_processes()
@@ -469,78 +952,871 @@ class ProfessionalCareConnectLauncher:
     def cleanup_port_processes(self):
         """Clean up any remaining processes on development ports"""
         try:
-            ports_to_clean = [5000, 5173, 5174, 5175, 5176, 5177, 3000]
-            for port in ports_to_clean:
-                for conn in psutil.net_connections():
-                    if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
-                        try:
-                            process = psutil.Process(conn.pid)
-                            if 'node' in process.name().lower() or 'npm' in process.name().lower():
-                                process.terminate()
-                                self.log_message(f"Cleaned up process on port {port}", "info")
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
+            ports_to_clean = {port for spec in self.service_specs.values() for port in spec.ports}
+            ports_to_clean.add(3000)
+            for conn in psutil.net_connections():
+                if conn.laddr.port in ports_to_clean and conn.status == psutil.CONN_LISTEN:
+                    try:
+                        process = psutil.Process(conn.pid)
+                        if 'node' in process.name().lower() or 'npm' in process.name().lower():
+                            process.terminate()
+                            self.log_message(f"Cleaned up process on port {conn.laddr.port}", "info")
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
         except Exception as e:
             self.log_message(f"Error during port cleanup: {str(e)}", "warning")
 
-    def monitor_process_output(self, process, name):
-        """Monitor process output and log it"""
+    def monitor_process_output(self, process, name, stream=None):
+        """Monitor process output (its log file, or stdout for replays) and log it"""
+        recorder = None if getattr(process, 'is_replay', False) else self.get_session_recorder()
+        reader = LineReader(stream or process.stdout,
+                            on_chunk=(lambda chunk: recorder.record(name, chunk)) if recorder else None)
+        decoder = AnsiDecoder()  # Colour state carries over between lines, like a terminal
         try:
-            while process.poll() is None:
-                output = process.stdout.readline()
-                if output:
-                    line = output.decode().strip()
-                    if line:
-                        self.log_message(f"[{name}] {line}", "info")
-                        
-                        # Parse frontend port from Vite output - improved regex
-                        if "Local:" in line and "localhost:" in line:
-                            import re
-                            self.log_message(f"DEBUG: Processing Vite line: {line}", "info")
-
-                            # Match various Vite output formats
-                            port_patterns = [
-                                r'localhost:(\d+)',  # Basic format
-                                r'localhost:(?:\[1m)?(\d+)(?:\[22m)?',  # Colored format
-                                r'http://localhost:(\d+)',  # Full URL format
-                            ]
-
-                            for pattern in port_patterns:
-                                port_match = re.search(pattern, line)
-                                if port_match:
-                                    detected_port = int(port_match.group(1))
-                                    self.log_message(f"DEBUG: Regex matched port {detected_port} using pattern: {pattern}", "info")
-
-                                    # Always update for Vite ports (they take priority)
-                                    if detected_port in [5173, 5174, 5175, 5176, 5177]:
-                                        self.detected_frontend_port = detected_port
-                                        self.log_message(f"Detected Vite frontend port: {self.detected_frontend_port}", "success")
-                                        break
-                                    else:
-                                        self.log_message(f"DEBUG: Port {detected_port} is not a Vite port, ignoring", "info")
-                        
-                        # Parse backend port from server output
-                        elif "Server running on http://localhost:" in line:
-                            import re
-                            port_match = re.search(r'http://localhost:(\d+)', line)
-                            if port_match:
-                                self.detected_backend_port = int(port_match.group(1))
-                                self.log_message(f"Detected backend port: {self.detected_backend_port}", "success")
-                        
-                        # Handle port conflicts
-                        elif "EADDRINUSE" in line or "address already in use" in line:
-                            self.log_message(f"Port conflict detected in {name}", "error")
-                            
-                time.sleep(0.1)
+            # Read until EOF so output written just before exit is not dropped
+            for text in reader:
+                segments = strip_segments(decoder.feed(text))
+                if segments:
+                    line = "".join(text for text, _ in segments)
+                    self.handle_output_line(name, line, segments)
         except Exception as e:
             self.log_message(f"Error monitoring {name}: {str(e)}", "error")
+        finally:
+            reader.close()
+            if stream:
+                stream.close()
+
+    def handle_output_line(self, source, line, segments=None):
+        """Log one output line and apply the service's readiness rules to it
+
+        line is the plain text (escapes removed); segments carries its colours.
+        """
+        service = self.get_output_service(source, line)
+        runtime = self.services.get(service)
+        label = runtime.spec.label if runtime else source
+        self.mark_startup_phase(service, 'first_output')
+        self.log_output_line(service or source, label, line, segments)
+
+        # Each checkout also keeps its own log file
+        if runtime and runtime.spec.checkout_name:
+            checkout = self.checkouts.get(runtime.spec.checkout_name)
+            if checkout:
+                checkout.write_log(label, line)
+
+        # Remember where the backend's inspectors listen (a new one after each tsx restart)
+        if service == 'backend' and self.backend_inspect:
+            match = self.inspector_line.search(line)
+            if match:
+                self.inspector_urls = self.inspector_urls[-9:] + [match.group(1)]
+
+        # Handle port conflicts
+        if "EADDRINUSE" in line or "address already in use" in line:
+            self.log_message(f"Port conflict detected in {label}", "error")
+            return
+
+        # Detect readiness (and the actual port) from the service's own output
+        if runtime and runtime.spec.ready_log:
+            match = runtime.spec.ready_log.search(line)
+            if match:
+                port = int(match.group(1)) if match.re.groups and match.group(1) else None
+                if port and runtime.spec.ports and port not in runtime.spec.ports:
+                    self.log_message(f"{label} announced unexpected port {port}, ignoring", "warning")
+                else:
+                    self.mark_service_ready(service, port)
+
+    def log_output_line(self, service, label, line, segments=None):
+        """Send one service line through the dedup and rate-limit stage to the log"""
+        verdict, run, value = self.log_filter.feed(service, line)
+        if verdict == EMIT:
+            if value:
+                self.log_suppressed(service, value)
+            self.log_message(f"[{label}] ", "info", segments or [(line, None)], run=(service, run))
+            return
+        if verdict == REPEAT:
+            with self.repeat_lock:
+                self.repeat_counts[service] = (run, value)
+        self.metrics.inc_counter("careconnect_log_lines_filtered_total",
+                                 labels={'service': service, 'reason': verdict},
+                                 help_text="Service lines not shown as their own log entry (repeat or drop)")
+
+    def log_suppressed(self, service, count):
+        runtime = self.services.get(service)
+        label = runtime.spec.label if runtime else service
+        self.log_message(f"[{label}] … {count} lines suppressed (over {self.log_filter.max_per_second} lines/s, "
+                         f"full output in the session recording)", "warning")
+
+    # Session recording and replay
+    def get_session_recorder(self):
+        """Return the recorder for this launcher session, creating the file on first use"""
+        if self.session_recorder is None:
+            try:
+                os.makedirs(self.sessions_path, exist_ok=True)
+                prune_sessions(self.sessions_path, keep=19)
+                filename = datetime.now().strftime("session-%Y%m%d-%H%M%S") + SESSION_SUFFIX
+                self.session_recorder = SessionRecorder(os.path.join(self.sessions_path, filename))
+                self.log_message(f"Recording service output to {self.session_recorder.path}", "info")
+            except OSError as e:
+                self.log_message(f"Session recording disabled: {str(e)}", "warning")
+                self.session_recorder = False  # Don't retry on every line
+        return self.session_recorder or None
+
+    def choose_session_to_replay(self):
+        """Pick a recorded session and a replay speed"""
+        path = filedialog.askopenfilename(parent=self.root, title="Replay Session",
+                                          initialdir=self.sessions_path,
+                                          filetypes=[("Launcher sessions", f"*{SESSION_SUFFIX}"),
+                                                     ("All files", "*.*")])
+        if not path:
+            return
+        speed = simpledialog.askstring("Replay Speed",
+                                       "Replay speed (1 = real time, 10 = ten times faster, max = no delays):",
+                                       initialvalue="1", parent=self.root)
+        if speed is None:
+            return
+        try:
+            self.replay_session(path, parse_replay_speed(speed))
+        except ValueError as e:
+            self.show_custom_message_dialog("Replay Error", str(e), "error")
+
+    def replay_session(self, path, speed=1.0):
+        """Feed a recorded session through monitor_process_output"""
+        if self.active_replay:
+            self.log_message("A replay is already running", "warning")
+            return
+        try:
+            replay = SessionReplay(path, speed)
+        except (OSError, ValueError) as e:
+            self.log_message(f"Cannot replay {path}: {str(e)}", "error")
+            return
+        self.active_replay = replay
+        speed_text = f"{speed:g}x" if speed else "max speed"
+        self.log_message(f"Replaying {os.path.basename(path)} at {speed_text} "
+                         f"({len(replay.records)} chunks, {replay.total_bytes} bytes)", "info")
+        monitors = [threading.Thread(target=self.monitor_process_output, args=(process, name), daemon=True)
+                    for name, process in replay.processes.items()]
+
+        def run():
+            started = time.perf_counter()
+            for monitor in monitors:
+                monitor.start()
+            replay.run()
+            for monitor in monitors:
+                monitor.join()
+            elapsed = time.perf_counter() - started
+            self.active_replay = None
+            rate = replay.total_bytes / elapsed / 1024 if elapsed else 0
+            self.log_message(f"Replay finished in {elapsed:.2f}s ({rate:.0f} KiB/s)", "success")
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # Startup timeline methods
+    def begin_startup_run(self, *services, replace=True):
+        """Start timing a launch; individual starts join a run that is still in progress"""
+        current = self.startup_timeline
+        if not replace and current and not current.finished:
+            for service in services:
+                current.add(service)
+            return
+        if current and not current.finished:
+            current.finished = True  # Abandon the previous run without recording it
+        timeline = StartupTimeline(services)
+        self.startup_timeline = timeline
+        threading.Thread(target=self.watch_startup, args=(timeline,), daemon=True).start()
+
+    def mark_startup_phase(self, service, phase):
+        """Record a startup phase for the current run"""
+        timeline = self.startup_timeline
+        if service and timeline and timeline.mark(service, phase):
+            elapsed = timeline.elapsed(service, phase)
+            self.log_message(f"⏱ {service} {PHASE_LABELS[phase]} after {elapsed:.2f}s", "info")
+
+    def get_output_service(self, source, line):
+        """Map an output line to the service that wrote it"""
+        if source in self.services:
+            return source
+        # Sessions recorded before services.json used display labels...
+        for name, spec in self.service_specs.items():
+            if spec.label == source:
+                return name
+        # ...or the concurrently-based `npm run dev`, which prefixes lines with the command index
+        if line.startswith("[0]"):
+            return "frontend"
+        if line.startswith("[1]"):
+            return "backend"
+        return None
+
+    def port_accepts_connections(self, port):
+        """Cheap TCP connect check, much faster than scanning all connections"""
+        import socket
+        try:
+            with socket.create_connection(('localhost', port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+
+    def watch_startup(self, timeline, timeout=300):
+        """Poll the health endpoints during startup and close the run once everything is ready"""
+        deadline = time.monotonic() + timeout
+        while not timeline.finished and time.monotonic() < deadline:
+            if 'backend' in timeline.services and timeline.elapsed('backend', 'health_db') is None:
+                if (timeline.elapsed('backend', 'listening') is not None
+                        or self.port_accepts_connections(self.services['backend'].port)):
+                    if timeline.elapsed('backend', 'health') is None:
+                        if self.probe_health("/api/v1/health", timeout=1)[0]:
+                            self.mark_startup_phase('backend', 'health')
+                    elif self.probe_health("/api/v1/health/db", timeout=1)[0]:
+                        self.mark_startup_phase('backend', 'health_db')
+            if timeline.is_complete():
+                self.finish_startup_run(timeline)
+                return
+            time.sleep(0.25)
+        if not timeline.finished:
+            timeline.finished = True
+            self.startup_history.append(timeline.to_record())
+            waiting = [service for service in timeline.services if not timeline.is_ready(service)]
+            self.log_message(f"Startup did not complete within {timeout}s (waiting for: {', '.join(waiting)})",
+                             "warning")
+
+    def finish_startup_run(self, timeline):
+        """Store a completed run and warn if it regressed against the rolling median"""
+        timeline.finished = True
+        median, regressed = self.startup_history.check_regression(
+            timeline, self.startup_regression_threshold)
+        self.startup_history.append(timeline.to_record())
+        ready = timeline.time_to_ready()
+        if median is None:
+            self.log_message(f"⏱ Startup ready in {ready:.2f}s", "success")
+        elif regressed:
+            self.log_message(f"⏱ Startup regression: ready in {ready:.2f}s vs rolling median "
+                             f"{median:.2f}s (+{(ready / median - 1) * 100:.0f}%)", "warning")
+        else:
+            self.log_message(f"⏱ Startup ready in {ready:.2f}s (rolling median {median:.2f}s)", "success")
+
+    def show_startup_timeline(self):
+        """Show the phases of the latest startup run as a waterfall"""
+        if self.timeline_dialog and self.timeline_dialog.winfo_exists():
+            self.timeline_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Startup Timeline")
+        dialog.geometry("820x420")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.timeline_dialog = dialog
+
+        summary = tk.Label(dialog, font=('Segoe UI', 11, 'bold'), fg=self.colors['text'],
+                           bg=self.colors['surface'], anchor=tk.W, padx=20, pady=12)
+        summary.pack(fill=tk.X)
+        canvas = tk.Canvas(dialog, bg=self.colors['surface'], highlightthickness=0)
+        canvas.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+
+        def redraw():
+            if not dialog.winfo_exists():
+                return
+            self.draw_startup_waterfall(canvas, summary)
+            timeline = self.startup_timeline
+            if timeline and not timeline.finished:
+                dialog.after(500, redraw)
+
+        canvas.bind('<Configure>', lambda e: self.draw_startup_waterfall(canvas, summary))
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        redraw()
+
+    def draw_startup_waterfall(self, canvas, summary):
+        """Draw one row per reached phase, each bar spanning from the previous phase"""
+        canvas.delete('all')
+        timeline = self.startup_timeline
+        if timeline is None:
+            runs = self.startup_history.load()
+            if not runs:
+                summary.config(text="No startup recorded yet - click START ALL SERVICES")
+                return
+            record = runs[-1]
+        else:
+            record = timeline.to_record()
+
+        median = self.startup_history.rolling_median(record['key'])
+        ready = record['time_to_ready']
+        text = f"Run started {record['started_at']}   "
+        text += f"Time to ready: {ready:.2f}s" if ready is not None else "Time to ready: (in progress)"
+        if median is not None:
+            text += f"   Rolling median: {median:.2f}s"
+        summary.config(text=text)
+
+        rows = []
+        for service, phases in record['services'].items():
+            previous = 0.0
+            for phase, label in PHASES:
+                if phase in phases:
+                    rows.append((service, label, previous, phases[phase],
+                                 phase == READY_PHASE.get(service, 'listening')))
+                    previous = phases[phase]
+        if not rows:
+            return
+
+        width = max(canvas.winfo_width(), 400)
+        label_width = 260
+        span = max([end for _, _, _, end, _ in rows] + [median or 0]) or 1.0
+        scale = (width - label_width - 70) / span
+        colors = {'frontend': self.colors['info'], 'backend': self.colors['secondary']}
+        for i, (service, label, start, end, is_ready) in enumerate(rows):
+            y = 10 + i * 28
+            canvas.create_text(5, y + 9, text=f"{service}: {label}", anchor=tk.W,
+                               font=('Segoe UI', 10), fill=self.colors['text'])
+            x0 = label_width + start * scale
+            x1 = max(label_width + end * scale, x0 + 2)
+            canvas.create_rectangle(x0, y, x1, y + 18, width=0,
+                                    fill=self.colors['success'] if is_ready else colors.get(service, self.colors['primary']))
+            canvas.create_text(x1 + 6, y + 9, text=f"{end:.2f}s", anchor=tk.W,
+                               font=('Segoe UI', 9), fill=self.colors['text_light'])
+        if median is not None:
+            x = label_width + median * scale
+            canvas.create_line(x, 0, x, 10 + len(rows) * 28, dash=(4, 3), fill=self.colors['warning'])
+            canvas.create_text(x, 14 + len(rows) * 28, text="median", anchor=tk.N,
+                               font=('Segoe UI', 9), fill=self.colors['warning'])
+
+    # API tracing methods
+    def start_api_tracing(self):
+        """Start the tracing proxy in front of the backend"""
+        if self.api_tracer and self.api_tracer.running:
+            return
+        from api_tracer import TracingProxy
+        backend = self.services.get('backend')
+        target_port = backend.port if backend else 5000
+        try:
+            self.api_tracer = TracingProxy(target_port, port=self.api_trace_port,
+                                           on_response=self.record_api_response if self.record_api_responses else None)
+            self.api_tracer.start()
+        except OSError as e:
+            self.api_tracer = None
+            self.log_message(f"Could not start API tracing on port {self.api_trace_port}: {str(e)}", "error")
+            return
+        self.trace_btn.config(bg=self.colors['success'])
+        self.log_message(f"API tracing proxy on {self.api_tracer.url} -> backend port {target_port}", "success")
+        frontend = self.services.get('frontend')
+        if frontend and frontend.running:
+            self.log_message("Restart the frontend so Vite sends /api through the tracing proxy", "warning")
+
+    def stop_api_tracing(self):
+        """Stop the tracing proxy; the frontend must be restarted to talk to the backend directly"""
+        if not self.api_tracer:
+            return
+        self.api_tracer.stop()
+        self.api_tracer = None
+        self.trace_btn.config(bg=self.colors['text_light'])
+        self.log_message("API tracing stopped", "info")
+        frontend = self.services.get('frontend')
+        if frontend and frontend.running:
+            self.log_message("Restart the frontend, its /api proxy still points at the stopped tracer", "warning")
+
+    def get_api_archive(self):
+        """Return the recorded API responses, loading the index on first use"""
+        if self.api_archive is None:
+            from api_archive import ApiArchive
+            self.api_archive = ApiArchive(os.path.join(self.data_path, "api_archive"))
+        return self.api_archive
+
+    def record_api_response(self, method, target, status, headers, body):
+        """Store a proxied backend response for the stub backend (tracing proxy callback)"""
+        self.get_api_archive().record(method, target, status, headers, body)
+
+    def set_api_recording(self, enabled):
+        self.record_api_responses = enabled
+        if self.api_tracer:
+            self.api_tracer.on_response = self.record_api_response if enabled else None
+
+    def start_stub_backend(self):
+        """Answer on the backend port from recorded responses"""
+        backend = self.services.get('backend')
+        if backend and backend.running:
+            self.log_message("Stop the backend before starting the stub backend", "error")
+            return
+        port = backend.spec.ports[0] if backend and backend.spec.ports else 5000
+        from api_archive import StubServer
+        archive = self.get_api_archive()
+        routes, bodies, size = archive.stats()
+        try:
+            self.stub_server = StubServer(archive, port=port, on_miss=lambda route: self.log_message(
+                f"Stub backend: {route} was never recorded (501)", "warning"))
+            self.stub_server.start()
+        except OSError as e:
+            self.stub_server = None
+            self.log_message(f"Could not start the stub backend on port {port}: {str(e)}", "error")
+            return
+        self.stub_btn.config(text="🧪 STOP STUB BACKEND", bg=self.colors['success'])
+        self.log_message(f"Stub backend on port {port}: {routes} recorded routes, "
+                         f"{bodies} distinct bodies ({format_bytes(size)})", "success")
+        if not routes:
+            self.log_message("Nothing recorded yet - use the app with API Tracing on to record responses",
+                             "warning")
+
+    def stop_stub_backend(self):
+        if self.stub_server:
+            self.stub_server.stop()
+            self.log_message(f"Stub backend stopped ({self.stub_server.hits} served, "
+                             f"{self.stub_server.misses} unrecorded)", "info")
+            self.stub_server = None
+            self.stub_btn.config(text="🧪 STUB BACKEND", bg=self.colors['text_light'])
+
+    def toggle_stub_backend(self):
+        if self.stub_server and self.stub_server.running:
+            self.stop_stub_backend()
+        else:
+            self.start_stub_backend()
+
+    # Production preview methods
+    def build_frontend(self, force=False):
+        """Run `vite build` unless the build inputs are unchanged since the last build; returns success"""
+        from build_report import remove_sourcemaps
+        from preview_server import SourceTracker, precompress
+        tracker = SourceTracker(self.project_path, os.path.join(self.data_path, "preview_build.json"))
+        needed, source_hash = tracker.needs_build(self.dist_path)
+        if not needed and not force:
+            self.log_message("Production build is up to date (sources unchanged)", "info")
+            remove_sourcemaps(self.dist_path)  # Left behind if an earlier run was interrupted
+            precompress(self.dist_path)  # No-op unless an earlier run was interrupted
+            return True
+        self.log_message("Building the frontend (vite build)...", "info")
+        # The manifest and hidden sourcemaps feed the bundle size report (the maps are deleted after it)
+        command = ["npm", "run", "build", "--", "--manifest", "--sourcemap", "hidden"]
+        platform_options = {}
+        if sys.platform == 'win32':
+            command = ["cmd", "/c"] + command
+            platform_options['creationflags'] = subprocess.CREATE_NO_WINDOW
+        started = time.perf_counter()
+        try:
+            process = subprocess.Popen(command, cwd=self.project_path, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, **platform_options)
+        except OSError as e:
+            self.log_message(f"Could not run the build: {str(e)}", "error")
+            return False
+        reader = LineReader(process.stdout)
+        decoder = AnsiDecoder()
+        try:
+            for text in reader:
+                segments = strip_segments(decoder.feed(text))
+                if segments:
+                    self.log_message("[Build] ", "info", segments)
+        finally:
+            reader.close()
+        if process.wait() != 0:
+            self.log_message(f"Build failed (exit code {process.returncode})", "error")
+            return False
+        tracker.mark_built(source_hash)
+        self.log_message(f"Frontend built in {time.perf_counter() - started:.1f}s", "success")
+        started = time.perf_counter()
+        files, size = precompress(self.dist_path)
+        if files:
+            self.log_message(f"Precompressed {files} files ({format_bytes(size)}) in "
+                             f"{time.perf_counter() - started:.1f}s", "info")
+        try:
+            self.record_build_report(source_hash)
+        finally:
+            remove_sourcemaps(self.dist_path)
+        return True
+
+    def record_build_report(self, source_hash):
+        """Measure the fresh build, store it in the history and warn about grown chunks"""
+        from build_report import analyze_build, compare_builds
+        try:
+            report = analyze_build(self.dist_path)
+        except OSError as e:
+            self.log_message(f"Could not analyse the build: {str(e)}", "warning")
+            return
+        previous = self.get_build_history().latest()
+        report.update(timestamp=datetime.now().isoformat(timespec='seconds'), source_hash=source_hash)
+        self.get_build_history().append(report)
+        totals = report['totals']
+        change = ""
+        if previous:
+            delta = totals['gzip'] - previous['totals']['gzip']
+            change = f", {'+' if delta >= 0 else '-'}{format_bytes(abs(delta))} gzip since the previous build"
+        self.log_message(f"Bundle: {len(report['chunks'])} files, {format_bytes(totals['raw'])} raw, "
+                         f"{format_bytes(totals['gzip'])} gzip{change}", "info")
+        for key, old, new in compare_builds(previous, report):
+            growth = f"+{(new - old) / old * 100:.0f}%" if old else "new"
+            self.log_message(f"Bundle growth: {key} {format_bytes(old)} → {format_bytes(new)} gzip ({growth})",
+                             "warning")
+        if self.build_report_dialog and self.build_report_dialog.winfo_exists():
+            self.root.after(0, self.refresh_build_report)
+
+    def get_build_history(self):
+        """Return the bundle size history, loading build_report on first use"""
+        if self.build_history is None:
+            from build_report import BuildHistory
+            self.build_history = BuildHistory(os.path.join(self.data_path, "build_history.jsonl"))
+        return self.build_history
+
+    def show_build_report(self):
+        """Show chunk sizes of the latest production build against the previous one"""
+        if self.build_report_dialog and self.build_report_dialog.winfo_exists():
+            self.build_report_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Bundle Sizes")
+        dialog.geometry("900x600")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.build_report_dialog = dialog
+
+        toolbar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        toolbar.pack(fill=tk.X)
+        tk.Button(toolbar, text="Build & Analyse", font=('Segoe UI', 10),
+                  # Always rebuild: the maps for module attribution only exist during a build
+                  command=lambda: self.run_in_background(self.build_frontend, True),
+                  bg=self.colors['primary'], fg='white', relief='flat', borderwidth=0,
+                  padx=14, pady=6, cursor='hand2').pack(side=tk.LEFT)
+        self.build_report_summary = tk.Label(toolbar, font=('Segoe UI', 10), fg=self.colors['text'],
+                                             bg=self.colors['surface'], anchor=tk.W, padx=12)
+        self.build_report_summary.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.build_report_text = scrolledtext.ScrolledText(dialog, font=('Consolas', 9), wrap=tk.NONE,
+                                                           bg=self.colors['surface'], fg=self.colors['text'])
+        self.build_report_text.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        self.build_report_text.tag_configure('grown', foreground=self.colors['danger'])
+        self.build_report_text.tag_configure('heading', font=('Consolas', 9, 'bold'))
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        self.refresh_build_report()
+
+    def refresh_build_report(self):
+        """Render the latest build report into the dialog (main thread)"""
+        from build_report import compare_builds
+        if not (self.build_report_dialog and self.build_report_dialog.winfo_exists()):
+            return
+        builds = self.get_build_history().load()
+        text = self.build_report_text
+        text.config(state=tk.NORMAL)
+        text.delete('1.0', tk.END)
+        if not builds:
+            self.build_report_summary.config(text="No build analysed yet - click Build & Analyse or Preview Production")
+            text.config(state=tk.DISABLED)
+            return
+        report = builds[-1]
+        previous = builds[-2] if len(builds) > 1 else None
+        grown = {key for key, _, _ in compare_builds(previous, report)}
+        totals = report['totals']
+        self.build_report_summary.config(
+            text=f"{report['timestamp']} · {len(report['chunks'])} files · {format_bytes(totals['raw'])} raw · "
+                 f"{format_bytes(totals['gzip'])} gzip" +
+                 (f" · {format_bytes(totals['brotli'])} brotli" if totals['brotli'] else ""))
+
+        def size(value):
+            return format_bytes(value) if value is not None else "-"
+
+        text.insert(tk.END, f"{'Chunk':<48}{'Raw':>11}{'Gzip':>11}{'Brotli':>11}{'Δ gzip':>12}\n", 'heading')
+        for key, chunk in sorted(report['chunks'].items(), key=lambda item: item[1]['gzip'], reverse=True):
+            old = previous['chunks'].get(key) if previous else None
+            delta = chunk['gzip'] - old['gzip'] if old else None
+            change = ("new" if previous else "") if delta is None else \
+                f"{'+' if delta >= 0 else '-'}{format_bytes(abs(delta))}"
+            text.insert(tk.END, f"{key[-47:]:<48}{size(chunk['raw']):>11}{size(chunk['gzip']):>11}"
+                                f"{size(chunk['brotli']):>11}{change:>12}\n", 'grown' if key in grown else ())
+        if report['modules']:
+            text.insert(tk.END, "\nLargest contributors (minified, from sourcemaps)\n", 'heading')
+            for module, module_size in report['modules']:
+                text.insert(tk.END, f"{module[-58:]:<60}{format_bytes(module_size):>11}\n")
+        if len(builds) > 1:
+            text.insert(tk.END, "\nHistory (gzip total)\n", 'heading')
+            for build in builds[-10:]:
+                text.insert(tk.END, f"{build['timestamp']:<22}{format_bytes(build['totals']['gzip']):>11}\n")
+        text.config(state=tk.DISABLED)
+
+    def start_preview(self):
+        """Build if needed, precompress and serve dist/ (blocking, run in background)"""
+        from preview_server import PreviewServer, precompress
+        if not self.preview_busy.acquire(blocking=False):
+            self.log_message("The production preview is already being prepared", "warning")
+            return
+        try:
+            if not self.build_frontend():
+                return
+            backend_port = self.services['backend'].port if 'backend' in self.services else 5000
+            server = PreviewServer(self.dist_path, port=self.preview_port, api_port=backend_port)
+            try:
+                server.start()
+            except OSError as e:
+                self.log_message(f"Could not serve the preview on port {self.preview_port}: {str(e)}", "error")
+                return
+            self.preview_server = server
+            self.root.after(0, lambda: self.preview_btn.config(text="⏹ Stop Preview", bg=self.colors['success']))
+            self.log_message(f"Production preview on {server.url} (/api → port {backend_port})", "success")
+            import webbrowser
+            webbrowser.open(server.url)
+        finally:
+            self.preview_busy.release()
+
+    def stop_preview(self):
+        if self.preview_server:
+            self.preview_server.stop()
+            self.preview_server = None
+            self.preview_btn.config(text="🚀 Preview Production", bg=self.colors['accent'])
+            self.log_message("Production preview stopped", "info")
+
+    def toggle_preview(self):
+        if self.preview_server and self.preview_server.running:
+            self.stop_preview()
+        else:
+            self.run_in_background(self.start_preview)
+
+    def show_api_traces(self):
+        """Show traced API calls grouped by page load, with a waterfall for the selected load"""
+        if self.trace_dialog and self.trace_dialog.winfo_exists():
+            self.trace_dialog.lift()
+            return
+        from api_tracer import group_page_loads
+        dialog = tk.Toplevel(self.root)
+        dialog.title("API Tracing")
+        dialog.geometry("1100x560")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.trace_dialog = dialog
+
+        toolbar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        toolbar.pack(fill=tk.X)
+        toggle_btn = tk.Button(toolbar, font=('Segoe UI', 10), fg='white', relief='flat',
+                               borderwidth=0, padx=14, pady=6, cursor='hand2')
+        toggle_btn.pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Clear", font=('Segoe UI', 10),
+                  command=lambda: (self.api_tracer and self.api_tracer.clear(), refresh(force=True)),
+                  bg=self.colors['text_light'], fg='white', relief='flat', borderwidth=0,
+                  padx=14, pady=6, cursor='hand2').pack(side=tk.LEFT, padx=(8, 0))
+        record_var = tk.BooleanVar(value=self.record_api_responses)
+        tk.Checkbutton(toolbar, text="Record responses for the stub backend", variable=record_var,
+                       command=lambda: self.set_api_recording(record_var.get()),
+                       font=('Segoe UI', 10), fg=self.colors['text'], bg=self.colors['surface'],
+                       activebackground=self.colors['surface']).pack(side=tk.LEFT, padx=(12, 0))
+        summary = tk.Label(toolbar, font=('Segoe UI', 10), fg=self.colors['text'],
+                           bg=self.colors['surface'], anchor=tk.W, padx=12)
+        summary.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        body = tk.Frame(dialog, bg=self.colors['surface'])
+        body.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        loads_list = tk.Listbox(body, width=42, font=('Consolas', 9), activestyle='none',
+                                exportselection=False)
+        loads_list.pack(side=tk.LEFT, fill=tk.Y)
+        canvas = tk.Canvas(body, bg=self.colors['surface'], highlightthickness=0)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0))
+        shown = {'loads': [], 'count': -1}
+
+        def toggle():
+            if self.api_tracer and self.api_tracer.running:
+                self.stop_api_tracing()
+            else:
+                self.start_api_tracing()
+            refresh(force=True)
+
+        def draw_selected(event=None):
+            selection = loads_list.curselection()
+            if selection and selection[0] < len(shown['loads']):
+                self.draw_api_waterfall(canvas, shown['loads'][selection[0]])
+            else:
+                canvas.delete('all')
+
+        def refresh(force=False):
+            if not dialog.winfo_exists():
+                return
+            running = bool(self.api_tracer and self.api_tracer.running)
+            toggle_btn.config(text="Stop Tracing" if running else "Start Tracing",
+                              bg=self.colors['danger'] if running else self.colors['success'],
+                              command=toggle)
+            traces = self.api_tracer.traces() if self.api_tracer else []
+            if force or len(traces) != shown['count']:
+                selection = loads_list.curselection()
+                follow = not selection or selection[0] == len(shown['loads']) - 1
+                shown['loads'] = group_page_loads(traces)
+                shown['count'] = len(traces)
+                loads_list.delete(0, tk.END)
+                for load in shown['loads']:
+                    started = datetime.fromtimestamp(load['started']).strftime("%H:%M:%S")
+                    warn = " ⚠" if load['repeated'] else ""
+                    loads_list.insert(tk.END, f"{started} {load['page'][:24]:<24} {len(load['requests']):>3}{warn}")
+                if shown['loads']:
+                    index = len(shown['loads']) - 1 if follow else min(selection[0], len(shown['loads']) - 1)
+                    loads_list.selection_set(index)
+                    loads_list.see(index)
+                draw_selected()
+            if running:
+                summary.config(text=f"Vite -> {self.api_tracer.url} -> backend :{self.api_tracer.target_port}"
+                                    f"   {len(traces)} requests, {len(shown['loads'])} page loads")
+            else:
+                summary.config(text="Tracing is off. Start it, then restart the frontend.")
+            dialog.after(1000, refresh)
+
+        loads_list.bind('<<ListboxSelect>>', draw_selected)
+        canvas.bind('<Configure>', draw_selected)
+        canvas.bind('<MouseWheel>', lambda e: canvas.yview_scroll(-e.delta // 120, 'units'))
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        refresh(force=True)
+
+    def draw_api_waterfall(self, canvas, load):
+        """One row per request: connect, waiting for the first byte, then download"""
+        canvas.delete('all')
+        requests = load['requests']
+        width = max(canvas.winfo_width(), 400)
+        label_width = 380
+        span = max((load['end'] - load['started']) * 1000, 1.0)
+        scale = (width - label_width - 70) / span
+        y = 10
+        if load['repeated']:
+            repeated = ", ".join(f"{endpoint} x{count}" for endpoint, count in load['repeated'][:3])
+            canvas.create_text(5, y + 7, text=f"⚠ Possible N+1: {repeated}", anchor=tk.W,
+                               font=('Segoe UI', 10, 'bold'), fill=self.colors['warning'])
+            y += 26
+        for trace in requests:
+            offset = (trace['started'] - load['started']) * 1000
+            status = trace['status'] or "ERR"
+            label = f"{trace['method']} {trace['path'][:38]} {status}"
+            canvas.create_text(5, y + 9, text=label, anchor=tk.W, font=('Consolas', 9),
+                               fill=self.colors['danger'] if trace['error'] or (trace['status'] or 500) >= 400
+                               else self.colors['text'])
+            x = label_width + offset * scale
+            segments = [(trace['connect_ms'], self.colors['border']),
+                        (trace['ttfb_ms'], self.colors['primary']),
+                        (trace['total_ms'], self.colors['success'])]
+            previous = 0.0
+            for end, color in segments:
+                if end is None or end <= previous:
+                    continue
+                canvas.create_rectangle(x + previous * scale, y, max(x + end * scale, x + previous * scale + 1),
+                                        y + 18, width=0, fill=color)
+                previous = end
+            total = trace['total_ms'] or 0
+            canvas.create_text(x + total * scale + 6, y + 9, anchor=tk.W, font=('Segoe UI', 9),
+                               fill=self.colors['text_light'],
+                               text=f"{total:.0f} ms  {format_bytes(trace['bytes'])}  {trace['id'] or ''}")
+            y += 24
+        canvas.configure(scrollregion=(0, 0, width, y))
+
+    # Database snapshot methods
+    def show_db_snapshots(self):
+        """List database snapshots with take / restore / delete actions"""
+        from db_snapshot import list_snapshots, SnapshotError
+        if self.snapshot_dialog and self.snapshot_dialog.winfo_exists():
+            self.snapshot_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Database Snapshots")
+        dialog.geometry("720x420")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.snapshot_dialog = dialog
+
+        tk.Label(dialog, text=f"Database: {self.mongo_uri}", font=('Segoe UI', 10),
+                 fg=self.colors['text_light'], bg=self.colors['surface'], anchor=tk.W,
+                 padx=20, pady=10).pack(fill=tk.X)
+        snapshot_list = tk.Listbox(dialog, font=('Consolas', 10), activestyle='none', exportselection=False)
+        snapshot_list.pack(fill=tk.BOTH, expand=True, padx=20)
+        status = tk.Label(dialog, font=('Segoe UI', 10), fg=self.colors['text'], bg=self.colors['surface'],
+                          anchor=tk.W, padx=20, pady=6)
+        status.pack(fill=tk.X)
+        buttons = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=10)
+        buttons.pack(fill=tk.X)
+        names = []
+
+        def refresh():
+            if not dialog.winfo_exists():
+                return
+            snapshot_list.delete(0, tk.END)
+            names.clear()
+            for name, manifest in list_snapshots(self.snapshots_path):
+                documents = sum(info['documents'] for info in manifest['collections'].values())
+                size = sum(info['bytes'] for info in manifest['collections'].values())
+                snapshot_list.insert(tk.END, f"{name:<28} {len(manifest['collections']):>3} collections "
+                                             f"{documents:>8} docs {format_bytes(size):>10}")
+                names.append(name)
+            if not names:
+                snapshot_list.insert(tk.END, "No snapshots yet - seed the database, then Take Snapshot")
+
+        def selected():
+            selection = snapshot_list.curselection()
+            return names[selection[0]] if selection and selection[0] < len(names) else None
+
+        def run(label, action):
+            if not self.snapshot_busy.acquire(blocking=False):
+                status.config(text="Another snapshot operation is still running")
+                return
+            status.config(text=f"{label}...")
+
+            def task():
+                try:
+                    text = action()
+                except SnapshotError as e:
+                    text = str(e)
+                    self.log_message(f"Database snapshot: {text}", "error")
+                except Exception as e:  # Never leave the dialog on "...ing" with nothing logged
+                    text = f"{label} failed: {str(e)}"
+                    self.log_message(f"Database snapshot: {text}", "error")
+                finally:
+                    self.snapshot_busy.release()
+                self.root.after(0, lambda: (status.config(text=text), refresh()) if dialog.winfo_exists() else None)
+
+            self.run_in_background(task)
+
+        def take():
+            run("Taking snapshot", self.take_db_snapshot)
+
+        def restore():
+            name = selected()
+            if name and self.show_custom_confirmation_dialog(
+                    "Restore Database",
+                    f"Replace all data in {self.mongo_uri} with snapshot {name}?",
+                    "Restore", "Cancel"):
+                run(f"Restoring {name}", lambda: self.restore_db_snapshot(name))
+
+        def delete():
+            name = selected()
+            if name and self.show_custom_confirmation_dialog(
+                    "Delete Snapshot",
+                    f"Delete snapshot {name}? This cannot be undone.",
+                    "Delete", "Cancel"):
+                run(f"Deleting {name}", lambda: self.delete_db_snapshot(name))
+
+        for text, command, color in (("Take Snapshot", take, self.colors['primary']),
+                                     ("Restore Selected", restore, self.colors['warning']),
+                                     ("Delete", delete, self.colors['text_light'])):
+            tk.Button(buttons, text=text, command=command, font=('Segoe UI', 10), bg=color, fg='white',
+                      relief='flat', borderwidth=0, padx=14, pady=6,
+                      cursor='hand2').pack(side=tk.LEFT, padx=(0, 8))
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        refresh()
+
+    def take_db_snapshot(self):
+        """Dump the database to a new snapshot (blocking); returns a summary line"""
+        from db_snapshot import create_snapshot
+        manifest = create_snapshot(self.mongo_uri, self.snapshots_path)
+        documents = sum(info['documents'] for info in manifest['collections'].values())
+        size = sum(info['bytes'] for info in manifest['collections'].values())
+        text = (f"Snapshot of {manifest['database']}: {documents} documents in "
+                f"{len(manifest['collections'])} collections, {format_bytes(size)}, {manifest['seconds']:.2f}s")
+        self.log_message(text, "success")
+        return text
+
+    def restore_db_snapshot(self, name):
+        """Restore a snapshot (blocking); returns a summary line with the restore time"""
+        from db_snapshot import restore_snapshot
+        result = restore_snapshot(self.mongo_uri, os.path.join(self.snapshots_path, name))
+        slowest = max(result['collections'].items(), key=lambda item: item[1][1], default=None)
+        text = f"Restored {name}: {result['documents']} documents in {result['seconds']:.2f}s"
+        if slowest:
+            text += f" (slowest: {slowest[0]} {slowest[1][1]:.2f}s)"
+        self.log_message(text, "success")
+        return text
+
+    def delete_db_snapshot(self, name):
+        """Remove a snapshot directory (blocking); returns a summary line"""
+        from db_snapshot import SnapshotError
+        try:
+            shutil.rmtree(os.path.join(self.snapshots_path, name))
+        except OSError as e:
+            raise SnapshotError(f"Cannot delete {name}: {e}")
+        self.log_message(f"Deleted database snapshot {name}", "info")
+        return f"Deleted {name}"
 
     def restart_all_servers(self):
         """Restart all servers"""
         self.log_message("Restarting all servers...", "info")
-        self.stop_both_servers()
+        self.stop_all_services()
         time.sleep(2)
-        self.start_both_servers()
+        self.start_all_services()
 
     # Quick action methods
     def open_browser(self):
@@ -553,69 +1829,80 @@ class ProfessionalCareConnectLauncher:
 
     def get_frontend_url(self):
         """Detect which port the frontend server is actually running on"""
-        self.log_message(f"DEBUG: Current detected_frontend_port = {self.detected_frontend_port}", "info")
-
-        # Reset port detection if it's not a Vite port (to allow Vite detection to work)
-        if self.detected_frontend_port and self.detected_frontend_port not in [5173, 5174, 5175, 5176, 5177]:
-            self.log_message(f"DEBUG: Resetting non-Vite port {self.detected_frontend_port} to allow Vite detection", "info")
-            self.detected_frontend_port = None
+        frontend = self.services['frontend']
+        vite_ports = frontend.spec.ports  # Vite default ports from services.json
 
         # First priority: use detected port from server logs (most reliable)
-        if self.detected_frontend_port:
-            self.log_message(f"Using detected frontend port from Vite logs: {self.detected_frontend_port}", "info")
-            return f"http://localhost:{self.detected_frontend_port}"
+        if frontend.detected_port:
+            self.log_message(f"Using detected frontend port from Vite logs: {frontend.detected_port}", "info")
+            return f"http://localhost:{frontend.detected_port}"
 
         # Wait a moment for server logs to be processed
-        import time
         time.sleep(0.5)
 
         # Check again after waiting
-        if self.detected_frontend_port:
-            self.log_message(f"Using detected frontend port after wait: {self.detected_frontend_port}", "info")
-            return f"http://localhost:{self.detected_frontend_port}"
-
-        # Second priority: scan for Vite-specific ports first (5173-5177 are common Vite ports)
-        self.log_message("Scanning for Vite frontend ports (5173-5177)...", "info")
-        vite_ports = [5173, 5174, 5175, 5176, 5177]  # Vite default ports
+        if frontend.detected_port:
+            self.log_message(f"Using detected frontend port after wait: {frontend.detected_port}", "info")
+            return f"http://localhost:{frontend.detected_port}"
 
+        # Second priority: scan for Vite-specific ports first
+        self.log_message(f"Scanning for Vite frontend ports ({vite_ports[0]}-{vite_ports[-1]})...", "info")
+        listening = self.get_listening_ports()
         for port in vite_ports:
-            if self.is_port_in_use(port):
+            if port in listening:
                 self.log_message(f"Found Vite server on port: {port}", "success")
-                self.detected_frontend_port = port  # Cache the detected port
+                frontend.detected_port = port  # Cache the detected port
+                self.state.set('port.frontend', port)
                 return f"http://localhost:{port}"
 
         # Third priority: check other common development ports
         self.log_message("Checking other development ports (3000, 8080)...", "info")
         other_dev_ports = [3000, 3001, 8080, 4000]
         for port in other_dev_ports:
-            if self.is_port_in_use(port):
+            if port in listening:
                 self.log_message(f"Found active development port: {port}", "info")
-                self.detected_frontend_port = port  # Cache the detected port
                 return f"http://localhost:{port}"
 
         # Final fallback: default Vite port
-        self.log_message("No active frontend port found, using Vite default 5173", "warning")
-        return "http://localhost:5173"
+        self.log_message(f"No active frontend port found, using Vite default {vite_ports[0]}", "warning")
+        return f"http://localhost:{vite_ports[0]}"
 
     def show_browser_selection_dialog(self):
-        """Show enhanced browser selection dialog with icons and better styling"""
+        """Show enhanced browser selection dialog with icons and better styling
+
+        The dialog is built on first use and only hidden when closed, so
+        later opens just re-show it.
+        """
+        if self.browser_dialog is None or not self.browser_dialog.winfo_exists():
+            self.browser_dialog = self.build_browser_selection_dialog()
+        dialog = self.browser_dialog
+
+        # Get the frontend URL for browser opening
+        self.browser_url = self.get_frontend_url()
+
+        # Center the dialog on screen
+        x = (dialog.winfo_screenwidth() // 2) - 350
+        y = (dialog.winfo_screenheight() // 2) - 300
+        dialog.geometry(f'+{x}+{y}')
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        dialog.focus_set()
+
+    def close_browser_selection_dialog(self):
+        self.browser_dialog.grab_release()
+        self.browser_dialog.withdraw()
+
+    def build_browser_selection_dialog(self):
+        """Create the (hidden) browser selection window"""
         dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.title("Select Browser")
         dialog.geometry("700x600")  # Increased size for 2-column layout
         dialog.configure(bg=self.colors['surface'])
         dialog.resizable(False, False)
-
-        # Center the dialog on screen
         dialog.transient(self.root)
-        dialog.grab_set()
-
-        # Center the dialog window
-        dialog.update_idletasks()
-        width = dialog.winfo_width()
-        height = dialog.winfo_height()
-        x = (dialog.winfo_screenwidth() // 2) - (width // 2)
-        y = (dialog.winfo_screenheight() // 2) - (height // 2)
-        dialog.geometry(f'+{x}+{y}')
+        dialog.protocol("WM_DELETE_WINDOW", self.close_browser_selection_dialog)
 
         # Main container with padding
         main_frame = tk.Frame(dialog, bg=self.colors['surface'], padx=30, pady=25)
@@ -675,11 +1962,10 @@ class ProfessionalCareConnectLauncher:
         left_browsers = browsers[:3]
         right_browsers = browsers[3:]
 
-        # Get the frontend URL for browser opening
-        url = self.get_frontend_url()
-
         # Function to open selected browser
         def open_selected_browser(browser_name):
+            import webbrowser
+            url = self.browser_url
             if browser_name == "Default Browser":
                 webbrowser.open(url)
                 self.log_message(f"Opening {url} in default browser", "success")
@@ -772,7 +2058,7 @@ class ProfessionalCareConnectLauncher:
                 # Open the browser immediately
                 open_selected_browser(browser["name"])
                 # Close the dialog
-                dialog.destroy()
+                self.close_browser_selection_dialog()
 
             # Bind click event to the entire frame
             option_frame.bind('<Button-1>', lambda e: on_browser_click())
@@ -839,15 +2125,9 @@ class ProfessionalCareConnectLauncher:
         button_frame = tk.Frame(footer_frame, bg=self.colors['surface'])
         button_frame.pack()
 
-        result = {'choice': None}
-
-        def on_cancel():
-            result['choice'] = None
-            dialog.destroy()
-
         # Cancel button (centered)
         cancel_btn = tk.Button(button_frame, text="❌ Cancel",
-                              command=on_cancel,
+                              command=self.close_browser_selection_dialog,
                               font=('Segoe UI', 11),
                               bg=self.colors['text_light'], fg='white',
                               relief='flat', borderwidth=0,
@@ -855,14 +2135,8 @@ class ProfessionalCareConnectLauncher:
         cancel_btn.pack()
 
         # Bind Escape key to cancel
-        dialog.bind('<Escape>', lambda e: on_cancel())
-
-        # Focus on cancel button
-        cancel_btn.focus_set()
-
-        # Wait for dialog to close
-        dialog.wait_window()
-        return result['choice']
+        dialog.bind('<Escape>', lambda e: self.close_browser_selection_dialog())
+        return dialog
 
     def open_vscode(self):
         """Open VS Code in the current project"""
@@ -955,70 +2229,1119 @@ class ProfessionalCareConnectLauncher:
             self.log_message(f"Error opening terminal: {str(e)}", "error")
 
     # Utility methods
-    def log_message(self, message, level="info"):
-        """Add a message to the log with color coding"""
+    def log_message(self, message, level="info", segments=None, run=None):
+        """Queue a message for the log with color coding (safe from any thread)
+
+        segments optionally continues the line with (text, ansi tag) runs
+        decoded from service output; run is (service, run id) for lines
+        that may later get a repeat counter.
+        """
         timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        self.log_text.insert(tk.END, f"[{timestamp}] ", "timestamp")
-        self.log_text.insert(tk.END, f"{message}\n", level)
+        self.metrics.inc_counter("careconnect_log_lines_total", labels={'level': level},
+                                 help_text="Lines written to the System Monitor by level")
+        self.log_queue.put((timestamp, message, level, segments, run))
+        text = message + "".join(part for part, _ in segments) if segments else message
+        self.log_hub.publish({'time': timestamp, 'level': level, 'text': text})
+
+    def flush_log_queue(self, limit=2000):
+        """Insert queued log messages in one batch on the main thread"""
+        for service, count in self.log_filter.expire():
+            self.log_suppressed(service, count)
+        with self.repeat_lock:
+            repeats, self.repeat_counts = self.repeat_counts, {}
+        entries = self.log_queue.drain(limit)
+        if not entries and not repeats:
+            return
+        batch_runs = [run for *_, run in entries if run]
+        last_runs = dict(batch_runs)
+        # Counters of lines inserted by earlier batches are updated in place, before newer lines arrive
+        for service, (run, count) in repeats.items():
+            if (service, run) not in batch_runs:
+                self.update_repeat_counter(service, run, count)
+        # One Text.insert call for the whole batch: chars, tags, chars, tags, ...
+        args = []
+        lines = 0
+        positions = {}  # service -> line offset of its last line in this batch
+        for timestamp, message, level, segments, run in entries:
+            args += [f"[{timestamp}] ", "timestamp"]
+            if segments is None:
+                args += [f"{message}\n", level]
+                lines += message.count("\n") + 1
+                continue
+            args += [message, level]
+            for text, tag in segments:
+                if tag is None:
+                    args += [text, ()]
+                else:
+                    if tag not in self.ansi_tags:
+                        self.configure_ansi_tag(tag)
+                    args += [text, tag]
+            if run:
+                service, run_id = run
+                repeat = repeats.get(service)
+                if repeat and repeat[0] == run_id:
+                    # Only the service's newest line keeps the tag, so only its counter stays live
+                    tags = ('repeat', f'repeat-{service}') if last_runs[service] == run_id else 'repeat'
+                    args += [f" ×{repeat[1]}", tags]
+                if last_runs[service] == run_id:
+                    positions[service] = lines
+            args += ["\n", ()]
+            lines += 1
+        if args:
+            first_line = int(self.log_text.index('end-1c').split('.')[0])
+            self.log_text.insert(tk.END, *args)
+            for service, offset in positions.items():
+                # The counter of the service's previous line is final now
+                self.log_text.tag_remove(f'repeat-{service}', '1.0', f'{first_line + offset}.0')
+                self.log_text.mark_set(f'repeat-mark-{service}', f'{first_line + offset}.end')
+                self.log_text.mark_gravity(f'repeat-mark-{service}', tk.LEFT)
+                self.repeat_lines[service] = last_runs[service]
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
+
+    def update_repeat_counter(self, service, run, count):
+        """Show or bump the " ×N" counter at the end of a service's newest log line"""
+        if self.repeat_lines.get(service) != run:
+            return  # The line was cleared from the log
+        tag = f'repeat-{service}'
+        ranges = self.log_text.tag_ranges(tag)
+        if ranges:
+            index = ranges[0]
+            self.log_text.delete(ranges[0], ranges[-1])
+        else:
+            index = f'repeat-mark-{service}'  # End of the line
+        self.log_text.insert(index, f" ×{count}", ('repeat', tag))
+
+    def configure_ansi_tag(self, tag):
+        """Create the Text tag for one ANSI style the first time it is used"""
+        foreground, bold, underline = tag_style(tag)
+        options = {'underline': underline}
+        if foreground:
+            options['foreground'] = foreground
+        if bold:
+            options['font'] = ('Consolas', 10, 'bold')
+        self.log_text.tag_configure(tag, **options)
+        self.ansi_tags.add(tag)
 
     def clear_logs(self):
         """Clear the log text area"""
         self.log_text.delete(1.0, tk.END)
+        self.repeat_lines.clear()
         self.log_message("Logs cleared", "info")
 
     def is_port_in_use(self, port):
         """Check if a port is in use"""
+        return port in self.get_listening_ports()
+
+    def get_listening_ports(self, connections=None):
+        """Return every local port in LISTEN state from a single connection scan"""
+        if connections is None:
+            connections = self.scan_connections()
+        if connections is None:
+            # Fallback: try to connect to the ports we care about
+            ports = {port for spec in self.service_specs.values() for port in spec.ports}
+            return {port for port in ports if self.port_accepts_connections(port)}
+        return {conn.laddr.port for conn in connections if conn.status == psutil.CONN_LISTEN}
+
+    def scan_connections(self):
+        """One psutil snapshot of all inet sockets, or None when the OS denies it"""
         try:
-            for conn in psutil.net_connections():
-                if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
-                    return True
+            return psutil.net_connections(kind='inet')
         except (psutil.AccessDenied, psutil.NoSuchProcess):
-            # Fallback: try to connect to the port
-            import socket
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex(('localhost', port))
-                sock.close()
-                return result == 0
-            except:
-                pass
-        return False
+            return None
 
-    def update_status_indicators(self):
+    def update_status_indicators(self, listening=None):
         """Update server status indicators"""
-        frontend_running = self.is_port_in_use(5173) or self.is_port_in_use(5174)
-        backend_running = self.is_port_in_use(5000)
-        
-        # Update frontend indicator
-        if frontend_running:
-            self.frontend_indicator.config(fg=self.colors['success'])
-            self.frontend_status.set("●")
-        else:
-            self.frontend_indicator.config(fg=self.colors['danger'])
-            self.frontend_status.set("●")
-        
-        # Update backend indicator
-        if backend_running:
-            self.backend_indicator.config(fg=self.colors['success'])
-            self.backend_status.set("●")
-        else:
-            self.backend_indicator.config(fg=self.colors['danger'])
-            self.backend_status.set("●")
+        if listening is None:
+            listening = self.get_listening_ports()
+        for name, runtime in self.services.items():
+            ports = [runtime.detected_port] if runtime.detected_port else runtime.spec.ports
+            running = any(port in listening for port in ports)
+            
+            # Publish only; render_service_status touches the widgets when a value changes
+            self.state.set(f'service.{name}.up', running)
+            self.metrics.set_gauge("careconnect_service_up", int(running),
+                                   labels={'service': name},
+                                   help_text="1 if the service port is listening")
+
+    def render_service_status(self, key, running):
+        """Color a status indicator (main thread)"""
+        name = key.split('.')[1]
+        if name in self.status_indicators:
+            indicator, _ = self.status_indicators[name]
+            indicator.config(fg=self.colors['success'] if running else self.colors['danger'])
+
+    def render_service_details(self, key, value):
+        """Show detected ports and health next to an indicator (main thread)"""
+        name = key.split('.', 1)[1]
+        if name not in self.status_indicators:
+            return
+        _, details = self.status_indicators[name]
+        port = self.state.get(f'port.{name}')
+        text = f":{port}" if port else ""
+        health = self.state.get(f'health.{name}')
+        if health is not None:
+            ok, latency_ms = health
+            text += f" · {latency_ms:.0f} ms" if ok else " · unhealthy"
+        placement = self.state.get(f'placement.{name}')
+        if placement:
+            text += f" · {placement}"
+        details.config(text=text)
+
+    def render_process_summary(self, key, value):
+        """Show total CPU and memory of the managed process trees (main thread)"""
+        if key == 'metrics.processes':
+            rss, cpu = value
+            self.process_summary.config(text=f"Managed processes: CPU {cpu:.0f}% · RAM {format_bytes(rss)}"
+                                        if rss else "")
 
     def monitor_servers(self):
         """Monitor server status periodically"""
         def monitor():
+            first_scan = True
             while True:
-                self.update_status_indicators()
+                connections = self.scan_connections()
+                listening = self.get_listening_ports(connections)
+                self.update_status_indicators(listening)
+                self.update_process_metrics()
+                self.update_network_telemetry(connections)
+                self.probe_service_health(listening)
+                if first_scan:
+                    first_scan = False
+                    self.report_launch_profile()
                 time.sleep(2)
         
         monitor_thread = threading.Thread(target=monitor, daemon=True)
         monitor_thread.start()
 
+    def report_launch_profile(self):
+        """With --profile-startup, print where the launch time went and log it (monitor thread)"""
+        if not LAUNCH_PROFILE:
+            return
+        LAUNCH_PROFILE.mark("first status scan")
+        report = LAUNCH_PROFILE.report()
+        print(report, flush=True)
+        for line in report.splitlines():
+            self.log_message(line, "info")
+
+    # Metrics methods
+    def record_service_start(self, *services):
+        """Remember spawn times and count restarts for the metrics endpoint"""
+        now = time.monotonic()
+        for service in services:
+            starts = self.service_starts.get(service, 0)
+            if starts:
+                self.metrics.inc_counter("careconnect_service_restarts_total",
+                                         labels={'service': service},
+                                         help_text="Service starts after the first one this session")
+            self.service_starts[service] = starts + 1
+            self.service_spawn_times[service] = now
+            self.mark_startup_phase(service, 'spawn')
+
+    def record_port_detection(self, service):
+        """Observe how long it took from spawn until the port showed up in the output"""
+        spawned = self.service_spawn_times.pop(service, None)
+        if spawned is not None:
+            self.metrics.observe("careconnect_port_detection_seconds", time.monotonic() - spawned,
+                                 labels={'service': service}, buckets=PORT_DETECTION_BUCKETS,
+                                 help_text="Time from spawn to the port appearing in service output")
+
+    def get_managed_processes(self):
+        """Return the launcher-spawned processes that are still alive, keyed by service"""
+        return {name: runtime.process for name, runtime in self.services.items() if runtime.running}
+
+    def update_process_metrics(self):
+        """Publish RSS and CPU of every managed process tree"""
+        seen_pids = set()
+        service_pids = {}
+        total_rss = 0
+        total_cpu = 0.0
+        managed = self.get_managed_processes()
+        for label in self.services:
+            proc = managed.get(label)
+            if proc is None:
+                self.metrics.remove("careconnect_process_rss_bytes", {'process': label})
+                self.metrics.remove("careconnect_process_cpu_percent", {'process': label})
+                continue
+            rss = 0
+            cpu = 0.0
+            try:
+                root = psutil.Process(proc.pid)
+                tree = [root] + root.children(recursive=True)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            for member in tree:
+                # Reuse Process objects so cpu_percent() measures since the previous tick
+                cached = self.process_cache.setdefault(member.pid, member)
+                seen_pids.add(member.pid)
+                service_pids[member.pid] = label
+                try:
+                    rss += cached.memory_info().rss
+                    cpu += cached.cpu_percent(interval=None)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            total_rss += rss
+            total_cpu += cpu
+            guard = self.services[label].guard
+            if guard:
+                self.enforce_resource_limits(label, guard, tree, rss)
+            self.metrics.set_gauge("careconnect_process_rss_bytes", rss, labels={'process': label},
+                                   help_text="Resident memory of the process tree")
+            self.metrics.set_gauge("careconnect_process_cpu_percent", cpu, labels={'process': label},
+                                   help_text="CPU usage of the process tree (100 = one core)")
+        for pid in list(self.process_cache):
+            if pid not in seen_pids:
+                del self.process_cache[pid]
+        self.service_pids = service_pids
+        # Round so the header only re-renders on visible changes
+        self.state.set('metrics.processes', (total_rss // (1024 * 1024) * 1024 * 1024, round(total_cpu)))
+
+    def update_network_telemetry(self, connections):
+        """Count the managed services' sockets and warn when a connection limit comes close"""
+        if connections is None:
+            return
+        service_ports = set()
+        for runtime in self.services.values():
+            service_ports.update(runtime.spec.ports)
+            if runtime.detected_port:
+                service_ports.add(runtime.detected_port)
+        telemetry = self.connection_telemetry
+        for key, message in telemetry.update(connections, self.service_pids, service_ports):
+            self.log_message(f"Connection pressure: {message}", "warning")
+        for owner in list(self.services) + [CLOSED]:
+            entry = telemetry.latest.get(owner)
+            for state in (psutil.CONN_ESTABLISHED, psutil.CONN_TIME_WAIT, psutil.CONN_CLOSE_WAIT):
+                self.metrics.set_gauge("careconnect_connections", entry['states'][state] if entry else 0,
+                                       labels={'service': owner, 'state': state},
+                                       help_text="Sockets of the service's process tree by TCP state")
+            self.metrics.set_gauge("careconnect_new_connections_per_second",
+                                   entry['new_per_second'] if entry else 0, labels={'service': owner},
+                                   help_text="Connections seen for the first time, per second")
+
+    def probe_health(self, path, timeout=2, service='backend'):
+        """Request a health endpoint (path on the service port, or a full URL), returning (ok, seconds)"""
+        url = path if path.startswith('http') else f"http://localhost:{self.services[service].port}{path}"
+        started = time.perf_counter()
+        try:
+            with urllib_request.urlopen(url, timeout=timeout) as response:
+                response.read()
+                ok = 200 <= response.status < 300
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - started
+        self.metrics.observe("careconnect_health_probe_seconds", elapsed,
+                             labels={'service': service, 'endpoint': path, 'ok': str(ok).lower()},
+                             help_text="Latency of launcher health probes")
+        return ok, elapsed
+
+    def probe_service_health(self, listening):
+        """Probe the health URL of every service that is listening"""
+        for name, runtime in self.services.items():
+            if not runtime.spec.health_url:
+                continue
+            if runtime.port in listening:
+                ok, elapsed = self.probe_health(runtime.spec.health_url, service=name)
+                self.state.set(f'health.{name}', (ok, round(elapsed * 1000)))
+            else:
+                self.state.set(f'health.{name}', None)
+
+    def start_metrics_endpoint(self):
+        """Serve Prometheus metrics on localhost"""
+        if self.metrics_server and self.metrics_server.running:
+            return
+        try:
+            self.metrics_server = MetricsServer(self.metrics, port=self.metrics_port)
+            self.metrics_server.start()
+            self.metrics_btn.config(text="📈 Stop Metrics Endpoint", bg=self.colors['success'])
+            self.log_message(f"Metrics endpoint: http://localhost:{self.metrics_server.port}/metrics", "success")
+        except OSError as e:
+            self.metrics_server = None
+            self.log_message(f"Could not start metrics endpoint on port {self.metrics_port}: {str(e)}", "error")
+
+    def stop_metrics_endpoint(self):
+        """Stop serving metrics"""
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+            self.metrics_btn.config(text="📈 Start Metrics Endpoint", bg=self.colors['text_light'])
+            self.log_message("Metrics endpoint stopped", "info")
+
+    def toggle_metrics_endpoint(self):
+        """Toggle the Prometheus metrics endpoint"""
+        if self.metrics_server and self.metrics_server.running:
+            self.stop_metrics_endpoint()
+        else:
+            self.start_metrics_endpoint()
+
+    # UI responsiveness methods
+    def report_ui_stall(self, stall):
+        """Log a finished main-thread stall (watchdog thread)"""
+        self.metrics.observe("careconnect_ui_stall_seconds", stall['duration'], buckets=UI_STALL_BUCKETS,
+                             help_text="Time the Tk event loop was blocked, per stall")
+        self.log_message(f"UI blocked for {stall['duration']:.2f}s, mostly in {stall['leaf']}", "warning")
+
+    def show_ui_watchdog(self):
+        """Show event-loop lag, recent stalls and where the main thread spent them"""
+        if self.watchdog_dialog and self.watchdog_dialog.winfo_exists():
+            self.watchdog_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("UI Responsiveness")
+        dialog.geometry("1000x620")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.watchdog_dialog = dialog
+        watchdog = self.ui_watchdog
+
+        toolbar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        toolbar.pack(fill=tk.X)
+        tk.Button(toolbar, text="Export Folded Stacks", font=('Segoe UI', 10),
+                  command=lambda: self.export_ui_stacks(dialog),
+                  bg=self.colors['primary'], fg='white', relief='flat', borderwidth=0,
+                  padx=14, pady=6, cursor='hand2').pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Clear", font=('Segoe UI', 10),
+                  command=lambda: (watchdog.clear(), refresh(force=True)),
+                  bg=self.colors['text_light'], fg='white', relief='flat', borderwidth=0,
+                  padx=14, pady=6, cursor='hand2').pack(side=tk.LEFT, padx=(8, 0))
+        summary = tk.Label(toolbar, font=('Segoe UI', 10), fg=self.colors['text'],
+                           bg=self.colors['surface'], anchor=tk.W, padx=12)
+        summary.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        stalls_list = tk.Listbox(dialog, height=6, font=('Consolas', 9), activestyle='none')
+        stalls_list.pack(fill=tk.X, padx=20)
+        flame = scrolledtext.ScrolledText(dialog, font=('Consolas', 9), wrap=tk.NONE,
+                                          bg=self.colors['surface'], fg=self.colors['text'])
+        flame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 20))
+        flame.tag_configure('hot', foreground=self.colors['danger'])
+        shown = {'stalls': -1}
+
+        def refresh(force=False):
+            if not dialog.winfo_exists():
+                return
+            p95, worst = watchdog.lag_stats()
+            stalls = list(watchdog.stalls)
+            summary.config(text=f"Event-loop lag (last minute): p95 {p95 * 1000:.0f} ms · max {worst * 1000:.0f} ms"
+                                f" · {len(stalls)} stalls over {watchdog.threshold * 1000:.0f} ms")
+            if force or len(stalls) != shown['stalls'] or (stalls and stalls[-1] is not shown.get('last')):
+                shown.update(stalls=len(stalls), last=stalls[-1] if stalls else None)
+                stalls_list.delete(0, tk.END)
+                for stall in reversed(stalls):
+                    started = datetime.fromtimestamp(stall['started']).strftime('%H:%M:%S')
+                    stalls_list.insert(tk.END, f"{started}  {stall['duration']:6.2f}s  {stall['leaf']}")
+                flame.config(state=tk.NORMAL)
+                flame.delete('1.0', tk.END)
+                rows = watchdog.tree()
+                if not rows:
+                    flame.insert(tk.END, "No stalls sampled yet.")
+                for depth, label, samples, share in rows:
+                    flame.insert(tk.END, f"{share * 100:5.1f}% {samples:>6}  {'  ' * depth}{label}\n",
+                                 'hot' if share >= 0.25 else ())
+                flame.config(state=tk.DISABLED)
+            dialog.after(1000, refresh)
+
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        refresh(force=True)
+
+    def export_ui_stacks(self, parent):
+        """Save the stall samples as folded stacks (flamegraph.pl, speedscope)"""
+        path = filedialog.asksaveasfilename(
+            parent=parent, title="Export UI stall samples", defaultextension=".folded",
+            initialfile=datetime.now().strftime("ui-stalls-%Y%m%d-%H%M%S.folded"),
+            filetypes=[("Folded stacks", "*.folded"), ("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.ui_watchdog.folded())
+        except OSError as e:
+            messagebox.showerror("Export failed", str(e), parent=parent)
+            return
+        self.log_message(f"UI stall samples exported to {path}", "success")
+
+    # Checkout methods
+    def register_checkout(self, checkout):
+        """Add a checkout's services to the managed ones; False if the manifest does not allow it"""
+        main = {name: spec for name, spec in self.service_specs.items() if spec.checkout_name is None}
+        try:
+            clones = for_checkout(main, checkout.name, self.project_path, checkout.path,
+                                  checkout.offset, checkout.env)
+        except ManifestError as e:
+            self.log_message(f"Checkout {checkout.name}: {str(e)}", "error")
+            return False
+        # Replace instead of mutating: the monitor thread iterates these dicts
+        self.service_specs = {**self.service_specs, **clones}
+        self.services = {**self.services, **{name: ServiceRuntime(spec) for name, spec in clones.items()}}
+        self.orchestrator.specs = self.service_specs
+        self.checkouts[checkout.name] = checkout
+        for name, spec in clones.items():
+            if spec.ports:
+                self.state.set(f'port.{name}', spec.ports[0])
+        return True
+
+    def checkout_services(self, checkout_name):
+        return [name for name, spec in self.service_specs.items() if spec.checkout_name == checkout_name]
+
+    def add_checkout(self, path):
+        from checkouts import CheckoutError
+        try:
+            checkout = self.checkout_store.add(path)
+        except (CheckoutError, OSError) as e:
+            self.log_message(f"Cannot add checkout: {str(e)}", "error")
+            return None
+        if not self.register_checkout(checkout):
+            self.checkout_store.remove(checkout.name)
+            return None
+        ports = ", ".join(f"{self.service_specs[name].label} :{self.service_specs[name].ports[0]}"
+                          for name in self.checkout_services(checkout.name) if self.service_specs[name].ports)
+        self.log_message(f"Added checkout {checkout.name} ({checkout.path}): {ports}", "success")
+        return checkout
+
+    def remove_checkout(self, checkout_name):
+        """Stop a checkout's services and forget it (blocking, run in background)"""
+        names = self.checkout_services(checkout_name)
+        for name in reversed(dependency_order(self.service_specs, names)):
+            if name in names:  # Shared dependencies keep running for the other checkouts
+                self.stop_service(name)
+        self.service_specs = {name: spec for name, spec in self.service_specs.items() if name not in names}
+        self.services = {name: runtime for name, runtime in self.services.items() if name not in names}
+        self.orchestrator.specs = self.service_specs
+        checkout = self.checkouts.pop(checkout_name, None)
+        if checkout:
+            checkout.close()
+        self.checkout_store.remove(checkout_name)
+        self.log_message(f"Removed checkout {checkout_name}", "info")
+
+    def stop_checkout(self, checkout_name):
+        """Stop one checkout's services (blocking, run in background)"""
+        names = self.checkout_services(checkout_name)
+        for name in reversed(dependency_order(self.service_specs, names)):
+            if name in names:
+                self.stop_service(name)
+
+    def compare_checkouts(self, paths, rounds, on_done):
+        """Time the same backend requests on every checkout (blocking, run in background)"""
+        from checkouts import compare_latency
+        targets = {}
+        for checkout_name in [None] + list(self.checkouts):
+            name = 'backend' if checkout_name is None else f"backend@{checkout_name}"
+            runtime = self.services.get(name)
+            if runtime and runtime.port and self.port_accepts_connections(runtime.port):
+                targets[checkout_name or "main"] = f"http://localhost:{runtime.port}"
+        if not targets:
+            self.log_message("No backend is running to compare", "warning")
+            self.root.after(0, on_done, None, paths)
+            return
+        self.log_message(f"Comparing {len(paths)} endpoints on {', '.join(targets)} ({rounds} rounds)...", "info")
+        results = compare_latency(targets, paths, rounds=rounds)
+        self.log_message("Checkout comparison finished", "success")
+        self.root.after(0, on_done, (list(targets), results), paths)
+
+    def show_checkouts(self):
+        """Manage extra checkouts and compare their latency side by side"""
+        from checkouts import COMPARE_PATHS
+        if self.checkouts_dialog and self.checkouts_dialog.winfo_exists():
+            self.checkouts_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Checkouts")
+        dialog.geometry("1000x640")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.checkouts_dialog = dialog
+
+        def selected():
+            selection = checkout_list.curselection()
+            names = list(self.checkouts)
+            return names[selection[0]] if selection and selection[0] < len(names) else None
+
+        def add():
+            path = filedialog.askdirectory(parent=dialog, title="Select a CareConnect checkout or worktree")
+            if path:
+                self.add_checkout(path)
+                refresh(force=True)
+
+        def act(action):
+            name = selected()
+            if name is None:
+                status.config(text="Select a checkout first")
+            elif action == 'start':
+                self.start_services(self.checkout_services(name))
+            elif action == 'stop':
+                self.run_in_background(self.stop_checkout, name)
+            elif messagebox.askyesno("Remove checkout", f"Stop and remove checkout {name}?", parent=dialog):
+                self.run_in_background(self.remove_checkout, name)
+
+        toolbar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        toolbar.pack(fill=tk.X)
+        for text, command, color in (("Add Checkout...", add, 'primary'),
+                                     ("Start", lambda: act('start'), 'success'),
+                                     ("Stop", lambda: act('stop'), 'danger'),
+                                     ("Remove", lambda: act('remove'), 'text_light')):
+            tk.Button(toolbar, text=text, font=('Segoe UI', 10), command=command,
+                      bg=self.colors[color], fg='white', relief='flat', borderwidth=0,
+                      padx=14, pady=6, cursor='hand2').pack(side=tk.LEFT, padx=(0, 8))
+        status = tk.Label(toolbar, font=('Segoe UI', 10), fg=self.colors['text'],
+                          bg=self.colors['surface'], anchor=tk.W, padx=12)
+        status.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        checkout_list = tk.Listbox(dialog, height=6, font=('Consolas', 9), activestyle='none',
+                                   exportselection=False)
+        checkout_list.pack(fill=tk.X, padx=20)
+        checkout_list.bind('<<ListboxSelect>>', lambda e: show_log_path())
+
+        compare_bar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        compare_bar.pack(fill=tk.X)
+        tk.Label(compare_bar, text="Paths", font=('Segoe UI', 10), fg=self.colors['text'],
+                 bg=self.colors['surface']).pack(side=tk.LEFT)
+        paths_var = tk.StringVar(value=", ".join(COMPARE_PATHS))
+        tk.Entry(compare_bar, textvariable=paths_var, font=('Consolas', 9)).pack(side=tk.LEFT, fill=tk.X,
+                                                                                expand=True, padx=(8, 8))
+        rounds_var = tk.IntVar(value=20)
+        tk.Spinbox(compare_bar, from_=1, to=500, width=5, textvariable=rounds_var,
+                   font=('Segoe UI', 10)).pack(side=tk.LEFT)
+        tk.Label(compare_bar, text="rounds", font=('Segoe UI', 10), fg=self.colors['text'],
+                 bg=self.colors['surface']).pack(side=tk.LEFT, padx=(4, 8))
+        compare_btn = tk.Button(compare_bar, text="Compare Latency", font=('Segoe UI', 10),
+                                command=lambda: compare(),
+                                bg=self.colors['secondary'], fg='white', relief='flat', borderwidth=0,
+                                padx=14, pady=6, cursor='hand2')
+        compare_btn.pack(side=tk.LEFT)
+
+        table = scrolledtext.ScrolledText(dialog, font=('Consolas', 9), wrap=tk.NONE,
+                                          bg=self.colors['surface'], fg=self.colors['text'])
+        table.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        table.tag_configure('heading', font=('Consolas', 9, 'bold'))
+        table.tag_configure('slow', foreground=self.colors['danger'])
+        table.insert(tk.END, "Start the backend of each checkout, then Compare Latency.")
+        table.config(state=tk.DISABLED)
+        shown = {'rows': None}
+
+        def show_log_path():
+            checkout = self.checkouts.get(selected())
+            if checkout:
+                status.config(text=f"Output log: {checkout.log_path}")
+
+        def compare():
+            paths = [path.strip() for path in paths_var.get().split(',') if path.strip().startswith('/')]
+            try:
+                rounds = max(1, rounds_var.get())
+            except tk.TclError:
+                rounds = 20
+            if not paths:
+                status.config(text="Enter one or more paths, e.g. /api/v1/health")
+                return
+            compare_btn.config(state=tk.DISABLED)
+            status.config(text=f"Comparing {len(paths)} paths x {rounds} rounds...")
+            self.run_in_background(self.compare_checkouts, paths, rounds, show_results)
+
+        def show_results(outcome, paths):
+            if not dialog.winfo_exists():
+                return
+            compare_btn.config(state=tk.NORMAL)
+            if outcome is None:
+                status.config(text="No backend is running")
+                return
+            names, results = outcome
+            status.config(text="Median / p95 per checkout; the slowest median per path is highlighted")
+            table.config(state=tk.NORMAL)
+            table.delete('1.0', tk.END)
+            table.insert(tk.END, f"{'Path':<36}" + "".join(f"{name[:21]:>22}" for name in names) + "\n", 'heading')
+
+            def cell(result):
+                if result['median'] is None:
+                    return "failed"
+                errors = f" ({result['errors']} err)" if result['errors'] else ""
+                return f"{result['median'] * 1000:.1f} / {result['p95'] * 1000:.1f} ms{errors}"
+
+            for path in paths:
+                medians = [results[(name, path)]['median'] for name in names]
+                slowest = max((median for median in medians if median is not None), default=None)
+                table.insert(tk.END, f"{path[:35]:<36}")
+                for name, median in zip(names, medians):
+                    slow = len(names) > 1 and median is not None and median == slowest
+                    table.insert(tk.END, f"{cell(results[(name, path)]):>22}", 'slow' if slow else ())
+                table.insert(tk.END, "\n")
+            table.config(state=tk.DISABLED)
+
+        def refresh(force=False):
+            if not dialog.winfo_exists():
+                return
+            rows = []
+            for checkout in self.checkouts.values():
+                parts = []
+                for name in self.checkout_services(checkout.name):
+                    runtime = self.services[name]
+                    parts.append(f"{name.split('@')[0]} :{runtime.port} {'●' if runtime.running else '○'}")
+                rows.append(f"{checkout.name:<20} +{checkout.offset:<5} {'  '.join(parts):<48} {checkout.path}")
+            if force or rows != shown['rows']:
+                shown['rows'] = rows
+                current = checkout_list.curselection()
+                checkout_list.delete(0, tk.END)
+                for row in rows:
+                    checkout_list.insert(tk.END, row)
+                if current and current[0] < len(rows):
+                    checkout_list.selection_set(current[0])
+                if not rows:
+                    status.config(text="Add a second checkout, e.g. `git worktree add ../careconnect-main main`")
+            dialog.after(1000, refresh)
+
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        refresh(force=True)
+
+    # API benchmark methods
+    def get_api_baseline(self):
+        """Return the saved benchmark baseline and history, loading api_benchmark on first use"""
+        if self.api_baseline is None:
+            from api_benchmark import BenchmarkBaseline
+            self.api_baseline = BenchmarkBaseline(os.path.join(self.data_path, "api_baseline.json"),
+                                                  os.path.join(self.data_path, "api_benchmarks.jsonl"))
+        return self.api_baseline
+
+    def run_api_benchmark(self, runs=20, on_done=None, on_progress=None):
+        """Benchmark every safe GET endpoint of the backend's OpenAPI spec (blocking, run in background)
+
+        The first run becomes the baseline; later runs are compared against it.
+        on_done(report) gets {'results', 'skipped', 'regressions', 'baseline'} or None.
+        """
+        from api_benchmark import (fetch_spec, safe_endpoints, resolve_urls, api_base_url, run_benchmark,
+                                   BenchmarkError, find_regressions)
+        if not self.api_bench_busy.acquire(blocking=False):
+            self.log_message("An API benchmark is already running", "warning")
+            return
+        report = None
+        try:
+            port = self.services['backend'].port
+            if not (port and self.port_accepts_connections(port)):
+                self.log_message("Start the backend before running the API benchmark", "warning")
+                return
+            backend_url = f"http://localhost:{port}"
+            spec = fetch_spec(backend_url)
+            headers = {'X-API-Key': self.api_key} if self.api_key else {}
+            endpoints = safe_endpoints(spec)
+            skipped = [(endpoint['path'], "needs CARECONNECT_API_KEY") for endpoint in endpoints
+                       if endpoint['secured'] and not self.api_key]
+            endpoints = [endpoint for endpoint in endpoints if self.api_key or not endpoint['secured']]
+            cases = []
+            for template, url, reason in resolve_urls(endpoints, api_base_url(spec, backend_url), headers):
+                if url:
+                    cases.append((template, url))
+                else:
+                    skipped.append((template, reason))
+            self.log_message(f"Benchmarking {len(cases)} GET endpoints x {runs} runs "
+                             f"({len(skipped)} skipped)...", "info")
+            progress = (lambda done, total: self.root.after(0, on_progress, done, total)) if on_progress else None
+            results = run_benchmark(cases, runs=runs, headers=headers, progress=progress)
+            self.get_api_baseline().append_history(results)
+            baseline = self.get_api_baseline().load()
+            if baseline is None:
+                self.get_api_baseline().save(results)
+                baseline = self.get_api_baseline().load()
+                self.log_message(f"API benchmark saved as the baseline ({len(results)} endpoints)", "success")
+            regressions = find_regressions(baseline, results)
+            for template, before, now in regressions:
+                self.log_message(f"API regression: GET {template} median {before:.1f} -> {now:.1f} ms", "warning")
+            if baseline is not None and not regressions:
+                self.log_message("API benchmark finished, no endpoint slower than the baseline", "success")
+            report = {'results': results, 'skipped': skipped, 'regressions': regressions, 'baseline': baseline}
+            self.api_bench_last = results
+        except BenchmarkError as e:
+            self.log_message(str(e), "error")
+        finally:
+            self.api_bench_busy.release()
+            if on_done:
+                self.root.after(0, on_done, report)
+
+    def show_api_benchmark(self):
+        """Run the OpenAPI smoke benchmark and show it against the baseline"""
+        if self.api_bench_dialog and self.api_bench_dialog.winfo_exists():
+            self.api_bench_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("API Benchmark")
+        dialog.geometry("1000x600")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.api_bench_dialog = dialog
+
+        toolbar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        toolbar.pack(fill=tk.X)
+        run_btn = tk.Button(toolbar, text="Run Benchmark", font=('Segoe UI', 10), command=lambda: run(),
+                            bg=self.colors['primary'], fg='white', relief='flat', borderwidth=0,
+                            padx=14, pady=6, cursor='hand2')
+        run_btn.pack(side=tk.LEFT)
+        runs_var = tk.IntVar(value=20)
+        tk.Spinbox(toolbar, from_=3, to=500, width=5, textvariable=runs_var,
+                   font=('Segoe UI', 10)).pack(side=tk.LEFT, padx=(16, 4))
+        tk.Label(toolbar, text="runs", font=('Segoe UI', 10), fg=self.colors['text'],
+                 bg=self.colors['surface']).pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Save as Baseline", font=('Segoe UI', 10), command=lambda: save_baseline(),
+                  bg=self.colors['text_light'], fg='white', relief='flat', borderwidth=0,
+                  padx=14, pady=6, cursor='hand2').pack(side=tk.LEFT, padx=(8, 0))
+        summary = tk.Label(toolbar, font=('Segoe UI', 10), fg=self.colors['text'],
+                           bg=self.colors['surface'], anchor=tk.W, padx=12)
+        summary.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        table = scrolledtext.ScrolledText(dialog, font=('Consolas', 9), wrap=tk.NONE,
+                                          bg=self.colors['surface'], fg=self.colors['text'])
+        table.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        table.tag_configure('heading', font=('Consolas', 9, 'bold'))
+        table.tag_configure('regressed', foreground=self.colors['danger'])
+        table.tag_configure('skipped', foreground=self.colors['text_light'])
+
+        def run():
+            try:
+                runs = max(3, runs_var.get())
+            except tk.TclError:
+                runs = 20
+            run_btn.config(state=tk.DISABLED)
+            summary.config(text="Loading the OpenAPI spec...")
+            self.run_in_background(self.run_api_benchmark, runs, show, progress)
+
+        def progress(done, total):
+            if dialog.winfo_exists():
+                summary.config(text=f"Benchmarking endpoint {done} of {total}...")
+
+        def save_baseline():
+            if self.api_bench_last is None:
+                summary.config(text="Run the benchmark first")
+                return
+            self.get_api_baseline().save(self.api_bench_last)
+            self.log_message("API benchmark baseline replaced with the last run", "success")
+            summary.config(text="Baseline replaced with the last run")
+
+        def show(report):
+            if not dialog.winfo_exists():
+                return
+            run_btn.config(state=tk.NORMAL)
+            if report is None:
+                summary.config(text="Benchmark failed - see the System Monitor")
+                return
+            baseline = report['baseline']['endpoints'] if report['baseline'] else {}
+            regressed = {template for template, _, _ in report['regressions']}
+            summary.config(text=f"{len(report['results'])} endpoints · {len(regressed)} regressed · "
+                                f"baseline from {report['baseline']['timestamp'] if report['baseline'] else '-'}")
+            table.config(state=tk.NORMAL)
+            table.delete('1.0', tk.END)
+            table.insert(tk.END, f"{'GET':<52}{'Status':>7}{'Median':>10}{'p95':>10}{'Baseline':>10}{'Δ':>9}\n",
+                         'heading')
+
+            def ms(value):
+                return f"{value:.1f}" if value is not None else "-"
+
+            for template, result in sorted(report['results'].items(),
+                                           key=lambda item: item[1]['median'] or 0, reverse=True):
+                before = baseline.get(template, {}).get('median')
+                change = f"{(result['median'] / before - 1) * 100:+.0f}%" if before and result['median'] else ""
+                errors = f" ({result['errors']} err)" if result['errors'] else ""
+                table.insert(tk.END, f"{template[:51]:<52}{result['status'] or '-':>7}{ms(result['median']):>10}"
+                                     f"{ms(result['p95']):>10}{ms(before):>10}{change:>9}{errors}\n",
+                             'regressed' if template in regressed else ())
+            for template, reason in report['skipped']:
+                table.insert(tk.END, f"{template[:51]:<52}  skipped: {reason}\n", 'skipped')
+            table.config(state=tk.DISABLED)
+
+        baseline = self.get_api_baseline().load()
+        summary.config(text=f"Baseline from {baseline['timestamp']} ({len(baseline['endpoints'])} endpoints)"
+                       if baseline else "No baseline yet - the first run becomes the baseline")
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+
+    # Connection telemetry methods
+    def show_network_telemetry(self):
+        """Show socket counts per service, by state and remote port, and the watched limits"""
+        if self.network_dialog and self.network_dialog.winfo_exists():
+            self.network_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Connections")
+        dialog.geometry("960x440")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.network_dialog = dialog
+        telemetry = self.connection_telemetry
+
+        table = scrolledtext.ScrolledText(dialog, font=('Consolas', 9), wrap=tk.NONE,
+                                          bg=self.colors['surface'], fg=self.colors['text'])
+        table.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        table.tag_configure('heading', font=('Consolas', 9, 'bold'))
+        table.tag_configure('hot', foreground=self.colors['danger'])
+        states = (psutil.CONN_ESTABLISHED, psutil.CONN_TIME_WAIT, psutil.CONN_CLOSE_WAIT)
+
+        def refresh():
+            if not dialog.winfo_exists():
+                return
+            table.config(state=tk.NORMAL)
+            table.delete('1.0', tk.END)
+            table.insert(tk.END, f"{'Service':<20}{'Total':>7}{'ESTAB':>8}{'TIME_WAIT':>11}{'CLOSE_WAIT':>12}"
+                                 f"{'Other':>7}" + "".join(f"{'→' + str(port):>8}" for port in WATCHED_PORTS) +
+                                 f"{'New/s':>8}\n", 'heading')
+            for owner, entry in sorted(telemetry.latest.items(), key=lambda item: item[1]['total'], reverse=True):
+                other = entry['total'] - sum(entry['states'][state] for state in states)
+                runtime = self.services.get(owner)
+                table.insert(tk.END, f"{(runtime.spec.label if runtime else owner)[:19]:<20}{entry['total']:>7}"
+                                     f"{entry['states'][states[0]]:>8}{entry['states'][states[1]]:>11}"
+                                     f"{entry['states'][states[2]]:>12}{other:>7}" +
+                                     "".join(f"{entry['remote'][port]:>8}" for port in WATCHED_PORTS) +
+                                     f"{entry['new_per_second']:>8.1f}\n")
+            if not telemetry.latest:
+                table.insert(tk.END, "No connections of the managed services (or the OS denies the socket scan)\n")
+            table.insert(tk.END, "\nLimits (trend over the last minute)\n", 'heading')
+            for key, (owner, remote_port, state, limit) in telemetry.limits.items():
+                count, slope, eta = telemetry.trend(key)
+                target = f" →{remote_port}" if remote_port else ""
+                line = f"{owner} {state}{target}: {count} of {limit} ({slope:+.1f}/s"
+                line += f", limit in ~{eta:.0f}s)" if eta is not None else ")"
+                table.insert(tk.END, line + "\n", 'hot' if key in telemetry.warnings else ())
+            table.config(state=tk.DISABLED)
+            dialog.after(2000, refresh)
+
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        refresh()
+
+    # Backend profiling methods
+    def set_backend_inspector(self, enabled):
+        """Restart the backend with or without the Node inspector (blocking, run in background)"""
+        if enabled and self.inspector_line is None:
+            from devtools_client import INSPECTOR_LINE
+            self.inspector_line = INSPECTOR_LINE
+        self.backend_inspect = enabled
+        self.log_message(f"Restarting backend with the inspector {'enabled' if enabled else 'disabled'}", "info")
+        self.restart_service('backend')
+
+    def capture_backend_profile(self, kind, seconds=10, on_done=None):
+        """Record a CPU profile for `seconds` ('cpu') or take a heap snapshot ('heap')
+
+        Blocking, run in background. on_done(result) is called on the Tk
+        thread with {'path', 'rows', 'busy', 'seconds'} or None on failure.
+        """
+        from devtools_client import (DevToolsError, find_app_target, capture_cpu_profile,
+                                     capture_heap_snapshot, top_self_time)
+        if not self.profile_busy.acquire(blocking=False):
+            self.log_message("A backend capture is already running", "warning")
+            return
+        result = None
+        try:
+            ws_url = find_app_target(self.inspector_urls)
+            os.makedirs(self.profiles_path, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            if kind == 'cpu':
+                path = os.path.join(self.profiles_path, f"backend-{stamp}.cpuprofile")
+                self.log_message(f"Recording backend CPU profile for {seconds}s...", "info")
+                rows, busy = top_self_time(capture_cpu_profile(ws_url, seconds, path))
+                self.log_message(f"CPU profile saved to {path} ({busy / 1000:.1f}s busy of {seconds}s)", "success")
+                if rows:
+                    name, location, ms, share = rows[0]
+                    self.log_message(f"Top self time: {name} ({location}) {ms:.0f} ms, {share * 100:.0f}%", "info")
+                result = {'path': path, 'rows': rows, 'busy': busy, 'seconds': seconds}
+            else:
+                path = os.path.join(self.profiles_path, f"backend-{stamp}.heapsnapshot")
+                self.log_message("Taking backend heap snapshot...", "info")
+                size = capture_heap_snapshot(ws_url, path)
+                self.log_message(f"Heap snapshot saved to {path} ({format_bytes(size)})", "success")
+                result = {'path': path, 'rows': None}
+        except (DevToolsError, OSError) as e:
+            self.log_message(f"Backend capture failed: {str(e)}", "error")
+        finally:
+            self.profile_busy.release()
+        if on_done:
+            self.root.after(0, on_done, result)
+
+    def show_backend_profiler(self):
+        """Capture CPU profiles and heap snapshots of the running backend"""
+        if self.profiler_dialog and self.profiler_dialog.winfo_exists():
+            self.profiler_dialog.lift()
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Backend Profiler")
+        dialog.geometry("900x560")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.transient(self.root)
+        self.profiler_dialog = dialog
+
+        toolbar = tk.Frame(dialog, bg=self.colors['surface'], padx=20, pady=12)
+        toolbar.pack(fill=tk.X)
+        inspect_btn = tk.Button(toolbar, font=('Segoe UI', 10),
+                                command=lambda: self.run_in_background(self.set_backend_inspector,
+                                                                       not self.backend_inspect),
+                                bg=self.colors['accent'], fg='white', relief='flat', borderwidth=0,
+                                padx=14, pady=6, cursor='hand2')
+        inspect_btn.pack(side=tk.LEFT)
+        seconds = tk.IntVar(value=10)
+        tk.Spinbox(toolbar, from_=1, to=300, width=4, textvariable=seconds,
+                   font=('Segoe UI', 10)).pack(side=tk.LEFT, padx=(16, 4))
+        tk.Label(toolbar, text="s", font=('Segoe UI', 10), fg=self.colors['text'],
+                 bg=self.colors['surface']).pack(side=tk.LEFT)
+        cpu_btn = tk.Button(toolbar, text="Record CPU Profile", font=('Segoe UI', 10),
+                            command=lambda: capture('cpu'),
+                            bg=self.colors['primary'], fg='white', relief='flat', borderwidth=0,
+                            padx=14, pady=6, cursor='hand2')
+        cpu_btn.pack(side=tk.LEFT, padx=(8, 0))
+        heap_btn = tk.Button(toolbar, text="Heap Snapshot", font=('Segoe UI', 10),
+                             command=lambda: capture('heap'),
+                             bg=self.colors['secondary'], fg='white', relief='flat', borderwidth=0,
+                             padx=14, pady=6, cursor='hand2')
+        heap_btn.pack(side=tk.LEFT, padx=(8, 0))
+        summary = tk.Label(dialog, font=('Segoe UI', 10), fg=self.colors['text'],
+                           bg=self.colors['surface'], anchor=tk.W, padx=20)
+        summary.pack(fill=tk.X)
+        table = scrolledtext.ScrolledText(dialog, font=('Consolas', 9), wrap=tk.NONE,
+                                          bg=self.colors['surface'], fg=self.colors['text'])
+        table.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 20))
+        table.tag_configure('heading', font=('Consolas', 9, 'bold'))
+        table.tag_configure('hot', foreground=self.colors['danger'])
+        table.insert(tk.END, "Open .cpuprofile and .heapsnapshot files in Chrome DevTools "
+                             "(Performance / Memory panel) for the full picture.")
+        table.config(state=tk.DISABLED)
+
+        def capture(kind):
+            if not self.inspector_urls:
+                summary.config(text="Enable the inspector first; the backend restarts with it")
+                return
+            try:
+                duration = max(1, seconds.get())
+            except tk.TclError:
+                duration = 10
+            cpu_btn.config(state=tk.DISABLED)
+            heap_btn.config(state=tk.DISABLED)
+            summary.config(text=f"Recording CPU for {duration}s..." if kind == 'cpu' else "Taking heap snapshot...")
+            self.run_in_background(self.capture_backend_profile, kind, duration, show)
+
+        def show(result):
+            if not dialog.winfo_exists():
+                return
+            cpu_btn.config(state=tk.NORMAL)
+            heap_btn.config(state=tk.NORMAL)
+            if result is None:
+                summary.config(text="Capture failed - see the System Monitor")
+                return
+            summary.config(text=f"Saved {result['path']}")
+            if result['rows'] is None:
+                return
+            table.config(state=tk.NORMAL)
+            table.delete('1.0', tk.END)
+            table.insert(tk.END, f"{result['busy'] / 1000:.2f}s busy of {result['seconds']}s recorded\n\n")
+            table.insert(tk.END, f"{'Self ms':>9}{'Share':>8}  {'Function':<40}Location\n", 'heading')
+            for name, location, ms, share in result['rows']:
+                table.insert(tk.END, f"{ms:>9.1f}{share * 100:>7.1f}%  {name[:39]:<40}{location}\n",
+                             'hot' if share >= 0.2 else ())
+            table.config(state=tk.DISABLED)
+
+        def refresh_state():
+            if not dialog.winfo_exists():
+                return
+            inspect_btn.config(text="Disable Inspector" if self.backend_inspect else "Enable Inspector")
+            dialog.after(500, refresh_state)
+
+        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        refresh_state()
+
+    # Control API methods
+    def start_control_server(self):
+        """Serve the local control API and write its address and token to data/control.json"""
+        try:
+            self.control_server = ControlServer(self.get_control_state, self.control_service_action,
+                                                self.log_hub, self.state_hub, port=self.control_port)
+            self.control_server.start()
+        except OSError as e:
+            self.control_server = None
+            self.log_message(f"Control API disabled, port {self.control_port} unavailable: {str(e)}", "warning")
+            return
+        control_file = os.path.join(self.data_path, "control.json")
+        try:
+            os.makedirs(self.data_path, exist_ok=True)
+            with open(control_file, 'w', encoding='utf-8') as f:
+                json.dump({'url': f"http://127.0.0.1:{self.control_server.port}",
+                           'port': self.control_server.port,
+                           'token': self.control_server.token,
+                           'pid': os.getpid()}, f, indent=2)
+        except OSError as e:
+            self.log_message(f"Could not write {control_file}: {str(e)}", "warning")
+
+    def stop_control_server(self):
+        if self.control_server:
+            self.log_hub.close()
+            self.state_hub.close()
+            self.control_server.stop()
+            self.control_server = None
+            try:
+                os.remove(os.path.join(self.data_path, "control.json"))
+            except OSError:
+                pass
+
+    def get_control_state(self):
+        """Launcher state for the control API, read from the state store (no scans)"""
+        services = {}
+        for name, runtime in self.services.items():
+            health = self.state.get(f'health.{name}')
+            services[name] = {
+                'label': runtime.spec.label,
+                'managed': runtime.running,
+                'ready': runtime.ready.is_set(),
+                'up': bool(self.state.get(f'service.{name}.up', False)),
+                'pid': runtime.process.pid if runtime.running else None,
+                'port': self.state.get(f'port.{name}') or runtime.port,
+                'health': {'ok': health[0], 'ms': health[1]} if health else None,
+            }
+        return {
+            'services': services,
+            'stub_backend': bool(self.stub_server and self.stub_server.running),
+            'api_tracing': self.api_tracer.url if self.api_tracer and self.api_tracer.running else None,
+        }
+
+    def control_service_action(self, name, action):
+        """start / stop / restart one service for the control API; returns (ok, message)"""
+        runtime = self.services.get(name)
+        if runtime is None:
+            return False, f"Unknown service {name!r} (known: {', '.join(self.services)})"
+        self.log_message(f"Control API: {action} {runtime.spec.label}", "info")
+        if action == 'start':
+            self.start_services([name])
+        elif action == 'stop':
+            self.run_in_background(self.stop_service, name)
+        else:
+            self.run_in_background(self.restart_service, name)
+        return True, f"{action} {name} requested"
+
+    # Disk usage methods
+    def monitor_disk_usage(self):
+        """Refresh directory sizes in the background"""
+        def monitor():
+            while True:
+                for usage in self.disk_usage.values():
+                    try:
+                        usage.refresh()
+                    except Exception as e:
+                        self.log_message(f"Disk usage scan of {usage.root} failed: {str(e)}", "warning")
+                self.publish_disk_usage()
+                time.sleep(self.disk_usage_interval)
+        
+        threading.Thread(target=monitor, daemon=True).start()
+
+    def publish_disk_usage(self):
+        """Publish size, file count, growth rate and the largest files"""
+        largest = []
+        for name, usage in self.disk_usage.items():
+            if not usage.scanned:
+                text = "Not created yet"
+            else:
+                text = f"{format_bytes(usage.total_bytes)} in {usage.file_count} files"
+                rate = usage.growth_rate()
+                if rate is not None:
+                    text += f"  ({'+' if rate >= 0 else '-'}{format_bytes(abs(rate))}/h)"
+            self.state.set(f'disk.{name}', text)
+            largest.extend((size, name, path) for size, path in usage.largest_files(5))
+        lines = []
+        for size, name, path in sorted(largest, reverse=True)[:5]:
+            relative = os.path.relpath(path, self.disk_usage[name].root)
+            lines.append(f"{format_bytes(size):>9}  {name}/{relative}")
+        self.state.set('disk.largest', "\n".join(lines) if lines else "No files")
+
+    def render_disk_usage(self, key, text):
+        """Update one disk usage label (main thread)"""
+        if key == 'disk.largest':
+            self.largest_files_label.config(text=text)
+        else:
+            label = self.disk_usage_labels.get(key[len('disk.'):])
+            if label is not None:
+                label.config(text=text)
+
     def toggle_maximized(self):
         """Toggle maximized state"""
         if self.root.state() == 'zoomed':
@@ -1036,39 +3359,73 @@ class ProfessionalCareConnectLauncher:
             "Cancel"
         )
         if result:
-            self.stop_both_servers()
+            self.renderer.stop()
+            self.stop_all_services()
+            self.stop_metrics_endpoint()
+            self.stop_api_tracing()
+            self.stop_stub_backend()
+            self.stop_preview()
+            self.stop_control_server()
+            self.ui_watchdog.stop()
+            if self.active_replay:
+                self.active_replay.stop()
+            if self.session_recorder:
+                self.session_recorder.close()
             self.root.destroy()
 
+    def present_dialog(self, dialog, title, done, focus):
+        """Show a prebuilt modal dialog over the main window until done (a tk variable) is set"""
+        dialog.title(title)
+        dialog.geometry("+{}+{}".format(
+            self.root.winfo_x() + (self.root.winfo_width() // 2) - 250,
+            self.root.winfo_y() + (self.root.winfo_height() // 2) - 110
+        ))
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        focus.focus_set()
+        dialog.wait_variable(done)
+        if dialog.winfo_exists():
+            dialog.grab_release()
+            dialog.withdraw()
+
     def show_custom_confirmation_dialog(self, title, message, confirm_text="Yes", cancel_text="No"):
         """Show a custom confirmation dialog with professional styling"""
+        if self.confirm_dialog is None or not self.confirm_dialog['window'].winfo_exists():
+            self.confirm_dialog = self.build_confirmation_dialog()
+        parts = self.confirm_dialog
+        parts['title'].config(text=title)
+        parts['message'].config(text=message)
+        parts['confirm'].config(text=confirm_text)
+        parts['cancel'].config(text=cancel_text)
+        
+        # Focus on cancel button by default
+        self.present_dialog(parts['window'], title, parts['result'], parts['cancel'])
+        return parts['result'].get()
+
+    def build_confirmation_dialog(self):
+        """Create the (hidden) confirmation window; returns its parts"""
         # Create dialog window
         dialog = tk.Toplevel(self.root)
-        dialog.title(title)
+        dialog.withdraw()
         dialog.geometry("500x220")  # Made slightly larger for better button spacing
         dialog.resizable(False, False)
         dialog.configure(bg=self.colors['background'])
         dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Center the dialog
-        dialog.geometry("+{}+{}".format(
-            self.root.winfo_x() + (self.root.winfo_width() // 2) - 250,  # Adjusted for new width
-            self.root.winfo_y() + (self.root.winfo_height() // 2) - 110  # Adjusted for new height
-        ))
         
         # Main container
         main_frame = tk.Frame(dialog, bg=self.colors['background'], padx=30, pady=30)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Title label
-        title_label = tk.Label(main_frame, text=title, 
+        title_label = tk.Label(main_frame,
                               font=("Segoe UI", 14, "bold"),
                               fg=self.colors['text'],
                               bg=self.colors['background'])
         title_label.pack(pady=(0, 15))
         
         # Message label
-        message_label = tk.Label(main_frame, text=message,
+        message_label = tk.Label(main_frame,
                                 font=("Segoe UI", 10),
                                 fg=self.colors['text_light'],
                                 bg=self.colors['background'],
@@ -1079,19 +3436,17 @@ class ProfessionalCareConnectLauncher:
         button_frame = tk.Frame(main_frame, bg=self.colors['background'])
         button_frame.pack(fill=tk.X)
         
-        # Result variable
-        result = [False]  # Use list to modify from inner function
+        # Result variable; setting it closes the dialog
+        result = tk.BooleanVar(dialog, value=False)
         
         def on_confirm():
-            result[0] = True
-            dialog.destroy()
+            result.set(True)
         
         def on_cancel():
-            result[0] = False
-            dialog.destroy()
+            result.set(False)
         
         # Cancel button (left)
-        cancel_btn = tk.Button(button_frame, text=cancel_text,
+        cancel_btn = tk.Button(button_frame,
                               font=("Segoe UI", 11, "bold"),  # Slightly larger font
                               bg=self.colors['surface'],
                               fg=self.colors['text'],
@@ -1105,7 +3460,7 @@ class ProfessionalCareConnectLauncher:
         cancel_btn.pack(side=tk.LEFT, padx=(0, 15))  # More space between buttons
         
         # Confirm button (right)
-        confirm_btn = tk.Button(button_frame, text=confirm_text,
+        confirm_btn = tk.Button(button_frame,
                                font=("Segoe UI", 11, "bold"),  # Slightly larger font
                                bg=self.colors['danger'],
                                fg=self.colors['white'],
@@ -1118,42 +3473,19 @@ class ProfessionalCareConnectLauncher:
                                command=on_confirm)
         confirm_btn.pack(side=tk.RIGHT)
         
-        # Bind Enter key to confirm, Escape to cancel
+        # Bind Enter key to confirm, Escape (and the close button) to cancel
         dialog.bind('<Return>', lambda e: on_confirm())
         dialog.bind('<Escape>', lambda e: on_cancel())
+        dialog.protocol("WM_DELETE_WINDOW", on_cancel)
         
-        # Focus on cancel button by default
-        cancel_btn.focus_set()
-        
-        # Wait for dialog to close
-        dialog.wait_window()
-        
-        return result[0]
+        return {'window': dialog, 'title': title_label, 'message': message_label,
+                'confirm': confirm_btn, 'cancel': cancel_btn, 'result': result}
 
     def show_custom_message_dialog(self, title, message, dialog_type="info", button_text="OK"):
         """Show a custom message dialog with professional styling"""
-        # Create dialog window
-        dialog = tk.Toplevel(self.root)
-        dialog.title(title)
-        dialog.geometry("500x220")  # Made slightly larger for better button spacing
-        dialog.resizable(False, False)
-        dialog.configure(bg=self.colors['background'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Center the dialog
-        dialog.geometry("+{}+{}".format(
-            self.root.winfo_x() + (self.root.winfo_width() // 2) - 250,  # Adjusted for new width
-            self.root.winfo_y() + (self.root.winfo_height() // 2) - 110  # Adjusted for new height
-        ))
-        
-        # Main container
-        main_frame = tk.Frame(dialog, bg=self.colors['background'], padx=30, pady=30)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Icon and title frame
-        header_frame = tk.Frame(main_frame, bg=self.colors['background'])
-        header_frame.pack(fill=tk.X, pady=(0, 15))
+        if self.message_dialog is None or not self.message_dialog['window'].winfo_exists():
+            self.message_dialog = self.build_message_dialog()
+        parts = self.message_dialog
         
         # Icon based on dialog type
         icon_text = ""
@@ -1171,21 +3503,46 @@ class ProfessionalCareConnectLauncher:
             icon_text = "ℹ"
             icon_color = self.colors['info']
         
-        icon_label = tk.Label(header_frame, text=icon_text,
+        parts['icon'].config(text=icon_text, fg=icon_color)
+        parts['title'].config(text=title)
+        parts['message'].config(text=message)
+        parts['ok'].config(text=button_text)
+        
+        # Focus on OK button
+        self.present_dialog(parts['window'], title, parts['closed'], parts['ok'])
+
+    def build_message_dialog(self):
+        """Create the (hidden) message window; returns its parts"""
+        # Create dialog window
+        dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
+        dialog.geometry("500x220")  # Made slightly larger for better button spacing
+        dialog.resizable(False, False)
+        dialog.configure(bg=self.colors['background'])
+        dialog.transient(self.root)
+        
+        # Main container
+        main_frame = tk.Frame(dialog, bg=self.colors['background'], padx=30, pady=30)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Icon and title frame
+        header_frame = tk.Frame(main_frame, bg=self.colors['background'])
+        header_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        icon_label = tk.Label(header_frame,
                              font=("Segoe UI", 20),
-                             fg=icon_color,
                              bg=self.colors['background'])
         icon_label.pack(side=tk.LEFT, padx=(0, 15))
         
         # Title label
-        title_label = tk.Label(header_frame, text=title, 
+        title_label = tk.Label(header_frame,
                               font=("Segoe UI", 14, "bold"),
                               fg=self.colors['text'],
                               bg=self.colors['background'])
         title_label.pack(side=tk.LEFT)
         
         # Message label
-        message_label = tk.Label(main_frame, text=message,
+        message_label = tk.Label(main_frame,
                                 font=("Segoe UI", 10),
                                 fg=self.colors['text_light'],
                                 bg=self.colors['background'],
@@ -1196,11 +3553,14 @@ class ProfessionalCareConnectLauncher:
         button_frame = tk.Frame(main_frame, bg=self.colors['background'])
         button_frame.pack(fill=tk.X)
         
+        # Setting this closes the dialog
+        closed = tk.BooleanVar(dialog, value=False)
+        
         def on_ok():
-            dialog.destroy()
+            closed.set(True)
         
         # OK button
-        ok_btn = tk.Button(button_frame, text=button_text,
+        ok_btn = tk.Button(button_frame,
                           font=("Segoe UI", 11, "bold"),  # Slightly larger font
                           bg=self.colors['primary'],
                           fg=self.colors['white'],
@@ -1216,12 +3576,10 @@ class ProfessionalCareConnectLauncher:
         # Bind Enter and Escape keys
         dialog.bind('<Return>', lambda e: on_ok())
         dialog.bind('<Escape>', lambda e: on_ok())
+        dialog.protocol("WM_DELETE_WINDOW", on_ok)
         
-        # Focus on OK button
-        ok_btn.focus_set()
-        
-        # Wait for dialog to close
-        dialog.wait_window()
+        return {'window': dialog, 'icon': icon_label, 'title': title_label, 'message': message_label,
+                'ok': ok_btn, 'closed': closed}
 
     def run(self):
         """Start the application"""
@@ -1229,6 +3587,32 @@ class ProfessionalCareConnectLauncher:
         self.log_message(f"Project path: {self.project_path}", "info")
         self.root.mainloop()
 
+def parse_replay_speed(value):
+    """Turn '1', '10x' or 'max' into a speed factor (None means no delays)"""
+    value = str(value).strip().lower()
+    if value in ('max', 'maximum', '0'):
+        return None
+    value = value.rstrip('x')
+    try:
+        speed = float(value)
+    except ValueError:
+        raise ValueError(f"Invalid replay speed: {value}")
+    if speed <= 0:
+        raise ValueError("Replay speed must be positive")
+    return speed
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CareConnect Development Suite")
+    parser.add_argument('--replay', metavar='SESSION_FILE',
+                        help="replay a recorded session instead of waiting for live servers")
+    parser.add_argument('--speed', default='1',
+                        help="replay speed: 1 (real time), N (N times faster) or max")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="report import and construction times after the first status scan")
+    args = parser.parse_args()
+
     app = ProfessionalCareConnectLauncher()
+    if args.replay:
+        replay_speed = parse_replay_speed(args.speed)
+        app.root.after(500, lambda: app.replay_session(args.replay, replay_speed))
     app.run()
\ No newline at end of file
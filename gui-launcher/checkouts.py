@@ -0,0 +1,162 @@
+"""Additional checkouts of CareConnect supervised next to the main one.
+
+Each checkout (typically a `git worktree` of another branch) gets its own
+port block: its services run with their manifest ports shifted by a
+multiple of 100, so two backends and two Vite servers can run side by
+side against the shared MongoDB. The list lives in data/checkouts.json.
+Each checkout's service output is also written to its own log file. The
+file starts empty with each launcher session and is kept as <name>.log.1
+once it passes LOG_MAX_BYTES. compare_latency() runs the same requests
+against every checkout, interleaved so that load on the machine affects
+them all alike.
+"""
+import json
+import os
+import re
+import statistics
+import threading
+import time
+from urllib import request as urllib_request
+
+PORT_BLOCK = 100
+LOG_MAX_BYTES = 5 * 1024 * 1024
+COMPARE_PATHS = ("/api/v1/health", "/api/v1/health/db")
+
+
+class CheckoutError(ValueError):
+    """Raised for a directory that cannot be added as a checkout"""
+
+
+class Checkout:
+    """One extra project root with its port offset, environment and log file"""
+
+    def __init__(self, name, path, offset, env=None, logs_path=None):
+        self.name = name
+        self.path = path
+        self.offset = offset
+        self.env = dict(env or {})
+        self.log_path = os.path.join(logs_path, f"{name}.log") if logs_path else None
+        self._log = None
+        self._log_bytes = 0
+        self._log_opened = False   # the first open of a session starts the file afresh
+        self._log_lock = threading.Lock()
+
+    def to_dict(self):
+        return {'name': self.name, 'path': self.path, 'offset': self.offset, 'env': self.env}
+
+    def write_log(self, label, line):
+        """Append one service line to this checkout's log file, rotating it past LOG_MAX_BYTES"""
+        if not self.log_path:
+            return
+        with self._log_lock:
+            if self._log is not None and self._log_bytes >= LOG_MAX_BYTES:
+                self._log.close()
+                self._log = None
+                try:
+                    os.replace(self.log_path, self.log_path + ".1")
+                except OSError:
+                    pass
+                self._log_opened = False
+            if self._log is None:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                self._log = open(self.log_path, 'a' if self._log_opened else 'w', encoding='utf-8', buffering=1)
+                self._log_bytes = self._log.tell()
+                self._log_opened = True
+            entry = f"{time.strftime('%H:%M:%S')} [{label}] {line}\n"
+            self._log.write(entry)
+            self._log_bytes += len(entry)
+
+    def close(self):
+        with self._log_lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+
+class CheckoutStore:
+    """Persisted list of the extra checkouts"""
+
+    def __init__(self, path, project_path):
+        self.path = path
+        self.project_path = os.path.normcase(os.path.abspath(project_path))
+        self.logs_path = os.path.join(os.path.dirname(path), "checkouts")
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [Checkout(entry['name'], entry['path'], entry['offset'], entry.get('env'), self.logs_path)
+                for entry in entries if {'name', 'path', 'offset'} <= set(entry)]
+
+    def save(self, checkouts):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([checkout.to_dict() for checkout in checkouts], f, indent=2)
+
+    def add(self, path, name=None):
+        """Add a checkout with the next free port block; returns it"""
+        path = os.path.abspath(path)
+        if not os.path.exists(os.path.join(path, "package.json")) or not os.path.isdir(os.path.join(path, "backend")):
+            raise CheckoutError(f"{path} is not a CareConnect checkout (no package.json and backend/)")
+        checkouts = self.load()
+        if os.path.normcase(path) == self.project_path or \
+                any(os.path.normcase(checkout.path) == os.path.normcase(path) for checkout in checkouts):
+            raise CheckoutError(f"{path} is already supervised")
+        name = re.sub(r'[^\w.-]+', '-', name or os.path.basename(path)).strip('-') or "checkout"
+        names = {checkout.name for checkout in checkouts}
+        unique, suffix = name, 2
+        while unique in names:
+            unique, suffix = f"{name}-{suffix}", suffix + 1
+        offsets = {checkout.offset for checkout in checkouts}
+        offset = PORT_BLOCK
+        while offset in offsets:
+            offset += PORT_BLOCK
+        checkout = Checkout(unique, path, offset, logs_path=self.logs_path)
+        self.save(checkouts + [checkout])
+        return checkout
+
+    def remove(self, name):
+        self.save([checkout for checkout in self.load() if checkout.name != name])
+
+
+def _request(url, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib_request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            ok = 200 <= response.status < 300
+    except Exception:
+        ok = False
+    return ok, time.perf_counter() - started
+
+
+def compare_latency(targets, paths=COMPARE_PATHS, rounds=20, warmup=3, timeout=5):
+    """Request every path on every target round-robin
+
+    targets maps a checkout name to its backend base URL. Returns
+    {(checkout, path): {'median', 'p95', 'errors'}} with times in seconds
+    (None when every request failed).
+    """
+    samples = {(name, path): [] for name in targets for path in paths}
+    errors = dict.fromkeys(samples, 0)
+    for round_index in range(warmup + rounds):
+        for path in paths:
+            for name, base_url in targets.items():
+                ok, elapsed = _request(base_url + path, timeout)
+                if round_index < warmup:
+                    continue  # Warm caches, JIT and connection pools first
+                if ok:
+                    samples[(name, path)].append(elapsed)
+                else:
+                    errors[(name, path)] += 1
+    results = {}
+    for key, times in samples.items():
+        times.sort()
+        results[key] = {
+            'median': statistics.median(times) if times else None,
+            'p95': times[min(len(times) - 1, int(0.95 * len(times)))] if times else None,
+            'errors': errors[key],
+        }
+    return results
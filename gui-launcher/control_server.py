@@ -0,0 +1,187 @@
+"""Local control API for editor integrations, scripts and CI.
+
+A ThreadingHTTPServer on 127.0.0.1 serves JSON built from the launcher's
+StateStore, so answering "which port is the backend on?" never triggers
+a process or connection scan. Log lines and state changes are kept in
+EventHubs (bounded, sequence-numbered); /v1/logs?follow=1 and /v1/events
+stream them as newline-delimited JSON to any number of clients. Starting
+and stopping services requires the token written to data/control.json.
+"""
+import json
+import secrets
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+STREAM_HEARTBEAT = 15  # seconds between keep-alive newlines on idle streams
+SERVICE_ACTIONS = ('start', 'stop', 'restart')
+
+
+class EventHub:
+    """Bounded history of events that followers can wait on"""
+
+    def __init__(self, maxlen=1000):
+        self._events = deque(maxlen=maxlen)
+        self._seq = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def publish(self, event):
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, event))
+            self._cond.notify_all()
+
+    def tail(self, count):
+        """Return (last seq, the newest `count` events)"""
+        with self._cond:
+            events = list(self._events)[-count:] if count > 0 else []
+            return self._seq, [event for _, event in events]
+
+    def wait_since(self, seq, timeout):
+        """Block until there are events after seq; returns (new seq, events) or (seq, []) on timeout"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq or self._closed, timeout)
+            events = [event for event_seq, event in self._events if event_seq > seq]
+            return self._seq, events
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Wake all followers so their streams end"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class ControlServer:
+    """Serve the control API from daemon threads
+
+    get_state() returns the JSON-ready launcher state; service_action(name,
+    action) performs start/stop/restart and returns (ok, message).
+    """
+
+    def __init__(self, get_state, service_action, logs, events, port=9465, host="127.0.0.1", token=None):
+        self.get_state = get_state
+        self.service_action = service_action
+        self.logs = logs
+        self.events = events
+        self.host = host
+        self.port = port
+        self.token = token or secrets.token_urlsafe(24)
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def start(self):
+        """Bind the port and start serving; raises OSError if the port is taken"""
+        control = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def send_json(self, status, payload):
+                body = json.dumps(payload, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def write_chunk(self, data):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def stream(self, hub, seq, first=()):
+                """Send events as NDJSON until the client leaves or the hub closes"""
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    if first:
+                        self.write_chunk(b"".join(json.dumps(event, default=str).encode() + b"\n"
+                                                  for event in first))
+                    while not hub.closed:
+                        seq, events = hub.wait_since(seq, STREAM_HEARTBEAT)
+                        if events:
+                            self.write_chunk(b"".join(json.dumps(event, default=str).encode() + b"\n"
+                                                      for event in events))
+                        else:
+                            self.write_chunk(b"\n")  # Heartbeat, also detects gone clients
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                    pass
+                self.close_connection = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                follow = query.get('follow', ['0'])[0] not in ('0', 'false', '')
+                if url.path == "/v1/state":
+                    self.send_json(200, control.get_state())
+                elif url.path == "/v1/ports":
+                    services = control.get_state()['services']
+                    self.send_json(200, {name: service['port'] for name, service in services.items()})
+                elif url.path == "/v1/logs":
+                    try:
+                        count = int(query.get('tail', ['100'])[0])
+                    except ValueError:
+                        count = 100
+                    seq, lines = control.logs.tail(count)
+                    if follow:
+                        self.stream(control.logs, seq, lines)
+                    else:
+                        self.send_json(200, lines)
+                elif url.path == "/v1/events":
+                    # A snapshot first, so subscribers never miss what happened before they came
+                    seq = control.events.seq
+                    self.stream(control.events, seq, [{'type': 'snapshot', 'state': control.get_state()}])
+                else:
+                    self.send_json(404, {'error': f"Unknown endpoint {url.path}"})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                token = self.headers.get('X-Control-Token') or ''
+                authorization = self.headers.get('Authorization') or ''
+                if authorization.startswith('Bearer '):
+                    token = authorization[len('Bearer '):]
+                if not secrets.compare_digest(token, control.token):
+                    self.send_json(401, {'error': "Missing or wrong token (see data/control.json)"})
+                    return
+                parts = urlsplit(self.path).path.strip('/').split('/')
+                if len(parts) != 4 or parts[:2] != ['v1', 'services'] or parts[3] not in SERVICE_ACTIONS:
+                    self.send_json(404, {'error': "Use POST /v1/services/<name>/start|stop|restart"})
+                    return
+                ok, message = control.service_action(parts[2], parts[3])
+                self.send_json(202 if ok else 400, {'ok': ok, 'message': message})
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="control-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving; open streams end once their hub is closed"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
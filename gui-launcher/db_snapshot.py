@@ -0,0 +1,246 @@
+"""Snapshot and restore the dev database without re-running the seed scripts.
+
+A snapshot is a directory with one gzip-compressed file of concatenated
+BSON documents per collection (the mongodump .bson layout) plus a
+manifest.json with document counts and index definitions. Dumping reads
+raw BSON batches straight from the server into the gzip stream, so no
+document is ever decoded; restoring streams each file back and inserts
+RawBSONDocument batches, one collection per worker thread, then builds
+the indexes. Needs pymongo (optional: pip install pymongo). pymongo and
+the worker pool are imported on first use so they do not slow down the
+launcher's start.
+"""
+import gzip
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+pymongo = json_util = RawBSONDocument = None  # Loaded by _load_pymongo()
+
+DEFAULT_URI = "mongodb://localhost:27017/careconnect"
+COLLECTION_SUFFIX = ".bson.gz"
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_FORMAT = 1
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be taken or restored"""
+
+
+def read_mongo_uri(backend_path):
+    """MONGODB_URI from the environment or backend/.env, else the local default"""
+    uri = os.environ.get('MONGODB_URI')
+    if uri:
+        return uri
+    try:
+        with open(os.path.join(backend_path, ".env"), encoding='utf-8') as f:
+            for line in f:
+                key, _, value = line.strip().partition('=')
+                if key.strip() == 'MONGODB_URI' and value:
+                    return value.strip().strip('"\'')
+    except OSError:
+        pass
+    return DEFAULT_URI
+
+
+def local_ports(uri):
+    """Ports the URI reaches on this machine (none for mongodb+srv:// or remote hosts)"""
+    scheme, _, rest = uri.partition('://')
+    if scheme != 'mongodb':
+        return set()
+    hosts = rest.split('/', 1)[0].split('?', 1)[0].rpartition('@')[2]
+    ports = set()
+    for host in hosts.split(','):
+        if host.startswith('['):  # [::1]:27017
+            name, _, port = host[1:].partition(']')
+            port = port.lstrip(':')
+        else:
+            name, _, port = host.partition(':')
+        if name.lower() in ('localhost', '127.0.0.1', '::1'):
+            ports.add(int(port) if port.isdigit() else 27017)
+    return ports
+
+
+def _load_pymongo():
+    global pymongo, json_util, RawBSONDocument
+    if pymongo is None:
+        try:
+            import pymongo as module
+            from bson import json_util as bson_json_util
+            from bson.raw_bson import RawBSONDocument as raw_document
+        except ImportError:  # Snapshots are optional; the rest of the launcher works without pymongo
+            raise SnapshotError("pymongo is not installed (pip install pymongo)")
+        pymongo, json_util, RawBSONDocument = module, bson_json_util, raw_document
+
+
+def _database(uri):
+    _load_pymongo()
+    client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=3000)
+    try:
+        client.admin.command('ping')
+        database = client.get_default_database()
+    except pymongo.errors.ConfigurationError:
+        database = client['careconnect']  # URI without a database name
+    except pymongo.errors.PyMongoError as e:
+        client.close()
+        raise SnapshotError(f"Cannot reach MongoDB at {uri}: {e}")
+    return client, database
+
+
+def _count_documents(batch):
+    """Number of BSON documents in a raw batch (each starts with its int32 length)"""
+    count = position = 0
+    while position < len(batch):
+        position += int.from_bytes(batch[position:position + 4], 'little')
+        count += 1
+    return count
+
+
+def iter_raw_documents(stream):
+    """Yield each BSON document of a concatenated .bson stream as bytes"""
+    while True:
+        head = stream.read(4)
+        if not head:
+            return
+        if len(head) < 4:
+            raise SnapshotError("Truncated snapshot file")
+        rest = stream.read(int.from_bytes(head, 'little') - 4)
+        yield head + rest
+
+
+def _dump_collection(collection, path):
+    documents = 0
+    with gzip.open(path, 'wb', compresslevel=3) as f:
+        for batch in collection.find_raw_batches(batch_size=1000):
+            f.write(batch)
+            documents += _count_documents(batch)
+    indexes = [index for index in collection.list_indexes() if index['name'] != '_id_']
+    return {
+        'documents': documents,
+        'bytes': os.path.getsize(path),
+        'indexes': json.loads(json_util.dumps(indexes)),
+    }
+
+
+def create_snapshot(uri, directory, name=None, workers=4):
+    """Dump every collection of the database; returns the manifest"""
+    from concurrent.futures import ThreadPoolExecutor
+    client, database = _database(uri)
+    name = name or datetime.now().strftime("snapshot-%Y%m%d-%H%M%S")
+    final_path = os.path.join(directory, name)
+    if os.path.exists(final_path):
+        raise SnapshotError(f"Snapshot {name} already exists")
+    temp_path = final_path + ".partial"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    started = time.perf_counter()
+    try:
+        os.makedirs(temp_path)
+        names = sorted(n for n in database.list_collection_names() if not n.startswith('system.'))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {n: pool.submit(_dump_collection, database[n], os.path.join(temp_path, n + COLLECTION_SUFFIX))
+                       for n in names}
+            collections = {n: future.result() for n, future in futures.items()}
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'database': database.name,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - started, 3),
+            'collections': collections,
+        }
+        with open(os.path.join(temp_path, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, final_path)  # Only complete snapshots ever appear under their name
+    except (pymongo.errors.PyMongoError, OSError, ValueError) as e:  # OSError: e.g. a full disk
+        raise SnapshotError(f"Snapshot failed: {e}")
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        client.close()
+    return manifest
+
+
+def load_manifest(snapshot_path):
+    try:
+        with open(os.path.join(snapshot_path, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Not a database snapshot: {snapshot_path} ({e})")
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"Unsupported snapshot format {manifest.get('format')}")
+    return manifest
+
+
+def list_snapshots(directory):
+    """Return [(name, manifest)] for complete snapshots, newest first"""
+    snapshots = []
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return snapshots
+    for entry in entries:
+        if entry.is_dir() and not entry.name.endswith(".partial"):
+            try:
+                snapshots.append((entry.name, load_manifest(entry.path)))
+            except SnapshotError:
+                continue
+    return sorted(snapshots, key=lambda item: item[1]['created_at'], reverse=True)
+
+
+def _restore_collection(collection, path, info, batch_size):
+    started = time.perf_counter()
+    collection.drop()
+    documents = 0
+    batch = []
+    with gzip.open(path, 'rb') as f:
+        for raw in iter_raw_documents(f):
+            batch.append(RawBSONDocument(raw))
+            if len(batch) >= batch_size:
+                collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+                documents += len(batch)
+                batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+        documents += len(batch)
+    indexes = json_util.loads(json.dumps(info.get('indexes', [])))
+    if indexes:
+        # Built once after the data is in, much cheaper than maintaining them per insert
+        collection.database.command('createIndexes', collection.name,
+                                    indexes=[{k: v for k, v in index.items() if k not in ('v', 'ns')}
+                                             for index in indexes])
+    return documents, time.perf_counter() - started
+
+
+def restore_snapshot(uri, snapshot_path, workers=4, batch_size=1000):
+    """Replace the database contents with a snapshot, collections in parallel
+
+    Collections that are not part of the snapshot are dropped so the result
+    matches the snapshot exactly. Returns {'seconds', 'documents', 'collections'}.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    manifest = load_manifest(snapshot_path)
+    # Check the files before anything is dropped, so a damaged snapshot leaves the database alone
+    missing = [name for name in manifest['collections']
+               if not os.path.isfile(os.path.join(snapshot_path, name + COLLECTION_SUFFIX))]
+    if missing:
+        raise SnapshotError(f"Snapshot is incomplete, missing: {', '.join(sorted(missing))}")
+    client, database = _database(uri)
+    started = time.perf_counter()
+    try:
+        for name in database.list_collection_names():
+            if name not in manifest['collections'] and not name.startswith('system.'):
+                database.drop_collection(name)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(_restore_collection, database[name],
+                                         os.path.join(snapshot_path, name + COLLECTION_SUFFIX), info, batch_size)
+                       for name, info in manifest['collections'].items()}
+            collections = {name: future.result() for name, future in futures.items()}
+    except (pymongo.errors.PyMongoError, OSError, EOFError, ValueError) as e:  # OSError/EOFError: corrupt .gz
+        raise SnapshotError(f"Restore failed, the database may be partially restored: {e}")
+    finally:
+        client.close()
+    return {
+        'seconds': time.perf_counter() - started,
+        'documents': sum(documents for documents, _ in collections.values()),
+        'collections': collections,
+    }
@@ -0,0 +1,217 @@
+"""Minimal Chrome DevTools Protocol client for profiling the Node backend.
+
+Node started with --inspect prints "Debugger listening on ws://..." and
+serves /json/list on the same port. DevToolsSession speaks just enough
+WebSocket (RFC 6455: client masking, fragmented text frames, ping/pong)
+to send CDP commands and receive their events, so no extra package is
+needed. capture_cpu_profile() and capture_heap_snapshot() write files
+Chrome DevTools opens directly (.cpuprofile, .heapsnapshot);
+top_self_time() summarises a CPU profile.
+"""
+import base64
+import itertools
+import json
+import os
+import re
+import socket
+import struct
+import time
+from urllib import request as urllib_request
+from urllib.parse import urlsplit
+
+INSPECTOR_LINE = re.compile(r'Debugger listening on (ws://\S+)')
+# Pseudo-functions V8 puts in every profile; not the backend's own code
+IDLE_NODES = {'(idle)', '(program)', '(garbage collector)', '(root)'}
+
+_OP_TEXT, _OP_CLOSE, _OP_PING, _OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class DevToolsError(Exception):
+    """Raised when the inspector cannot be reached or a command fails"""
+
+
+def list_targets(ws_url, timeout=2):
+    """Targets served by the inspector that printed ws_url"""
+    parts = urlsplit(ws_url)
+    try:
+        with urllib_request.urlopen(f"http://{parts.netloc}/json/list", timeout=timeout) as response:
+            return json.load(response)
+    except (OSError, ValueError) as e:
+        raise DevToolsError(f"Inspector at {parts.netloc} is not reachable: {e}")
+
+
+def find_app_target(ws_urls):
+    """The newest live inspector running the app itself
+
+    npm, the tsx watcher and the server all inherit NODE_OPTIONS, so each
+    opens an inspector; the app is the one whose script is not under
+    node_modules. Returns its webSocketDebuggerUrl.
+    """
+    for ws_url in reversed(ws_urls):
+        try:
+            targets = list_targets(ws_url)
+        except DevToolsError:
+            continue  # A process that has exited (e.g. before a tsx restart)
+        for target in targets:
+            if 'node_modules' not in target.get('url', '') and target.get('webSocketDebuggerUrl'):
+                return target['webSocketDebuggerUrl']
+    raise DevToolsError("No running backend inspector found - restart the backend with the inspector enabled")
+
+
+class DevToolsSession:
+    """One WebSocket connection to a CDP target"""
+
+    def __init__(self, ws_url, timeout=30):
+        parts = urlsplit(ws_url)
+        self._ids = itertools.count(1)
+        try:
+            self._sock = socket.create_connection((parts.hostname, parts.port or 80), timeout=timeout)
+        except OSError as e:
+            raise DevToolsError(f"Cannot connect to {ws_url}: {e}")
+        key = base64.b64encode(os.urandom(16)).decode()
+        self._sock.sendall((f"GET {parts.path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUpgrade: websocket\r\n"
+                            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                            f"Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        self._buffer = b""
+        head = self._read_until(b"\r\n\r\n")
+        if b" 101 " not in head.split(b"\r\n", 1)[0]:
+            self.close()
+            raise DevToolsError(f"WebSocket handshake refused: {head.splitlines()[0].decode('latin-1')}")
+
+    def _read_until(self, marker):
+        while marker not in self._buffer:
+            self._receive()
+        head, self._buffer = self._buffer.split(marker, 1)
+        return head
+
+    def _read_exactly(self, size):
+        while len(self._buffer) < size:
+            self._receive()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _receive(self):
+        try:
+            chunk = self._sock.recv(1024 * 1024)
+        except OSError as e:
+            raise DevToolsError(f"Inspector connection failed: {e}")
+        if not chunk:
+            raise DevToolsError("Inspector closed the connection")
+        self._buffer += chunk
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 65536:
+            header += bytes([0x80 | 126]) + struct.pack(">H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack(">Q", length)
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        self._sock.sendall(header + mask + masked)
+
+    def _read_message(self):
+        """Return the next complete text message, answering pings on the way"""
+        parts = []
+        while True:
+            first, second = self._read_exactly(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", self._read_exactly(2))[0]
+            elif length == 127:
+                length = struct.unpack(">Q", self._read_exactly(8))[0]
+            mask = self._read_exactly(4) if second & 0x80 else None
+            payload = self._read_exactly(length)
+            if mask:
+                payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+            if opcode == _OP_PING:
+                self._send_frame(_OP_PONG, payload)
+                continue
+            if opcode == _OP_CLOSE:
+                raise DevToolsError("Inspector closed the session")
+            parts.append(payload)
+            if first & 0x80:  # FIN: last fragment
+                return b"".join(parts).decode('utf-8')
+
+    def call(self, method, params=None, on_event=None):
+        """Send one command and return its result; events meanwhile go to on_event(method, params)"""
+        message_id = next(self._ids)
+        self._send_frame(_OP_TEXT, json.dumps({'id': message_id, 'method': method,
+                                               'params': params or {}}).encode())
+        while True:
+            message = json.loads(self._read_message())
+            if message.get('id') == message_id:
+                if 'error' in message:
+                    raise DevToolsError(f"{method} failed: {message['error'].get('message')}")
+                return message.get('result', {})
+            if on_event and 'method' in message:
+                on_event(message['method'], message.get('params', {}))
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def capture_cpu_profile(ws_url, seconds, path, interval_us=100):
+    """Sample the target's CPU for `seconds` and save the profile; returns it"""
+    session = DevToolsSession(ws_url, timeout=seconds + 30)
+    try:
+        session.call('Profiler.enable')
+        session.call('Profiler.setSamplingInterval', {'interval': interval_us})
+        session.call('Profiler.start')
+        time.sleep(seconds)
+        profile = session.call('Profiler.stop')['profile']
+        session.call('Profiler.disable')
+    finally:
+        session.close()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f)
+    return profile
+
+
+def capture_heap_snapshot(ws_url, path):
+    """Stream a heap snapshot of the target to path; returns its size in bytes"""
+    session = DevToolsSession(ws_url, timeout=300)  # Large heaps take a while to serialise
+    written = 0
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            def on_event(method, params):
+                nonlocal written
+                if method == 'HeapProfiler.addHeapSnapshotChunk':
+                    f.write(params['chunk'])
+                    written += len(params['chunk'])
+
+            session.call('HeapProfiler.enable')
+            session.call('HeapProfiler.takeHeapSnapshot', {'reportProgress': False}, on_event=on_event)
+            session.call('HeapProfiler.disable')
+    finally:
+        session.close()
+    return written
+
+
+def top_self_time(profile, count=20):
+    """Return ([(function, location, self ms, share of busy time)], busy ms), heaviest first"""
+    nodes = {node['id']: node['callFrame'] for node in profile.get('nodes', [])}
+    samples = profile.get('samples', [])
+    deltas = profile.get('timeDeltas', [])
+    totals = {}
+    busy = 0.0
+    for index, node_id in enumerate(samples):
+        # A sample's time is the gap until the next sample
+        duration = deltas[index + 1] / 1000 if index + 1 < len(deltas) else 0.0
+        frame = nodes.get(node_id, {})
+        name = frame.get('functionName') or "(anonymous)"
+        if name in IDLE_NODES:
+            continue
+        url = frame.get('url', '')
+        location = f"{url.rsplit('/', 1)[-1]}:{frame.get('lineNumber', -1) + 1}" if url else "(native)"
+        key = (name, location)
+        totals[key] = totals.get(key, 0.0) + duration
+        busy += duration
+    rows = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+    return [(name, location, ms, ms / busy if busy else 0.0) for (name, location), ms in rows], busy
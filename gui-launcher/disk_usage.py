@@ -0,0 +1,148 @@
+"""Incremental size accounting for directories that grow on dev boxes.
+
+The first pass walks the whole tree with os.scandir. Later refreshes only
+re-list directories whose mtime changed (a file was added, removed or
+renamed) plus "hot" files modified recently, which catches log files that
+grow by appending without touching their directory. Every cold_every-th
+refresh re-stats all files, so an idle log that starts growing again is
+picked up too.
+"""
+import heapq
+import os
+import time
+from collections import deque
+
+
+def format_bytes(size):
+    """Human readable size, e.g. 1.5 MB"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class DirectoryUsage:
+    """Size and file count of one directory tree, kept up to date incrementally"""
+
+    def __init__(self, root, hot_window=600, history=360, cold_every=10):
+        self.root = root
+        self.hot_window = hot_window
+        self.cold_every = cold_every
+        self.refreshes = 0
+        # dir path -> {'mtime': ns, 'files': {name: (size, mtime)}, 'subdirs': set, 'bytes': int}
+        self.dirs = {}
+        self.samples = deque(maxlen=history)  # (monotonic time, total bytes)
+        self.scanned = False
+
+    @property
+    def total_bytes(self):
+        return sum(state['bytes'] for state in self.dirs.values())
+
+    @property
+    def file_count(self):
+        return sum(len(state['files']) for state in self.dirs.values())
+
+    def _scan_dir(self, path, dir_mtime):
+        """List one directory, returning the subdirectories that were not known yet"""
+        files = {}
+        subdirs = set()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files[entry.name] = (st.st_size, st.st_mtime)
+                    except OSError:
+                        continue  # File vanished between listing and stat
+        except OSError:
+            self._drop(path)
+            return set()
+        previous = self.dirs.get(path)
+        removed = previous['subdirs'] - subdirs if previous else set()
+        for subdir in removed:
+            self._drop(subdir)
+        self.dirs[path] = {
+            'mtime': dir_mtime,
+            'files': files,
+            'subdirs': subdirs,
+            'bytes': sum(size for size, _ in files.values()),
+        }
+        return {subdir for subdir in subdirs if subdir not in self.dirs}
+
+    def _drop(self, path):
+        """Forget a directory and everything below it"""
+        state = self.dirs.pop(path, None)
+        if state:
+            for subdir in state['subdirs']:
+                self._drop(subdir)
+
+    def _walk(self, path):
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            try:
+                mtime = os.stat(current).st_mtime_ns
+            except OSError:
+                self._drop(current)
+                continue
+            pending.extend(self._scan_dir(current, mtime))
+
+    def refresh(self):
+        """Bring the totals up to date; the first call does the full scan"""
+        if not self.scanned or self.root not in self.dirs:
+            self.dirs.clear()
+            if os.path.isdir(self.root):
+                self._walk(self.root)
+                self.scanned = True
+        else:
+            now = time.time()
+            self.refreshes += 1
+            restat_all = self.refreshes % self.cold_every == 0
+            for path in list(self.dirs):
+                state = self.dirs.get(path)
+                if state is None:
+                    continue  # Dropped together with a removed parent
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    self._drop(path)
+                    continue
+                if mtime != state['mtime']:
+                    for new_dir in self._scan_dir(path, mtime):
+                        self._walk(new_dir)
+                    continue
+                self._restat_files(path, state, now, restat_all)
+        self.samples.append((time.monotonic(), self.total_bytes))
+
+    def _restat_files(self, path, state, now, restat_all=False):
+        """Re-stat files written recently (or all of them); appends do not change the directory mtime"""
+        files = state['files']
+        for name, (size, mtime) in list(files.items()):
+            if not restat_all and now - mtime > self.hot_window:
+                continue
+            try:
+                st = os.stat(os.path.join(path, name))
+            except OSError:
+                continue  # Removal shows up through the directory mtime
+            if st.st_size != size or st.st_mtime != mtime:
+                files[name] = (st.st_size, st.st_mtime)
+                state['bytes'] += st.st_size - size
+
+    def growth_rate(self):
+        """Bytes per hour over the recorded samples, or None until there is enough data"""
+        if len(self.samples) < 2:
+            return None
+        (t0, b0), (t1, b1) = self.samples[0], self.samples[-1]
+        if t1 - t0 < 1:
+            return None
+        return (b1 - b0) / (t1 - t0) * 3600
+
+    def largest_files(self, n=5):
+        """Return the n largest files as (size, path)"""
+        candidates = ((size, os.path.join(path, name))
+                      for path, state in self.dirs.items()
+                      for name, (size, _) in state['files'].items())
+        return heapq.nlargest(n, candidates)
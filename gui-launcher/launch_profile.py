@@ -0,0 +1,71 @@
+"""Where the launcher's own cold start goes: imports, construction, first paint.
+
+`python careconnect_launcher.py --profile-startup` creates a LaunchProfile
+before the launcher's imports. While they run, __import__ is wrapped to
+time every import statement that loads new modules. Times are inclusive
+and only the launcher's own import statements are listed, so the report
+names its direct dependencies. The constructor then marks its phases up
+to the first status scan, and report() renders both as text.
+"""
+import builtins
+import sys
+import threading
+import time
+
+
+class LaunchProfile:
+    """Import times and named startup phases since creation"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []   # (phase, seconds since the previous mark, seconds since start)
+        self.imports = []  # (module, inclusive seconds)
+        self._last = self.started
+        self._depth = 0
+        self._original_import = None
+        self._lock = threading.Lock()
+
+    def trace_imports(self):
+        original = self._original_import = builtins.__import__
+        main_thread = threading.main_thread()
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if self._depth or level or threading.current_thread() is not main_thread:
+                return original(name, globals, locals, fromlist, level)
+            # `from package import submodule` loads something new even when package is loaded
+            label = f"{name}.{','.join(fromlist)}" if name in sys.modules and fromlist else name
+            loaded = len(sys.modules)
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                if len(sys.modules) > loaded:
+                    self.imports.append((label, time.perf_counter() - started))
+
+        builtins.__import__ = timed_import
+
+    def stop_tracing(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark(self, phase):
+        """Close the current phase under this name (any thread)"""
+        with self._lock:
+            now = time.perf_counter()
+            self.phases.append((phase, now - self._last, now - self.started))
+            self._last = now
+
+    def report(self, top=12):
+        with self._lock:
+            phases = list(self.phases)
+        total = phases[-1][2] if phases else 0.0
+        lines = [f"Launcher startup: {total * 1000:.0f} ms until {phases[-1][0] if phases else '-'}"]
+        for phase, seconds, at in phases:
+            lines.append(f"  {phase:<24}{seconds * 1000:8.1f} ms   (at {at * 1000:6.0f} ms)")
+        lines.append("Slowest imports (inclusive):")
+        for name, seconds in sorted(self.imports, key=lambda item: item[1], reverse=True)[:top]:
+            lines.append(f"  {name:<24}{seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
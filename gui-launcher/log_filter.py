@@ -0,0 +1,104 @@
+"""Collapse repeated service output and cap its rate before it reaches the log.
+
+Only what the System Monitor shows is filtered: every line still goes
+through readiness detection, and the raw output stays in the session
+recording. Consecutive lines that are equal once timestamps, numbers and
+ids are masked (request logs, HMR updates, reconnect loops) become one
+entry with a repeat counter. Each service may show at most
+max_per_second lines per one-second window; the rest are counted and
+reported as one "N lines suppressed" marker.
+"""
+import itertools
+import re
+import threading
+import time
+
+EMIT = 'emit'
+REPEAT = 'repeat'
+DROP = 'drop'
+
+# Parts of a line that vary between otherwise identical messages
+_VARIABLE = re.compile(
+    r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'  # ISO timestamps
+    r'|\b\d{1,2}:\d{2}:\d{2}(?:\.\d+)?(?:\s?[AP]M)?'  # Clock times, e.g. Vite's "10:42:01 AM"
+    r'|\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b'  # UUIDs
+    r'|\b[0-9a-f]{24}\b'  # Mongo ObjectIds
+    r'|\d+(?:\.\d+)?',
+    re.IGNORECASE)
+
+
+def template_of(line):
+    """Mask the variable parts of a line, e.g. "GET /api/v1/events/<id> 200 - 12 ms" -> "... # - # ms" """
+    return _VARIABLE.sub('#', line.strip())
+
+
+class _ServiceState:
+    __slots__ = ('template', 'run', 'repeats', 'window_start', 'shown', 'suppressed')
+
+    def __init__(self, now):
+        self.template = None
+        self.run = 0
+        self.repeats = 0
+        self.window_start = now
+        self.shown = 0
+        self.suppressed = 0
+
+
+class LogFilter:
+    """Per-service dedup and rate limit, safe to feed from several reader threads
+
+    max_per_second=None disables the rate limit, dedupe=False the repeat
+    detection (e.g. for benchmarks that count every line).
+    """
+
+    def __init__(self, max_per_second=200, dedupe=True):
+        self.max_per_second = max_per_second
+        self.dedupe = dedupe
+        self._states = {}
+        self._runs = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def feed(self, service, line, now=None):
+        """Classify one line; returns (verdict, run, value)
+
+        EMIT: show the line; run identifies it for later repeat updates and
+        value is the number of lines suppressed just before it (report first).
+        REPEAT: the line matches the one shown as run; value is how often it
+        has now been seen in a row. DROP: over the rate limit, not shown.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._states.get(service)
+            if state is None:
+                state = self._states[service] = _ServiceState(now)
+            template = template_of(line) if self.dedupe else None
+            if template is not None and template == state.template:
+                state.repeats += 1
+                return REPEAT, state.run, state.repeats
+            suppressed = 0
+            if now - state.window_start >= 1.0:
+                suppressed, state.suppressed = state.suppressed, 0
+                state.window_start = now
+                state.shown = 0
+            if self.max_per_second is not None and state.shown >= self.max_per_second:
+                state.suppressed += 1
+                state.template = None  # The next line must not count as a repeat of a hidden one
+                return DROP, None, None
+            state.shown += 1
+            state.template = template
+            state.run = next(self._runs)
+            state.repeats = 1
+            return EMIT, state.run, suppressed
+
+    def expire(self, now=None):
+        """Return [(service, suppressed)] for finished windows whose drops were not reported yet"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            for service, state in self._states.items():
+                if state.suppressed and now - state.window_start >= 1.0:
+                    expired.append((service, state.suppressed))
+                    state.suppressed = 0
+                    state.window_start = now
+                    state.shown = 0
+        return expired
@@ -0,0 +1,169 @@
+"""Prometheus text-format metrics for the CareConnect launcher.
+
+The registry is cheap enough to update on every log line; the HTTP
+endpoint is optional and only renders the text when it is scraped.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds - port detection is slow (seconds), probes are fast (ms)
+PORT_DETECTION_BUCKETS = (0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+HEALTH_PROBE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+UI_STALL_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30)
+
+
+def _format_labels(labels):
+    """Render a label tuple as {key="value",...}"""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    """Render a sample value the way Prometheus expects"""
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative bucket histogram for one label set"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Thread-safe store of gauges, counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> (type, help, {labels: value or Histogram}, buckets)
+        self._metrics = {}
+
+    def _family(self, name, kind, help_text, buckets=None):
+        family = self._metrics.get(name)
+        if family is None:
+            family = (kind, help_text, {}, buckets)
+            self._metrics[name] = family
+        return family
+
+    def set_gauge(self, name, value, labels=None, help_text=""):
+        """Set a gauge to an absolute value"""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            self._family(name, "gauge", help_text)[2][key] = value
+
+    def inc_counter(self, name, amount=1, labels=None, help_text=""):
+        """Increase a monotonically growing counter"""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            samples = self._family(name, "counter", help_text)[2]
+            samples[key] = samples.get(key, 0) + amount
+
+    def observe(self, name, value, labels=None, buckets=HEALTH_PROBE_BUCKETS, help_text=""):
+        """Record one observation in a histogram"""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._family(name, "histogram", help_text, buckets)
+            histogram = family[2].get(key)
+            if histogram is None:
+                histogram = family[2][key] = Histogram(family[3])
+            histogram.observe(value)
+
+    def remove(self, name, labels=None):
+        """Drop one label set, e.g. for a process that has exited"""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._metrics.get(name)
+            if family:
+                family[2].pop(key, None)
+
+    def render(self):
+        """Return the registry in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                kind, help_text, samples, _ = self._metrics[name]
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key in sorted(samples):
+                    sample = samples[key]
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(sample)}")
+                        continue
+                    for bound, count in zip(sample.buckets, sample.counts):
+                        bucket_key = key + (("le", _format_value(float(bound))),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_key)} {count}")
+                    inf_key = key + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf_key)} {sample.total}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(sample.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {sample.total}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve a MetricsRegistry on /metrics from a daemon thread"""
+
+    def __init__(self, registry, port=9464, host="127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def start(self):
+        """Bind the port and start serving; raises OSError if the port is taken"""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would otherwise flood stderr
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
@@ -0,0 +1,154 @@
+"""Connection telemetry for the managed services from one socket scan per tick.
+
+The monitor thread already takes a psutil.net_connections() snapshot for
+the status indicators; ConnectionTelemetry reuses it. Sockets are
+attributed to the service whose process tree owns them. TIME_WAIT and
+other closed sockets no longer have a process, so they are grouped as
+"(closed)" when either end is a service port. Per owner it counts
+sockets by state and by remote port (MongoDB, backend, portal) and the
+rate of new connections. Two limits are watched for trends toward
+exhaustion: the backend's MongoDB pool (Mongoose maxPoolSize) and the
+ephemeral port range that TIME_WAIT sockets use up.
+"""
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from urllib.parse import urlsplit, parse_qs
+
+WATCHED_PORTS = (27017, 5000, 8081)  # MongoDB, backend, government portal
+CLOSED = "(closed)"
+DRIVER_POOL_SIZE = 100  # MongoDB Node driver default maxPoolSize
+_POOL_OPTION = re.compile(r'maxPoolSize\s*:\s*(\d+)')
+
+
+def ephemeral_port_count():
+    """Size of the OS ephemeral port range client sockets (and TIME_WAIT) draw from"""
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/sys/net/ipv4/ip_local_port_range') as f:
+                low, high = (int(value) for value in f.read().split())
+            return high - low + 1
+        except (OSError, ValueError):
+            pass
+    return 65535 - 49152 + 1  # IANA range, the Windows and macOS default
+
+
+def read_pool_size(backend_path, mongo_uri):
+    """maxPoolSize from the URI, else from backend/src/config/database.ts, else the driver default"""
+    size = parse_qs(urlsplit(mongo_uri).query).get('maxPoolSize')
+    if size and size[0].isdigit():
+        return int(size[0])
+    try:
+        with open(os.path.join(backend_path, "src", "config", "database.ts"), encoding='utf-8') as f:
+            match = _POOL_OPTION.search(f.read())
+        if match:
+            return int(match.group(1))
+    except OSError:
+        pass
+    return DRIVER_POOL_SIZE
+
+
+class ConnectionTelemetry:
+    """Per-service socket counts and exhaustion trends across snapshots
+
+    limits maps a limit key to (owner, remote port or None, state, limit);
+    the count is the number of owner's sockets in state (to that remote
+    port). A limit warns when the count reaches warn_ratio of it, or when
+    its growth over the last window would reach it within horizon seconds.
+    warnings holds the keys of the limits currently warning.
+    """
+
+    def __init__(self, limits, watched_ports=WATCHED_PORTS, window=60, horizon=120, warn_ratio=0.8):
+        self.limits = limits
+        self.watched_ports = tuple(watched_ports)
+        self.window = window
+        self.horizon = horizon
+        self.warn_ratio = warn_ratio
+        self.latest = {}
+        self._previous = {}      # owner -> connection keys in the last snapshot
+        self._previous_time = None
+        self._history = {key: deque() for key in limits}
+        self.warnings = set()
+
+    def update(self, connections, owners, service_ports, now=None):
+        """Digest one net_connections() snapshot
+
+        owners maps pid -> service; service_ports is every port a managed
+        service listens on. Returns [(key, message)] for limits that
+        started warning with this snapshot.
+        """
+        now = time.monotonic() if now is None else now
+        stats = {}
+        keys = {}
+        for conn in connections:
+            if not conn.raddr:
+                continue  # LISTEN and unconnected sockets
+            owner = owners.get(conn.pid) if conn.pid else None
+            if owner is None:
+                if conn.pid or (conn.laddr.port not in service_ports and conn.raddr.port not in service_ports):
+                    continue  # Someone else's socket
+                owner = CLOSED
+            entry = stats.get(owner)
+            if entry is None:
+                entry = stats[owner] = {'states': Counter(), 'remote': Counter(), 'remote_states': Counter(),
+                                        'total': 0, 'new_per_second': 0.0}
+            entry['states'][conn.status] += 1
+            entry['total'] += 1
+            if conn.raddr.port in self.watched_ports:
+                entry['remote'][conn.raddr.port] += 1
+                entry['remote_states'][(conn.raddr.port, conn.status)] += 1
+            keys.setdefault(owner, set()).add((conn.laddr, conn.raddr))
+        if self._previous_time is not None and now > self._previous_time:
+            elapsed = now - self._previous_time
+            for owner, current in keys.items():
+                stats[owner]['new_per_second'] = len(current - self._previous.get(owner, set())) / elapsed
+        self._previous = keys
+        self._previous_time = now
+        self.latest = stats
+        return self._check_limits(stats, now)
+
+    def count(self, key, stats=None):
+        owner, remote_port, state, _ = self.limits[key]
+        stats = self.latest if stats is None else stats
+        entry = stats.get(owner)
+        if entry is None:
+            return 0
+        if remote_port is None:
+            return entry['states'][state]
+        return entry['remote_states'][(remote_port, state)]
+
+    def trend(self, key):
+        """(count, growth per second over the window, seconds until the limit or None)"""
+        history = self._history[key]
+        if not history:
+            return 0, 0.0, None
+        count = history[-1][1]
+        limit = self.limits[key][3]
+        (first_time, first), (last_time, last) = history[0], history[-1]
+        slope = (last - first) / (last_time - first_time) if last_time > first_time else 0.0
+        eta = (limit - count) / slope if slope > 0 and count < limit else None
+        return count, slope, eta
+
+    def _check_limits(self, stats, now):
+        started = []
+        for key, (owner, remote_port, state, limit) in self.limits.items():
+            history = self._history[key]
+            history.append((now, self.count(key, stats)))
+            while history and now - history[0][0] > self.window:
+                history.popleft()
+            count, slope, eta = self.trend(key)
+            warn = count >= limit * self.warn_ratio or (eta is not None and eta <= self.horizon
+                                                       and count >= limit * 0.25)
+            if warn and key not in self.warnings:
+                target = f" to :{remote_port}" if remote_port else ""
+                message = f"{owner} has {count} {state} connections{target} (limit {limit})"
+                if eta is not None:
+                    message += f", +{slope:.1f}/s - limit in ~{eta:.0f}s"
+                started.append((key, message))
+            if warn:
+                self.warnings.add(key)
+            elif count < limit * self.warn_ratio * 0.75:
+                self.warnings.discard(key)  # Hysteresis so a count hovering at the line does not flap
+        return started
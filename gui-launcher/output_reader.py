@@ -0,0 +1,223 @@
+"""Chunked line framing for child process output.
+
+LineReader pulls up to 64 KB at a time straight into one reusable
+bytearray (os.readv where available, readinto1 otherwise), locates the
+last line end in the unconsumed window and decodes everything before it
+with one call to a reused UTF-8 decoder in replace mode, then splits the
+text. There is no per-line bytes object, and since framing happens on
+bytes a multi-byte character split across reads can never raise or be
+mangled.
+Lines longer than max_line bytes keep their head and get a truncation
+marker; the rest is discarded as it arrives instead of being buffered.
+
+Services write to a log file rather than a pipe, so they outlive the
+launcher. FollowedFile tails such a file and looks like a pipe to
+LineReader: it waits for more output while the writer runs and reports
+EOF once the writer has exited and everything was read. Unlike a pipe it
+has to poll (5-100 ms, back to 5 ms as soon as data arrives). Once the
+file passes max_bytes and everything has been read, the follower keeps
+it as <log>.1 and empties it. The writer opened it with open_child_log()
+in append mode, so its next line lands at the start of the empty file.
+"""
+import codecs
+import os
+import shutil
+import sys
+import time
+
+MIN_POLL_INTERVAL = 0.005
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_LINE = 16 * 1024
+NEWLINE = ord('\n')
+
+
+def open_child_log(path):
+    """Empty path and open it for a child's stdout so every write appends at the current end
+
+    Windows only emulates O_APPEND in the C runtime of the process that
+    opened the file, so the handle gets FILE_APPEND_DATA access instead.
+    """
+    open(path, 'wb').close()
+    if sys.platform != 'win32':
+        return open(path, 'ab')
+    import _winapi
+    import msvcrt
+    # FILE_APPEND_DATA | SYNCHRONIZE, share read/write/delete, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL
+    handle = _winapi.CreateFile(path, 0x0004 | 0x00100000, 0x7, 0, 3, 0x80, 0)
+    return open(msvcrt.open_osfhandle(handle, os.O_APPEND), 'ab')
+
+
+class FollowedFile:
+    """Read a file another process is appending to, until alive() turns false"""
+
+    def __init__(self, path, alive, from_end=False, max_bytes=None, max_interval=0.1):
+        self.path = path
+        self.file = open(path, 'rb', buffering=0)
+        if from_end:
+            self.file.seek(0, os.SEEK_END)
+        self.alive = alive
+        self.max_bytes = max_bytes
+        self.max_interval = max_interval
+        self.interval = MIN_POLL_INTERVAL
+
+    def readinto(self, view):
+        while True:
+            count = self.file.readinto(view)
+            if count:
+                self.interval = MIN_POLL_INTERVAL
+                return count
+            if not self.alive():
+                return self.file.readinto(view) or 0  # Whatever was written just before the exit
+            if self.max_bytes and self.file.tell() >= self.max_bytes:
+                self._rotate()
+                continue
+            time.sleep(self.interval)
+            self.interval = min(self.interval * 2, self.max_interval)  # Quick while busy, cheap while idle
+
+    def _rotate(self):
+        """Keep the fully read log as <log>.1 and empty it, unless more output arrived"""
+        position = self.file.tell()
+        try:
+            if os.path.getsize(self.path) != position:
+                return  # Read the new output first
+            shutil.copyfile(self.path, self.path + ".1")
+            with open(self.path, 'r+b') as f:
+                if os.fstat(f.fileno()).st_size != position:
+                    return  # Written during the copy; rotate on a later pass
+                f.truncate(0)
+        except OSError:
+            self.max_bytes = None  # Cannot rotate here (e.g. a locked file); keep following
+            return
+        self.file.seek(0)
+
+    def close(self):
+        self.file.close()
+
+
+class LineReader:
+    """Iterate over the decoded lines of a binary stream until EOF
+
+    on_chunk(view), if given, sees every raw chunk exactly as read (e.g.
+    for session recording) before it is split into lines. The view is
+    only valid during the call.
+    """
+
+    def __init__(self, stream, on_chunk=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 max_line=DEFAULT_MAX_LINE):
+        self.stream = stream
+        self.on_chunk = on_chunk
+        self.chunk_size = chunk_size
+        self.max_line = max_line
+        # Room for one capped line plus a full read behind it
+        self.buffer = bytearray(max_line + chunk_size)
+        self.view = memoryview(self.buffer)
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.start = 0  # First unconsumed byte
+        self.end = 0  # End of valid data
+        self.kept = None  # Length of the head kept from the current over-long line
+        self.dropped = 0  # Bytes discarded from it
+        self.bytes_read = 0
+        self.truncated_lines = 0
+        try:
+            self._fd = stream.fileno() if hasattr(os, 'readv') else None
+        except (AttributeError, OSError, ValueError):
+            self._fd = None
+
+    def _read(self, view):
+        if self._fd is not None:
+            return os.readv(self._fd, [view])
+        read = getattr(self.stream, 'readinto1', None) or self.stream.readinto
+        return read(view) or 0
+
+    def _compact(self):
+        """Move the partial line to the front so a full chunk fits behind it"""
+        if self.start == 0:
+            return
+        pending = self.end - self.start
+        if pending:
+            self.buffer[:pending] = self.view[self.start:self.end]
+        self.start = 0
+        self.end = pending
+
+    def _decode(self, start, end):
+        # Lines are complete, so decode with final=True: a broken sequence at the end of
+        # one line becomes U+FFFD there instead of leaking into the next line
+        return self.decoder.decode(self.view[start:end], final=True)
+
+    def _cut(self):
+        """Choose the kept head: max_line bytes backed off to a character boundary"""
+        cut = self.start + self.max_line
+        while cut > self.start and self.buffer[cut] & 0xC0 == 0x80:
+            cut -= 1  # Never split a UTF-8 sequence, it would decode as U+FFFD
+        self.kept = cut - self.start
+
+    def _truncate(self):
+        """Drop buffered bytes of the current line beyond the kept head"""
+        if self.kept is None:
+            self._cut()
+        head_end = self.start + self.kept
+        self.dropped += self.end - head_end
+        self.end = head_end
+
+    def _finish_truncated(self, line_end):
+        """Decode the kept head of an over-long line and append the marker"""
+        self.dropped += line_end - (self.start + self.kept)
+        line = self._decode(self.start, self.start + self.kept)
+        line = f"{line} … [{self.dropped:,} bytes truncated]"
+        self.kept = None
+        self.dropped = 0
+        self.truncated_lines += 1
+        return line
+
+    def _cap(self, lines):
+        """Truncate complete lines longer than max_line characters"""
+        for i, line in enumerate(lines):
+            if len(line) > self.max_line:
+                dropped = len(line[self.max_line:].encode('utf-8', 'replace'))
+                lines[i] = f"{line[:self.max_line]} … [{dropped:,} bytes truncated]"
+                self.truncated_lines += 1
+
+    def __iter__(self):
+        buffer = self.buffer
+        scan = self.start
+        while True:
+            if self.kept is not None:
+                newline = buffer.find(NEWLINE, scan, self.end)
+                if newline >= 0:
+                    yield self._finish_truncated(newline)
+                    self.start = scan = newline + 1
+            if self.kept is None:
+                # Decode everything up to the last line end at once and split it:
+                # one decode call per chunk rather than one per line
+                last = buffer.rfind(NEWLINE, scan, self.end)
+                if last >= 0:
+                    lines = self._decode(self.start, last).split('\n')
+                    if last - self.start > self.max_line and max(map(len, lines)) > self.max_line:
+                        self._cap(lines)
+                    self.start = last + 1
+                    yield from lines
+
+            if self.kept is not None or self.end - self.start > self.max_line:
+                self._truncate()
+            if self.end + self.chunk_size > len(buffer):
+                self._compact()
+            scan = self.end
+
+            count = self._read(self.view[self.end:self.end + self.chunk_size])
+            if not count:
+                break
+            if self.on_chunk:
+                self.on_chunk(self.view[self.end:self.end + count])
+            self.end += count
+            self.bytes_read += count
+
+        # EOF: the last line may have no line end
+        if self.kept is not None:
+            yield self._finish_truncated(self.end)
+        elif self.start < self.end:
+            yield self._decode(self.start, self.end)
+        self.start = self.end
+
+    def close(self):
+        self.view.release()
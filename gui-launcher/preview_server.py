@@ -0,0 +1,277 @@
+"""Serve the production build the way users get it.
+
+SourceTracker hashes the frontend's build inputs (file contents, with a
+stat cache so unchanged files are not re-read) so `vite build` only runs
+when something actually changed. precompress() writes .gz and, when the
+optional brotli package is installed, .br next to every compressible
+file once per build. PreviewServer serves dist/ from a daemon thread:
+the best precompressed variant the client accepts, immutable cache
+headers on content-hashed files, 304s for revalidated ones, an SPA
+fallback to index.html, and /api proxied to the backend.
+"""
+import fnmatch
+import gzip
+import hashlib
+import http.client
+import json
+import mimetypes
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are optional; gzip is always written
+    brotli = None
+
+# What `vite build` reads, relative to the project root
+BUILD_INPUTS = ["src", "public", "index.html", "package-lock.json", "vite.config.ts",
+                "tailwind.config.js", "postcss.config.js", "tsconfig*.json"]
+COMPRESSIBLE = {'.js', '.mjs', '.css', '.html', '.svg', '.json', '.txt', '.xml', '.webmanifest', '.ico'}
+MIN_COMPRESS_SIZE = 1024
+# Vite emits assets/name-<hash>.ext; those never change content under the same URL
+HASHED_NAME = re.compile(r'[-.][A-Za-z0-9_-]{8,}\.[a-z0-9]+$')
+IMMUTABLE = "public, max-age=31536000, immutable"
+PROXY_SKIPPED_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'host'}
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# The Windows registry often maps .js to text/plain, which browsers refuse for modules
+for _type, _extension in (('text/javascript', '.js'), ('text/javascript', '.mjs'), ('text/css', '.css'),
+                          ('image/svg+xml', '.svg'), ('application/manifest+json', '.webmanifest')):
+    mimetypes.add_type(_type, _extension)
+
+
+class SourceTracker:
+    """Content hash of the build inputs, cached by (mtime, size) between runs"""
+
+    def __init__(self, project_path, state_path, inputs=BUILD_INPUTS):
+        self.project_path = project_path
+        self.state_path = state_path
+        self.inputs = inputs
+        try:
+            with open(state_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {'built_hash': None, 'files': {}}
+
+    def _input_files(self):
+        for pattern in self.inputs:
+            if any(char in pattern for char in '*?['):
+                for name in sorted(os.listdir(self.project_path)):
+                    if fnmatch.fnmatch(name, pattern):
+                        yield name
+                continue
+            path = os.path.join(self.project_path, pattern)
+            if os.path.isfile(path):
+                yield pattern
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.relpath(os.path.join(root, name), self.project_path).replace(os.sep, '/')
+
+    def current_hash(self):
+        """Hash of every input file's path and content"""
+        cached = self.state['files']
+        files = {}
+        combined = hashlib.sha256()
+        for relative in self._input_files():
+            try:
+                stat = os.stat(os.path.join(self.project_path, relative))
+            except OSError:
+                continue
+            entry = cached.get(relative)
+            if not entry or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                digest = hashlib.sha256()
+                with open(os.path.join(self.project_path, relative), 'rb') as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(block)
+                entry = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+            files[relative] = entry
+            combined.update(f"{relative}\0{entry[2]}\n".encode())
+        self.state['files'] = files
+        return combined.hexdigest()
+
+    def needs_build(self, dist_path):
+        """(True if the inputs changed since the last recorded build or dist/ is gone, current hash)"""
+        current = self.current_hash()
+        built = self.state.get('built_hash')
+        return current != built or not os.path.isfile(os.path.join(dist_path, "index.html")), current
+
+    def mark_built(self, source_hash):
+        self.state['built_hash'] = source_hash
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.state_path)
+
+
+def _compress_file(path):
+    """Write path.gz (and path.br) unless they are already newer than path; returns bytes written"""
+    written = 0
+    with open(path, 'rb') as f:
+        data = None
+        for encoding, suffix in ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            target = path + suffix
+            if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                continue
+            if data is None:
+                data = f.read()
+            compressed = brotli.compress(data, quality=11) if encoding == 'br' else gzip.compress(data, 9, mtime=0)
+            if len(compressed) >= len(data):
+                continue  # Not worth serving; the plain file is used
+            with open(target + ".tmp", 'wb') as out:
+                out.write(compressed)
+            os.replace(target + ".tmp", target)
+            written += len(compressed)
+    return written
+
+
+def precompress(dist_path, workers=4):
+    """Compress every compressible file in dist/ at maximum level, once; returns (files, bytes)"""
+    paths = []
+    for root, _, files in os.walk(dist_path):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE and os.path.getsize(path) >= MIN_COMPRESS_SIZE:
+                paths.append(path)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        written = list(pool.map(_compress_file, paths))
+    return sum(1 for size in written if size), sum(written)
+
+
+class PreviewServer:
+    """Serve a production build with /api proxied to the backend, from a daemon thread"""
+
+    def __init__(self, root, port=4173, api_port=5000, host="127.0.0.1", api_host="127.0.0.1"):
+        self.root = os.path.abspath(root)
+        self.port = port
+        self.host = host
+        self.api_port = api_port
+        self.api_host = api_host
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.port}"
+
+    def resolve(self, url_path):
+        """Map a URL path to a file under root; unknown routes fall back to index.html (SPA)"""
+        relative = os.path.normpath(unquote(url_path).lstrip('/'))
+        if relative.startswith('..') or os.path.isabs(relative):
+            return None
+        if relative.endswith('.map'):
+            return None  # Sourcemaps are never served, like in production
+        path = os.path.join(self.root, relative)
+        if os.path.isfile(path):
+            return path
+        if os.path.splitext(relative)[1]:
+            return None  # A missing asset is a 404, not the app shell
+        return os.path.join(self.root, "index.html")
+
+    def start(self):
+        """Bind the port and start serving; raises OSError if the port is taken"""
+        preview = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path.startswith("/api/"):
+                    self.proxy()
+                    return
+                path = preview.resolve(url.path)
+                if path is None or not os.path.isfile(path):
+                    self.send_error(404)
+                    return
+                accepted = {part.split(';')[0].strip() for part in self.headers.get('Accept-Encoding', '').split(',')}
+                encoding, served = None, path
+                for name, suffix in ENCODINGS:
+                    if name in accepted and os.path.isfile(path + suffix):
+                        encoding, served = name, path + suffix
+                        break
+                stat = os.stat(path)
+                etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}' + (f'-{encoding}"' if encoding else '"')
+                relative = os.path.relpath(path, preview.root).replace(os.sep, '/')
+                hashed = relative.startswith("assets/") and bool(HASHED_NAME.search(relative))
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+                if content_type.startswith('text/') or content_type in ('application/json', 'image/svg+xml'):
+                    content_type += '; charset=utf-8'
+                with open(served, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    self.send_response(200)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(size))
+                    self.send_header("Cache-Control", IMMUTABLE if hashed else "no-cache")
+                    self.send_header("ETag", etag)
+                    if os.path.splitext(path)[1].lower() in COMPRESSIBLE:
+                        self.send_header("Vary", "Accept-Encoding")
+                    if encoding:
+                        self.send_header("Content-Encoding", encoding)
+                    self.end_headers()
+                    if self.command != 'HEAD':
+                        self.wfile.flush()
+                        self.connection.sendfile(f)
+
+            do_HEAD = do_GET
+
+            def proxy(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                headers = {name: value for name, value in self.headers.items()
+                           if name.lower() not in PROXY_SKIPPED_HEADERS}
+                headers['Host'] = f"{preview.api_host}:{preview.api_port}"
+                connection = http.client.HTTPConnection(preview.api_host, preview.api_port, timeout=60)
+                try:
+                    connection.request(self.command, self.path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    data = response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    self.send_error(502, f"Backend unreachable: {e}")
+                    return
+                finally:
+                    connection.close()
+                self.send_response(response.status, response.reason)
+                for name, value in response.getheaders():
+                    if name.lower() not in PROXY_SKIPPED_HEADERS and name.lower() != 'content-length':
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(data)
+
+            do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = proxy
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="preview-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
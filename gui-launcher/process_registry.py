@@ -0,0 +1,132 @@
+"""Remember the services the launcher spawned so a new launcher can adopt them.
+
+The registry is a small JSON file with the pid, process create time and
+announced port of each running service. It is rewritten whenever one of
+them changes, so it survives a crash of the launcher. On startup,
+adopt() checks each pid still belongs to the same process (the create
+time guards against pid reuse) and wraps it in AdoptedProcess. That
+class has the subset of the subprocess.Popen interface the launcher uses,
+so stopping, restarting, process metrics and resource limits work as for
+a process the launcher started itself. Services write to a log file
+instead of a pipe, so the launcher can keep reading an adopted service's
+output from that file.
+"""
+import json
+import os
+import subprocess
+import threading
+
+import psutil
+
+_CREATE_TIME_TOLERANCE = 0.01  # Seconds; psutil rounds create times differently per platform
+
+
+class AdoptedProcess:
+    """Popen stand-in for a service started by an earlier launcher"""
+
+    def __init__(self, process):
+        self._process = process
+        self.pid = process.pid
+        self.returncode = None
+        self.stdout = None  # Output is read from the service log file
+
+    def poll(self):
+        if self.returncode is None:
+            try:
+                alive = self._process.is_running() and self._process.status() != psutil.STATUS_ZOMBIE
+            except psutil.Error:
+                alive = False
+            if not alive:
+                self.returncode = -1  # Not our child, so the real exit code is unknown
+        return self.returncode
+
+    def wait(self, timeout=None):
+        try:
+            self._process.wait(timeout)
+        except psutil.TimeoutExpired:
+            raise subprocess.TimeoutExpired(self._process.pid, timeout)
+        except psutil.Error:
+            pass
+        self.returncode = -1
+        return self.returncode
+
+    def terminate(self):
+        try:
+            self._process.terminate()
+        except psutil.Error:
+            pass
+
+    def kill(self):
+        try:
+            self._process.kill()
+        except psutil.Error:
+            pass
+
+
+class ServiceRegistry:
+    """Persisted {service: {'pid', 'create_time', 'port'}} of the running services"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(temporary, self.path)  # Never leave a half-written file behind a crash
+
+    def record(self, name, pid):
+        """Remember a freshly spawned service"""
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except psutil.Error:
+            return
+        with self._lock:
+            entries = self.load()
+            entries[name] = {'pid': pid, 'create_time': create_time, 'port': None}
+            self._save(entries)
+
+    def set_port(self, name, port):
+        with self._lock:
+            entries = self.load()
+            if name in entries and entries[name].get('port') != port:
+                entries[name]['port'] = port
+                self._save(entries)
+
+    def forget(self, name):
+        with self._lock:
+            entries = self.load()
+            if entries.pop(name, None) is not None:
+                self._save(entries)
+
+    def adopt(self):
+        """Return {service: (AdoptedProcess, port)} for recorded services that still run
+
+        Entries whose process is gone or whose pid now belongs to another
+        process are dropped from the file.
+        """
+        adopted = {}
+        with self._lock:
+            entries = self.load()
+            for name, entry in list(entries.items()):
+                try:
+                    process = psutil.Process(entry['pid'])
+                    same = abs(process.create_time() - entry['create_time']) <= _CREATE_TIME_TOLERANCE
+                    if same and process.status() != psutil.STATUS_ZOMBIE:
+                        adopted[name] = (AdoptedProcess(process), entry.get('port'))
+                        continue
+                except (psutil.Error, KeyError, TypeError):
+                    pass
+                del entries[name]
+            self._save(entries)
+        return adopted
@@ -0,0 +1,220 @@
+"""CPU placement and memory limits for managed services.
+
+A service entry in services.json may carry
+"resources": {"cpus": "0-3", "nice": 10, "memory_mb": 1536}. CPU affinity
+and the nice level (a priority class on Windows) are applied to the whole
+process tree at spawn and to every new child the monitor sees, so esbuild
+workers and tsx restarts stay on their cores. The memory limit works like
+pm2's max_memory_restart: when the tree's RSS stays over the limit the
+service is restarted. On Linux with a delegated cgroup v2 hierarchy the
+tree also gets its own cgroup with memory.max, and an OOM kill inside it
+triggers the same restart.
+"""
+import os
+import sys
+
+import psutil
+
+MEMORY_BREACH_SAMPLES = 2  # Consecutive monitor ticks over the limit before restarting
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Windows has priority classes instead of nice levels: (lowest nice, class)
+_PRIORITY_CLASSES = [
+    (15, 'IDLE_PRIORITY_CLASS'),
+    (5, 'BELOW_NORMAL_PRIORITY_CLASS'),
+    (-4, 'NORMAL_PRIORITY_CLASS'),
+    (-14, 'ABOVE_NORMAL_PRIORITY_CLASS'),
+    (-20, 'HIGH_PRIORITY_CLASS'),
+]
+
+
+def parse_cpu_list(value):
+    """Return sorted CPU numbers from "0-3,6" or [0, 1]; raises ValueError"""
+    if isinstance(value, (list, tuple)):
+        cpus = {int(cpu) for cpu in value}
+    else:
+        cpus = set()
+        for part in str(value).split(','):
+            first, _, last = part.strip().partition('-')
+            cpus.update(range(int(first), int(last or first) + 1))
+    if not cpus or min(cpus) < 0:
+        raise ValueError(f"invalid CPU list {value!r}")
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus):
+    """Inverse of parse_cpu_list: [0, 1, 2, 3, 6] -> "0-3,6" """
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in ranges)
+
+
+def _priority(nice):
+    """Value for psutil.Process.nice(): the nice level, or a priority class on Windows"""
+    if sys.platform != 'win32':
+        return nice
+    for lowest, name in _PRIORITY_CLASSES:
+        if nice >= lowest:
+            return getattr(psutil, name)
+    return psutil.HIGH_PRIORITY_CLASS
+
+
+def cgroup_parent():
+    """A cgroup v2 directory this user may create service cgroups in, or None
+
+    The launcher's own cgroup cannot hold children that use the memory
+    controller while it contains processes, so service cgroups are created
+    next to it, which needs a delegated parent (e.g. a systemd user slice).
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        with open("/proc/self/cgroup", encoding='utf-8') as f:
+            own = next(line.strip()[3:] for line in f if line.startswith("0::"))
+        parent = os.path.dirname(os.path.join(CGROUP_ROOT, own.lstrip('/')))
+        with open(os.path.join(parent, "cgroup.subtree_control"), encoding='utf-8') as f:
+            controllers = f.read().split()
+    except (OSError, StopIteration):
+        return None
+    if 'memory' in controllers and os.access(parent, os.W_OK) and \
+            os.access(os.path.join(parent, "cgroup.procs"), os.W_OK):
+        return parent
+    return None
+
+
+class MemoryCgroup:
+    """A cgroup v2 group with memory.max for one service's process tree"""
+
+    def __init__(self, parent, name, limit):
+        self.path = os.path.join(parent, f"careconnect-{name}-{os.getpid()}")
+        os.makedirs(self.path, exist_ok=True)
+        self._write("memory.max", str(limit))
+        self._write("memory.swap.max", "0")  # Otherwise the limit only moves the excess to swap
+        self.baseline = self.oom_kills()
+
+    def _write(self, filename, value):
+        try:
+            with open(os.path.join(self.path, filename), 'w', encoding='utf-8') as f:
+                f.write(value)
+        except FileNotFoundError:
+            pass  # memory.swap.max is missing without swap accounting
+
+    def add(self, pid):
+        """Move one process into the group; its later children start inside it"""
+        with open(os.path.join(self.path, "cgroup.procs"), 'w', encoding='utf-8') as f:
+            f.write(str(pid))
+
+    def oom_kills(self):
+        try:
+            with open(os.path.join(self.path, "memory.events"), encoding='utf-8') as f:
+                for line in f:
+                    key, _, value = line.partition(' ')
+                    if key == 'oom_kill':
+                        return int(value)
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def remove(self):
+        """Delete the group once its processes are gone"""
+        try:
+            os.rmdir(self.path)
+        except OSError:
+            pass
+
+
+class ResourceGuard:
+    """Apply one service's placement to its process tree and watch its memory
+
+    place() is called with the current tree on every monitor tick and only
+    touches pids it has not seen yet; check_memory() returns a reason
+    string when the service should be restarted.
+    """
+
+    def __init__(self, spec, name):
+        self.spec = spec
+        self.cgroup = None
+        self.errors = []
+        self._placed = set()
+        self._over = 0
+        self.breached = False
+        if spec.memory_limit:
+            parent = cgroup_parent()
+            if parent:
+                try:
+                    self.cgroup = MemoryCgroup(parent, name, spec.memory_limit)
+                except OSError as e:
+                    self.errors.append(f"cgroup unavailable ({e}), limiting by RSS only")
+
+    @property
+    def active(self):
+        return bool(self.spec.cpus or self.spec.nice is not None or self.spec.memory_limit)
+
+    def place(self, processes):
+        """Apply affinity, priority and the cgroup to processes not seen before"""
+        for process in processes:
+            if process.pid in self._placed:
+                continue
+            self._placed.add(process.pid)
+            try:
+                if self.cgroup:
+                    self.cgroup.add(process.pid)
+                if self.spec.cpus and hasattr(process, 'cpu_affinity'):  # Not available on macOS
+                    process.cpu_affinity(self.spec.cpus)
+                if self.spec.nice is not None:
+                    process.nice(_priority(self.spec.nice))
+            except psutil.NoSuchProcess:
+                continue
+            except (psutil.AccessDenied, OSError, ValueError) as e:
+                # Lowering nice needs privileges; report once, keep going
+                message = f"pid {process.pid}: {e}"
+                if len(self.errors) < 5:
+                    self.errors.append(message)
+
+    def take_errors(self):
+        errors, self.errors = self.errors, []
+        return errors
+
+    def check_memory(self, rss):
+        """Return why the service must restart, or None; reports each breach once"""
+        if self.breached or not self.spec.memory_limit:
+            return None
+        limit_mb = self.spec.memory_limit // (1024 * 1024)
+        if self.cgroup and self.cgroup.oom_kills() > self.cgroup.baseline:
+            self.breached = True
+            return f"a process was OOM-killed at its {limit_mb} MB cgroup limit"
+        self._over = self._over + 1 if rss > self.spec.memory_limit else 0
+        if self._over >= MEMORY_BREACH_SAMPLES:
+            self.breached = True
+            return f"RSS {rss // (1024 * 1024)} MB is over its {limit_mb} MB limit"
+        return None
+
+    def placement(self, process):
+        """Current placement of the tree's root process, e.g. "CPU 0-3 · nice 10" """
+        parts = []
+        try:
+            if hasattr(process, 'cpu_affinity'):
+                cpus = process.cpu_affinity()
+                if len(cpus) < (psutil.cpu_count() or 0):
+                    parts.append(f"CPU {format_cpu_list(cpus)}")
+            priority = process.nice()
+        except (psutil.Error, OSError):
+            return ""
+        if sys.platform == 'win32':
+            if priority != psutil.NORMAL_PRIORITY_CLASS:
+                parts.append(next((name.split('_PRIORITY')[0].lower().replace('_', ' ')
+                                   for _, name in _PRIORITY_CLASSES if getattr(psutil, name) == priority), ""))
+        elif priority:
+            parts.append(f"nice {priority}")
+        if self.spec.memory_limit:
+            parts.append(f"≤{self.spec.memory_limit // (1024 * 1024)} MB" + (" (cgroup)" if self.cgroup else ""))
+        return " · ".join(part for part in parts if part)
+
+    def close(self):
+        if self.cgroup:
+            self.cgroup.remove()
+            self.cgroup = None
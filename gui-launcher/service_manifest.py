@@ -0,0 +1,258 @@
+"""Service manifest loading and dependency-ordered parallel startup.
+
+services.json describes every process the launcher can manage. The
+Orchestrator starts each requested service on its own thread as soon as
+all of its dependencies report ready, so independent services start in
+parallel and dependent ones never race ahead. for_checkout() derives the
+services of another checkout of the project from the same manifest.
+"""
+import copy
+import json
+import os
+import re
+import threading
+
+from resource_limits import parse_cpu_list
+
+DEFAULT_READY_TIMEOUT = 120
+_PORT_PLACEHOLDER = re.compile(r'\{port(?::([\w-]+))?\}')
+
+
+class ManifestError(ValueError):
+    """Raised for an invalid or inconsistent services.json"""
+
+
+class ServiceSpec:
+    """One service entry from the manifest"""
+
+    def __init__(self, data, project_path):
+        try:
+            self.name = data['name']
+            self.command = list(data['command'])
+        except KeyError as e:
+            raise ManifestError(f"Service entry is missing {e}")
+        self.label = data.get('label', self.name.title())
+        self.cwd = os.path.normpath(os.path.join(project_path, data.get('cwd', '.')))
+        self.create_cwd = data.get('create_cwd', False)
+        self.env = {key: str(value) for key, value in data.get('env', {}).items()}
+        self.ports = [int(port) for port in data.get('ports', [])]
+        self.depends_on = list(data.get('depends_on', []))
+        self.autostart = data.get('autostart', True)
+        self.optional = data.get('optional', False)
+        self.health_url = data.get('health_url')
+        self.color = data.get('color', 'primary')
+        self.ready_timeout = data.get('ready_timeout', DEFAULT_READY_TIMEOUT)
+        self.checkout_name = None  # Set on the copies for_checkout() makes
+
+        # How the service runs for another checkout: "shared" (one instance for all checkouts)
+        # or {"env": ..., "args": ...} telling it its shifted port; absent = main checkout only
+        checkout = data.get('checkout')
+        if not (checkout is None or checkout == 'shared' or isinstance(checkout, dict)):
+            raise ManifestError(f"{self.name}: checkout must be \"shared\" or an object")
+        self.checkout = checkout
+
+        # Optional placement and limits: CPU affinity, nice level, memory in MB
+        resources = data.get('resources', {})
+        try:
+            self.cpus = parse_cpu_list(resources['cpus']) if resources.get('cpus') is not None else None
+            self.nice = int(resources['nice']) if resources.get('nice') is not None else None
+            memory_mb = resources.get('memory_mb')
+            self.memory_limit = int(float(memory_mb) * 1024 * 1024) if memory_mb else None
+        except (TypeError, ValueError) as e:
+            raise ManifestError(f"{self.name}: invalid resources: {e}")
+        if self.nice is not None and not -20 <= self.nice <= 19:
+            raise ManifestError(f"{self.name}: resources.nice must be between -20 and 19")
+
+        # Readiness: a log line regex (group 1 = port), a listening port or a health URL
+        ready = data.get('ready', {})
+        log_pattern = ready.get('log')
+        try:
+            self.ready_log = re.compile(log_pattern) if log_pattern else None
+        except re.error as e:
+            raise ManifestError(f"{self.name}: invalid ready.log pattern: {e}")
+        self.ready_port = ready.get('port')
+        self.ready_health = ready.get('health', False)
+        if not (self.ready_log or self.ready_port or self.ready_health):
+            self.ready_port = self.ports[0] if self.ports else None
+
+    def __repr__(self):
+        return f"ServiceSpec({self.name!r})"
+
+
+def load_manifest(path, project_path):
+    """Read services.json and return {name: ServiceSpec} in manifest order"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Cannot read {path}: {e}")
+    specs = {}
+    for entry in data.get('services', []):
+        spec = ServiceSpec(entry, project_path)
+        if spec.name in specs:
+            raise ManifestError(f"Duplicate service name: {spec.name}")
+        specs[spec.name] = spec
+    for spec in specs.values():
+        for dependency in spec.depends_on:
+            if dependency not in specs:
+                raise ManifestError(f"{spec.name} depends on unknown service {dependency}")
+    dependency_order(specs, specs)  # Reject cycles up front
+    return specs
+
+
+def for_checkout(specs, checkout_name, project_path, checkout_path, offset, env=None):
+    """Specs for another checkout of the project, keyed "<service>@<checkout_name>"
+
+    Services with a "checkout" object are copied with their cwd moved into
+    checkout_path and their ports shifted by offset; "{port}" in its env
+    and args is the service's own new port, "{port:<service>}" another's.
+    Shared services stay the single instance the copies depend on.
+    """
+    def clone_name(name):
+        return name if specs[name].checkout == 'shared' else f"{name}@{checkout_name}"
+
+    clones = {}
+    for name, spec in specs.items():
+        if not isinstance(spec.checkout, dict):
+            continue
+        for dependency in spec.depends_on:
+            if specs[dependency].checkout is None:
+                raise ManifestError(f"{name} cannot run for a checkout: {dependency} has no checkout entry")
+
+        def expand(value, spec=spec):
+            def port(match):
+                target = specs.get(match.group(1) or spec.name)
+                if target is None or not target.ports:
+                    raise ManifestError(f"{spec.name}: no port for {match.group(0)}")
+                return str(target.ports[0] + (0 if target.checkout == 'shared' else offset))
+            return _PORT_PLACEHOLDER.sub(port, str(value))
+
+        clone = copy.copy(spec)
+        clone.name = clone_name(name)
+        clone.label = f"{spec.label} [{checkout_name}]"
+        clone.checkout_name = checkout_name
+        clone.cwd = os.path.normpath(os.path.join(checkout_path, os.path.relpath(spec.cwd, project_path)))
+        clone.ports = [port + offset for port in spec.ports]
+        clone.ready_port = spec.ready_port + offset if spec.ready_port else None
+        clone.command = spec.command + [expand(arg) for arg in spec.checkout.get('args', [])]
+        clone.env = dict(spec.env)
+        clone.env.update({key: expand(value) for key, value in spec.checkout.get('env', {}).items()})
+        clone.env.update(env or {})
+        clone.depends_on = [clone_name(dependency) for dependency in spec.depends_on]
+        clone.autostart = False
+        clones[clone.name] = clone
+    return clones
+
+
+def dependency_order(specs, names):
+    """Return names plus their dependencies, dependencies first; raises on cycles"""
+    order = []
+    state = {}  # name -> 'visiting' | 'done'
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ManifestError("Dependency cycle: " + " -> ".join(path + [name]))
+        state[name] = 'visiting'
+        for dependency in specs[name].depends_on:
+            visit(dependency, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in names:
+        visit(name, [])
+    return order
+
+
+class Orchestrator:
+    """Start services concurrently, each once its dependencies are ready
+
+    start_service(name) spawns a service and returns True on success;
+    wait_ready(name, timeout) blocks until it is usable and returns a bool;
+    is_ready(name) tells whether a service is already up (e.g. started
+    outside the launcher), in which case it is not spawned again.
+    needs_optional(name) tells whether an optional dependency that was not
+    requested itself has to run on this machine; without the callback it
+    is never pulled in, and its dependents start as if it were ready.
+    """
+
+    def __init__(self, specs, start_service, wait_ready, is_ready, log, needs_optional=None):
+        self.specs = specs
+        self.start_service = start_service
+        self.wait_ready = wait_ready
+        self.is_ready = is_ready
+        self.log = log
+        self.needs_optional = needs_optional
+
+    def plan(self, names):
+        """The services start(names) spawns or waits for, dependencies first"""
+        return [name for name in dependency_order(self.specs, names)
+                if name in names or not self.specs[name].optional
+                or (self.needs_optional is not None and self.needs_optional(name))]
+
+    def start(self, names):
+        """Start names and their dependencies; returns {name: bool} once all settle"""
+        order = self.plan(names)
+        done = {name: threading.Event() for name in dependency_order(self.specs, names)}
+        results = {}
+        for name in done:
+            if name not in order:  # Optional dependency that is not needed here
+                results[name] = True
+                done[name].set()
+
+        def run(name):
+            spec = self.specs[name]
+            try:
+                for dependency in spec.depends_on:
+                    done[dependency].wait()
+                    if not results.get(dependency) and not self.specs[dependency].optional:
+                        self.log(f"Not starting {spec.label}: dependency {dependency} is not ready", "error")
+                        results[name] = False
+                        return
+                if self.is_ready(name):
+                    self.log(f"{spec.label} is already running", "info")
+                    results[name] = True
+                    return
+                if not self.start_service(name):
+                    results[name] = False
+                    return
+                results[name] = self.wait_ready(name, spec.ready_timeout)
+                if not results[name]:
+                    level = "warning" if spec.optional else "error"
+                    self.log(f"{spec.label} did not become ready within {spec.ready_timeout}s", level)
+            except Exception as e:
+                self.log(f"Error starting {spec.label}: {str(e)}", "error")
+                results[name] = False
+            finally:
+                done[name].set()
+
+        threads = [threading.Thread(target=run, args=(name,), name=f"start-{name}", daemon=True)
+                   for name in order]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+
+class ServiceRuntime:
+    """Live state of one managed service"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.process = None
+        self.detected_port = None
+        self.ready = threading.Event()
+        self.guard = None  # ResourceGuard of the current process, if the spec sets resources
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def port(self):
+        """Port announced in the output, else the first configured one"""
+        if self.detected_port:
+            return self.detected_port
+        return self.spec.ports[0] if self.spec.ports else None
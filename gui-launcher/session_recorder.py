@@ -0,0 +1,167 @@
+"""Record child process output to a compact session file and replay it.
+
+File layout: an 8 byte magic header followed by append-only records.
+Each record is ``<length:u32><kind:u8><service:u16><offset:f64>`` and
+``length - 11`` payload bytes. Service names are declared once with a
+SERVICE record; OUTPUT records then refer to them by id, and offsets are
+seconds since the recorder was opened (monotonic clock).
+"""
+import os
+import struct
+import threading
+import time
+
+MAGIC = b"CCSESS1\n"
+RECORD_HEADER = struct.Struct("<IBHd")
+KIND_SERVICE = 1
+KIND_OUTPUT = 2
+SESSION_SUFFIX = ".ccsession"
+
+
+class SessionRecorder:
+    """Append-only writer for one launcher session"""
+
+    def __init__(self, path, flush_interval=0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._services = {}
+        self._started = time.monotonic()
+        self._last_flush = self._started
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def _write(self, kind, service_id, offset, payload):
+        self._file.write(RECORD_HEADER.pack(RECORD_HEADER.size - 4 + len(payload),
+                                            kind, service_id, offset))
+        self._file.write(payload)
+
+    def record(self, service, chunk):
+        """Append one output chunk (bytes) for a service"""
+        if self._file is None:
+            return
+        offset = time.monotonic() - self._started
+        with self._lock:
+            if self._file is None:
+                return
+            service_id = self._services.get(service)
+            if service_id is None:
+                service_id = self._services[service] = len(self._services)
+                self._write(KIND_SERVICE, service_id, offset, service.encode("utf-8"))
+            self._write(KIND_OUTPUT, service_id, offset, bytes(chunk))
+            # Flush on a timer rather than per chunk, a crash loses at most flush_interval
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+
+    def close(self):
+        """Flush and close the file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_session(path):
+    """Yield (offset, service, chunk) for every output record in a session file"""
+    services = {}
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a launcher session file")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return  # End of file, or a record cut short by a crash
+            length, kind, service_id, offset = RECORD_HEADER.unpack(header)
+            payload = f.read(length - (RECORD_HEADER.size - 4))
+            if len(payload) < length - (RECORD_HEADER.size - 4):
+                return
+            if kind == KIND_SERVICE:
+                services[service_id] = payload.decode("utf-8", "replace")
+            elif kind == KIND_OUTPUT:
+                yield offset, services.get(service_id, f"service-{service_id}"), payload
+
+
+def prune_sessions(directory, keep=20):
+    """Delete all but the newest `keep` session files"""
+    try:
+        sessions = sorted((entry for entry in os.scandir(directory)
+                           if entry.name.endswith(SESSION_SUFFIX)),
+                          key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except FileNotFoundError:
+        return
+    for entry in sessions[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class ReplayProcess:
+    """Stand-in for subprocess.Popen whose stdout is fed from a recording"""
+
+    is_replay = True
+
+    def __init__(self):
+        self.pid = None
+        self.returncode = None
+        read_fd, self._write_fd = os.pipe()
+        self.stdout = os.fdopen(read_fd, "rb")
+
+    def feed(self, chunk):
+        view = memoryview(chunk)
+        while view:
+            written = os.write(self._write_fd, view)
+            view = view[written:]
+
+    def finish(self):
+        if self.returncode is None:
+            os.close(self._write_fd)
+            self.returncode = 0
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    def terminate(self):
+        self.finish()
+
+    kill = terminate
+
+
+class SessionReplay:
+    """Feed a recorded session into ReplayProcess pipes at a given speed"""
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed  # None or 0 replays as fast as possible
+        self.records = list(read_session(path))
+        self.processes = {}
+        for _, service, _ in self.records:
+            if service not in self.processes:
+                self.processes[service] = ReplayProcess()
+        self.total_bytes = sum(len(chunk) for _, _, chunk in self.records)
+        self._stopped = threading.Event()
+
+    def run(self):
+        """Write every record to its service pipe, honouring the original timing"""
+        started = time.monotonic()
+        try:
+            for offset, service, chunk in self.records:
+                if self._stopped.is_set():
+                    break
+                if self.speed:
+                    delay = started + offset / self.speed - time.monotonic()
+                    if delay > 0 and self._stopped.wait(delay):
+                        break
+                self.processes[service].feed(chunk)
+        finally:
+            for process in self.processes.values():
+                process.finish()
+
+    def stop(self):
+        self._stopped.set()
@@ -5,6 +5,18 @@ if %errorlevel% neq 0 (
     echo Failed to install psutil, please install it manually.
 )
 
+echo Installing optional Python dependency: pymongo (database snapshots)...
+pip install pymongo
+if %errorlevel% neq 0 (
+    echo pymongo is optional, database snapshots stay disabled without it.
+)
+
+echo Installing optional Python dependency: brotli (precompressed production preview)...
+pip install brotli
+if %errorlevel% neq 0 (
+    echo brotli is optional, the production preview serves gzip only without it.
+)
+
 echo Creating CareConnect Desktop Shortcut...
 
 REM Create the VBScript launcher (no console window)
@@ -0,0 +1,132 @@
+"""Startup timeline per service and a history of past launches.
+
+A StartupTimeline collects the first time each phase is reached for each
+service; StartupHistory appends finished runs to a JSON-lines file and
+compares time-to-ready against the rolling median of earlier runs.
+"""
+import json
+import os
+import statistics
+import threading
+import time
+from datetime import datetime
+
+# (phase key, label) in the order they normally happen
+PHASES = [
+    ('spawn', "Process spawned"),
+    ('first_output', "First output"),
+    ('listening', "Port announced"),
+    ('health', "/api/v1/health OK"),
+    ('health_db', "/api/v1/health/db OK"),
+]
+PHASE_LABELS = dict(PHASES)
+
+# The phase after which a service counts as usable
+READY_PHASE = {
+    'frontend': 'listening',
+    'backend': 'health_db',
+}
+
+
+class StartupTimeline:
+    """Phase timestamps for one start of one or more services"""
+
+    def __init__(self, services):
+        self.services = tuple(services)
+        self.started_at = datetime.now()
+        self.started = time.monotonic()
+        self.marks = {service: {} for service in self.services}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def mark(self, service, phase):
+        """Record a phase the first time it is reached; returns True if it was new"""
+        with self._lock:
+            phases = self.marks.get(service)
+            if phases is None or phase in phases or self.finished:
+                return False
+            phases[phase] = time.monotonic() - self.started
+            return True
+
+    def add(self, service):
+        """Include a service started while this run is still in progress"""
+        with self._lock:
+            if service not in self.marks:
+                self.services += (service,)
+                self.marks[service] = {}
+
+    def elapsed(self, service, phase):
+        return self.marks.get(service, {}).get(phase)
+
+    def is_ready(self, service):
+        return READY_PHASE.get(service, 'listening') in self.marks.get(service, {})
+
+    def is_complete(self):
+        return all(self.is_ready(service) for service in self.services)
+
+    def time_to_ready(self):
+        """Seconds until the last service became usable, or None if one never did"""
+        ready_times = [self.elapsed(service, READY_PHASE.get(service, 'listening'))
+                       for service in self.services]
+        if None in ready_times:
+            return None
+        return max(ready_times)
+
+    def key(self):
+        """Runs are only compared with runs that started the same services"""
+        return "+".join(sorted(self.services))
+
+    def to_record(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'key': self.key(),
+                'services': {service: dict(phases) for service, phases in self.marks.items()},
+                'time_to_ready': self.time_to_ready(),
+            }
+
+
+class StartupHistory:
+    """Append-only JSON-lines history of startup runs"""
+
+    def __init__(self, path, window=10, min_runs=3):
+        self.path = path
+        self.window = window
+        self.min_runs = min_runs
+
+    def load(self, key=None):
+        """Return recorded runs, oldest first, optionally only for one service set"""
+        runs = []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        run = json.loads(line)
+                    except ValueError:
+                        continue  # Skip a line cut short by a crash
+                    if key is None or run.get('key') == key:
+                        runs.append(run)
+        except FileNotFoundError:
+            pass
+        return runs
+
+    def rolling_median(self, key):
+        """Median time-to-ready of the last `window` completed runs, or None"""
+        times = [run['time_to_ready'] for run in self.load(key)
+                 if run.get('time_to_ready') is not None][-self.window:]
+        if len(times) < self.min_runs:
+            return None
+        return statistics.median(times)
+
+    def append(self, record):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+
+    def check_regression(self, timeline, threshold=0.25):
+        """Compare a finished run with history; returns (median, regressed)"""
+        ready = timeline.time_to_ready()
+        median = self.rolling_median(timeline.key())
+        if ready is None or median is None:
+            return median, False
+        return median, ready > median * (1 + threshold)
@@ -0,0 +1,128 @@
+"""Central launcher state with change tracking and main-thread rendering.
+
+Background threads only ever call StateStore.set() / LogQueue.put();
+a StateRenderer running on the Tk loop applies the accumulated changes
+once per tick, so a burst of updates costs one widget update per key.
+"""
+import threading
+from collections import deque
+
+_MISSING = object()
+
+
+class StateStore:
+    """Thread-safe key/value state that remembers which keys changed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._dirty = set()
+        self._listeners = []
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._values.get(key, default)
+
+    def set(self, key, value):
+        """Store a value; unchanged values are ignored and notify nobody"""
+        with self._lock:
+            if self._values.get(key, _MISSING) == value:
+                return False
+            self._values[key] = value
+            self._dirty.add(key)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(key, value)
+            except Exception:
+                pass  # A broken subscriber must not break the thread that published
+        return True
+
+    def update(self, values):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def snapshot(self, prefix=""):
+        """Copy of all values whose key starts with prefix"""
+        with self._lock:
+            return {key: value for key, value in self._values.items() if key.startswith(prefix)}
+
+    def take_changes(self):
+        """Return {key: latest value} for keys changed since the last call"""
+        with self._lock:
+            changes = {key: self._values[key] for key in self._dirty}
+            self._dirty.clear()
+        return changes
+
+    def subscribe(self, listener):
+        """Call listener(key, value) on the publishing thread for every change"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
+class LogQueue:
+    """Log entries waiting to be inserted by the main thread"""
+
+    def __init__(self):
+        self._entries = deque()
+
+    def put(self, entry):
+        self._entries.append(entry)  # deque.append is atomic
+
+    def drain(self, limit=None):
+        entries = []
+        while self._entries and (limit is None or len(entries) < limit):
+            entries.append(self._entries.popleft())
+        return entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class StateRenderer:
+    """Apply StateStore changes to widgets from Tk's after() loop"""
+
+    def __init__(self, root, store, interval=100):
+        self.root = root
+        self.store = store
+        self.interval = interval
+        self._renderers = []  # (key prefix, callback)
+        self._tick_hooks = []
+        self._job = None
+
+    def register(self, prefix, callback):
+        """Call callback(key, value) on the main thread when a key under prefix changes"""
+        self._renderers.append((prefix, callback))
+
+    def on_tick(self, callback):
+        """Run callback() on every tick, e.g. to drain a queue"""
+        self._tick_hooks.append(callback)
+
+    def start(self):
+        if self._job is None:
+            self._job = self.root.after(self.interval, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def render_pending(self):
+        """Apply all changes right now (main thread only)"""
+        for key, value in sorted(self.store.take_changes().items()):
+            for prefix, callback in self._renderers:
+                if key.startswith(prefix):
+                    callback(key, value)
+        for hook in self._tick_hooks:
+            hook()
+
+    def _tick(self):
+        try:
+            self.render_pending()
+        finally:
+            self._job = self.root.after(self.interval, self._tick)
@@ -0,0 +1,158 @@
+"""Detect stalls of the Tk event loop and record what the main thread was doing.
+
+A heartbeat scheduled with after() notes when it last ran and how late
+it was (event-loop lag). A watchdog thread sleeps until a beat is overdue
+by more than the threshold, then samples the main thread's stack with
+sys._current_frames() until the loop comes back. Samples are kept as
+folded stacks ("outer;inner;leaf" -> count), the format flamegraph.pl
+and speedscope import, and tree() renders them as an inclusive-time
+summary for the launcher's own dialog.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _stack(frame):
+    """Labels from the outermost frame to the innermost"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class UIWatchdog:
+    """Heartbeat on a Tk root plus a sampling thread for stalls
+
+    on_stall(stall) is called from the watchdog thread when a stall ends,
+    with {'started', 'duration', 'samples', 'leaf'}.
+    """
+
+    def __init__(self, root, interval=0.1, threshold=0.25, sample_interval=0.01, history=50, on_stall=None):
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+        self.on_stall = on_stall
+        self.stacks = Counter()          # folded stack -> samples, all stalls
+        self.stalls = deque(maxlen=history)
+        self.lags = deque(maxlen=600)    # Recent heartbeat lags in seconds (one minute at 100 ms)
+        self._lock = threading.Lock()
+        self._main_ident = threading.main_thread().ident
+        self._expected = None
+        self._last_beat = time.monotonic()
+        self._running = False
+        self._job = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._last_beat = time.monotonic()
+        self._expected = self._last_beat + self.interval
+        self._job = self.root.after(int(self.interval * 1000), self._beat)
+        threading.Thread(target=self._watch, name="ui-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass  # The root may already be destroyed
+            self._job = None
+
+    def _beat(self):
+        now = time.monotonic()
+        self.lags.append(max(0.0, now - self._expected))
+        self._last_beat = now
+        self._expected = now + self.interval
+        if self._running:
+            self._job = self.root.after(int(self.interval * 1000), self._beat)
+
+    def _watch(self):
+        while self._running:
+            overdue_at = self._last_beat + self.interval + self.threshold
+            time.sleep(max(self.sample_interval, overdue_at - time.monotonic()))
+            beat = self._last_beat
+            if time.monotonic() < beat + self.interval + self.threshold:
+                continue
+            # Stalled: sample until the heartbeat runs again
+            samples = Counter()
+            started = time.time() - (time.monotonic() - beat - self.interval)
+            while self._running and self._last_beat == beat:
+                frame = sys._current_frames().get(self._main_ident)
+                if frame is not None:
+                    samples[_stack(frame)] += 1
+                del frame
+                time.sleep(self.sample_interval)
+            if not samples:
+                continue
+            duration = self._last_beat - beat - self.interval
+            leaf = samples.most_common(1)[0][0][-1]
+            stall = {'started': started, 'duration': duration, 'samples': sum(samples.values()), 'leaf': leaf}
+            with self._lock:
+                self.stacks.update(samples)
+                self.stalls.append(stall)
+            if self.on_stall:
+                self.on_stall(stall)
+
+    def lag_stats(self):
+        """(p95, max) heartbeat lag over the last minute in seconds"""
+        lags = sorted(self.lags)
+        if not lags:
+            return 0.0, 0.0
+        return lags[min(len(lags) - 1, int(0.95 * len(lags)))], lags[-1]
+
+    def clear(self):
+        with self._lock:
+            self.stacks.clear()
+            self.stalls.clear()
+
+    def folded(self):
+        """Samples in folded-stack format, one "frame;frame;frame count" line per stack"""
+        with self._lock:
+            items = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in items)
+
+    def tree(self, min_share=0.02, max_depth=40):
+        """Return [(depth, frame, samples, share)] inclusive-time rows, heaviest first
+
+        Frames every sampled stack shares (the mainloop and Tk's callback
+        plumbing) are left out, so the first rows are the launcher's own.
+        """
+        with self._lock:
+            stacks = list(self.stacks.items())
+        total = sum(count for _, count in stacks)
+        if not total:
+            return []
+        common = 0
+        shortest = min(len(stack) for stack, _ in stacks)
+        while common < shortest - 1 and len({stack[common] for stack, _ in stacks}) == 1:
+            common += 1
+        root = {'count': 0, 'children': {}}
+        for stack, count in stacks:
+            node = root
+            for label in stack[common:]:
+                node = node['children'].setdefault(label, {'count': 0, 'children': {}})
+                node['count'] += count
+        rows = []
+
+        def walk(children, depth):
+            for label, node in sorted(children.items(), key=lambda item: item[1]['count'], reverse=True):
+                if node['count'] / total < min_share or depth > max_depth:
+                    continue
+                rows.append((depth, label, node['count'], node['count'] / total))
+                walk(node['children'], depth + 1)
+
+        walk(root['children'], 0)
+        return rows
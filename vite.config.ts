@@ -10,7 +10,8 @@ export default defineConfig({
   server: {
     proxy: {
       '/api': {
-        target: 'http://localhost:5000',
+        // The dev launcher can route API calls through its tracing proxy
+        target: process.env.CARECONNECT_API_TARGET || 'http://localhost:5000',
         changeOrigin: true,
         secure: false,
       },